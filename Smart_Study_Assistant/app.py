@@ -1,18 +1,20 @@
 import streamlit as st
 import sys
 import os
-from datetime import datetime, timedelta
+import time
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError, as_completed
 
 # Proje yolunu ekle
 sys.path.insert(0, os.path.dirname(__file__))
 
-from models.ml_model import MLModel
-from models.text_processor import TextProcessor
-from database.db_manager import DatabaseManager
-from database.init_db import init_database
+from models.registry import ModelRegistry
+from database.db_manager import HISTORY_COLUMNS
 from utils.visualizer import Visualizer
-from utils.api_handler import APIHandler
-import pandas as pd
+from utils.api_handler import SUMMARY_DEADLINE
+
+# Geçmiş sekmesinde bir sayfadaki sorgu sayısı
+HISTORY_PAGE_SIZE = 50
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -123,15 +125,24 @@ st.markdown('''
 </div>
 ''', unsafe_allow_html=True)
 
+# Paylaşılan nesneler - süreç başına bir kez kurulur, tüm oturumlar kullanır
+registry = ModelRegistry.instance()
+
 # Session State Başlatma
-if 'ml_model' not in st.session_state:
+if 'session_key' not in st.session_state:
     with st.spinner('🧠 Sistem yükleniyor...'):
-        st.session_state.ml_model = MLModel()
-        st.session_state.text_processor = TextProcessor()
-        st.session_state.db_manager = DatabaseManager()
-        st.session_state.api_handler = APIHandler()
+        st.session_state.session_key = uuid.uuid4().hex
         st.session_state.visualizer = Visualizer()
-        init_database()
+        # ilk oturum kurulumu burada öder
+        registry.ml_model
+        registry.db_manager
+        registry.query_log
+        registry.api_handler
+        # konu dosyaları değişince model arka planda güncellenip yerine konuyor
+        registry.watch_topics()
+
+# oturumun son görülme zamanı; uzun süre istek gelmeyen oturum aktif sayılmıyor
+registry.register_session(st.session_state.session_key)
 
 # Sidebar
 with st.sidebar:
@@ -145,42 +156,11 @@ with st.sidebar:
     # 🔥 STREAK SİSTEMİ
     st.markdown('<h3 style="color: white;">🔥 Öğrenme Takibi</h3>', unsafe_allow_html=True)
 
-    history = st.session_state.db_manager.get_query_history()
-
-    if not history.empty:
-        # Tarih formatını düzelt
-        history['date'] = pd.to_datetime(history['query_date']).dt.date
-        unique_dates = sorted(history['date'].unique(), reverse=True)
-
-        # Streak hesapla
-        streak = 1
-        today = datetime.now().date()
-
-        if len(unique_dates) > 0:
-            # Bugün arama yaptıysa
-            if unique_dates[0] == today:
-                for i in range(1, len(unique_dates)):
-                    prev_date = unique_dates[i - 1]
-                    curr_date = unique_dates[i]
-
-                    # Ardışık mı kontrol et
-                    if (prev_date - curr_date).days == 1:
-                        streak += 1
-                    else:
-                        break
-            # Dün arama yaptıysa
-            elif unique_dates[0] == today - timedelta(days=1):
-                streak = 1
-                for i in range(1, len(unique_dates)):
-                    prev_date = unique_dates[i - 1]
-                    curr_date = unique_dates[i]
-
-                    if (prev_date - curr_date).days == 1:
-                        streak += 1
-                    else:
-                        break
-            else:
-                streak = 0
+    # kullanıcının serisi sorgu kaydında veritabanında güncelleniyor, burada tek satır okunuyor
+    streak_info = registry.db_manager.get_streak(session_id)
+
+    if streak_info is not None:
+        streak = streak_info['streak']
 
         # Streak barı
         st.markdown(f"""
@@ -196,6 +176,9 @@ with st.sidebar:
             <div style="color: rgba(255,255,255,0.95); font-size: 1rem;">
                 Öğrenme Streak!
             </div>
+            <div style="color: rgba(255,255,255,0.8); font-size: 0.85rem; margin-top: 0.5rem;">
+                En uzun seri: {streak_info['longest_streak']} gün
+            </div>
         </div>
         """, unsafe_allow_html=True)
 
@@ -216,6 +199,56 @@ with st.sidebar:
         </div>
         """, unsafe_allow_html=True)
 
+    # paylaşılan model kazancı
+    with st.expander("⚙️ Sistem Durumu"):
+        report = registry.savings_report()
+        st.caption(f"Aktif oturum: {report['sessions']}")
+        for label, saving in (("Oturum başına", report['per_session']), ("Toplam", report['total'])):
+            memory = saving['memory_bytes']
+            st.caption(
+                f"{label} tasarruf: {saving['build_seconds']:.2f} sn"
+                + (f", {memory / 1024 / 1024:.1f} MB" if memory is not None else "")
+            )
+
+        cache = registry.ml_model.cache_stats()
+        st.caption(
+            f"Öneri önbelleği: {cache['size']}/{cache['maxsize']} kayıt, "
+            f"isabet %{cache['hit_rate'] * 100:.0f} "
+            f"({cache['hits']} isabet, {cache['misses']} ıskalama, {cache['evictions']} çıkarma)"
+        )
+
+        log_stats = registry.query_log.stats()
+        st.caption(
+            f"Kayıt kuyruğu: {log_stats['pending']} bekleyen, {log_stats['written']} yazıldı, "
+            f"{log_stats['dropped']} düşürüldü"
+        )
+
+        wiki_stats = registry.api_handler.cache_stats()
+        st.caption(
+            f"Wikipedia önbelleği: isabet %{wiki_stats['hit_rate'] * 100:.0f} "
+            f"({wiki_stats['fresh']} taze, {wiki_stats['stale']} bayat, {wiki_stats['misses']} ıskalama)"
+        )
+
+        wiki_metrics = registry.api_handler.metrics()
+        breakers = ", ".join(
+            f"{language.upper()} {breaker['state']}" for language, breaker in sorted(wiki_metrics['breakers'].items())
+        )
+        st.caption(
+            f"Wikipedia istekleri: {wiki_metrics['requests']} istek, {wiki_metrics['failures']} hata, "
+            f"{wiki_metrics['timeouts']} zaman aşımı, {wiki_metrics['short_circuits']} devrede kesildi, "
+            f"{wiki_metrics['fallbacks']} yedek yanıt, {wiki_metrics['deadline_misses']} süreye yetişmedi"
+            + (f" (devre: {breakers})" if breakers else "")
+        )
+
+        render = registry.render_report()
+        if render['searches']:
+            st.caption(
+                f"İlk kart süresi: p50 {render['first_card']['p50'] * 1000:.0f} ms, "
+                f"p95 {render['first_card']['p95'] * 1000:.0f} ms; tüm paneller: "
+                f"p50 {render['complete']['p50'] * 1000:.0f} ms, p95 {render['complete']['p95'] * 1000:.0f} ms "
+                f"(son {render['searches']} arama)"
+            )
+
 # Ana Sekmeler
 tab1, tab2, tab3, tab4 = st.tabs(["🔍 Yeni Öğrenme", "📚 Geçmiş", "📊 İstatistikler", "🎯 Konu Keşfi"])
 
@@ -244,90 +277,116 @@ with tab1:
         show_resources = st.checkbox("🔗 Kaynaklar", value=True)
 
     if search_button and user_query:
+        search_start = time.perf_counter()
         with st.spinner('🔍 Öneriler hazırlanıyor...'):
-            # Önerileri al
-            recommendations = st.session_state.ml_model.get_recommendations(user_query, top_n=5)
-
-            if recommendations:
-                # Veritabanına kaydet
-                query_id = st.session_state.db_manager.save_query(user_query, session_id)
-                st.session_state.db_manager.save_recommendations(query_id, recommendations)
-
-                st.success(f"✅ {len(recommendations)} öneri bulundu!")
-                st.markdown("---")
-
-                # Önerileri göster
-                for i, (topic, score) in enumerate(recommendations, 1):
-                    # Renk belirle
-                    if score > 0.7:
-                        color = "#11998e"
-                        emoji = "🟢"
-                    elif score > 0.4:
-                        color = "#f093fb"
-                        emoji = "🟡"
-                    else:
-                        color = "#4facfe"
-                        emoji = "⚪"
-
-                    percentage = int(score * 100)
-
-                    # Kart
-                    st.markdown(f"""
-                    <div style="background: white; border-radius: 15px; padding: 1.5rem; margin: 1rem 0; border-left: 5px solid {color};">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <h3 style="margin: 0; color: {color};">#{i} {topic}</h3>
-                            <div style="background: {color}; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-weight: bold;">
-                                {emoji} {percentage}%
-                            </div>
+            # Önerileri al (sadece bu adım bekletiyor)
+            recommendations = registry.ml_model.get_recommendations(user_query, top_n=5)
+
+        if recommendations:
+            # özetler hemen isteniyor, kartlar onları beklemeden çiziliyor
+            wiki_futures = {}
+            if show_wikipedia:
+                wiki_futures = registry.api_handler.submit_topic_summaries([topic for topic, _ in recommendations])
+
+            st.success(f"✅ {len(recommendations)} öneri bulundu!")
+            st.markdown("---")
+
+            # Önerileri göster; paneller için yer tutucular sonra dolduruluyor
+            first_card_seconds = None
+            wiki_slots, resource_slots = {}, []
+            for i, (topic, score) in enumerate(recommendations, 1):
+                # Renk belirle
+                if score > 0.7:
+                    color = "#11998e"
+                    emoji = "🟢"
+                elif score > 0.4:
+                    color = "#f093fb"
+                    emoji = "🟡"
+                else:
+                    color = "#4facfe"
+                    emoji = "⚪"
+
+                percentage = int(score * 100)
+
+                # Kart
+                st.markdown(f"""
+                <div style="background: white; border-radius: 15px; padding: 1.5rem; margin: 1rem 0; border-left: 5px solid {color};">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <h3 style="margin: 0; color: {color};">#{i} {topic}</h3>
+                        <div style="background: {color}; color: white; padding: 0.5rem 1rem; border-radius: 20px; font-weight: bold;">
+                            {emoji} {percentage}%
                         </div>
                     </div>
-                    """, unsafe_allow_html=True)
-
-                    # Wikipedia
-                    if show_wikipedia:
-                        wiki_data = st.session_state.api_handler.get_topic_summary(topic)
-                        if wiki_data['exists']:
-                            with st.expander("📚 Wikipedia Bilgisi"):
-                                st.write(wiki_data['summary'])
-                                if wiki_data['url']:
-                                    st.markdown(f"[Devamını Oku]({wiki_data['url']})")
-
-                    # Kaynaklar
-                    if show_resources:
-                        topic_data = st.session_state.text_processor.get_topic_by_name(topic)
-                        if topic_data and 'difficulty' in topic_data:
-                            with st.expander("🔗 Öğrenme Kaynakları"):
-                                # Zorluk seviyesine göre
-                                diff_map = {
-                                    "🌱 Başlangıç": "beginner",
-                                    "🚀 Orta": "intermediate",
-                                    "⚡ İleri": "advanced"
-                                }
-
-
-                                col1, col2, col3 = st.columns(3)
-
-                                with col1:
-                                    st.markdown("**🌱 Başlangıç**")
-                                    if 'beginner' in topic_data['difficulty']:
-                                        for idx, link in enumerate(topic_data['difficulty']['beginner'][:2], 1):
-                                            st.markdown(f"[Kaynak {idx}]({link})")
-
-                                with col2:
-                                    st.markdown("**🚀 Orta**")
-                                    if 'intermediate' in topic_data['difficulty']:
-                                        for idx, link in enumerate(topic_data['difficulty']['intermediate'][:2], 1):
-                                            st.markdown(f"[Kaynak {idx}]({link})")
-
-                                with col3:
-                                    st.markdown("**⚡ İleri**")
-                                    if 'advanced' in topic_data['difficulty']:
-                                        for idx, link in enumerate(topic_data['difficulty']['advanced'][:2], 1):
-                                            st.markdown(f"[Kaynak {idx}]({link})")
-
-                    st.markdown("<br>", unsafe_allow_html=True)
-            else:
-                st.warning("⚠️ Öneri bulunamadı. Farklı kelimeler deneyin.")
+                </div>
+                """, unsafe_allow_html=True)
+
+                if first_card_seconds is None:
+                    first_card_seconds = time.perf_counter() - search_start
+
+                # Wikipedia
+                if show_wikipedia:
+                    wiki_slots[topic] = st.empty()
+                    wiki_slots[topic].caption("⏳ Wikipedia özeti yükleniyor...")
+
+                # Kaynaklar
+                if show_resources:
+                    resource_slots.append((topic, st.empty()))
+
+                st.markdown("<br>", unsafe_allow_html=True)
+
+            # Veritabanına arka planda kaydet, yanıtı bekletmiyor
+            registry.query_log.log(user_query, session_id, recommendations)
+
+            # kaynaklar yerel veriden geliyor, kartların hemen ardından dolduruluyor;
+            # seçimler get_resources_for_topic önbelleğinden geliyor
+            text_processor = registry.text_processor
+            for topic, slot in resource_slots:
+                topic_data = text_processor.get_topic_by_name(topic)
+                if not (topic_data and topic_data.difficulty_levels):
+                    slot.empty()
+                    continue
+
+                with slot.container():
+                    with st.expander("🔗 Öğrenme Kaynakları"):
+                        # Zorluk seviyesine göre
+                        columns = st.columns(3)
+                        for column, (label, level) in zip(columns, (
+                            ("🌱 Başlangıç", "beginner"),
+                            ("🚀 Orta", "intermediate"),
+                            ("⚡ İleri", "advanced")
+                        )):
+                            with column:
+                                st.markdown(f"**{label}**")
+                                links = text_processor.get_resources_for_topic(topic, level, learning_style=[])
+                                for idx, link in enumerate(links, 1):
+                                    st.markdown(f"[Kaynak {idx}]({link})")
+
+            # Wikipedia panelleri özetler geldikçe dolduruluyor
+            pending = {future: topic for topic, future in wiki_futures.items()}
+            remaining = max(SUMMARY_DEADLINE - (time.perf_counter() - search_start), 0.0)
+            try:
+                for future in as_completed(list(pending), timeout=remaining):
+                    topic = pending.pop(future)
+                    wiki_data = future.result()
+                    if not wiki_data['exists']:
+                        wiki_slots[topic].empty()
+                        continue
+                    with wiki_slots[topic].container():
+                        with st.expander("📚 Wikipedia Bilgisi"):
+                            st.write(wiki_data['summary'])
+                            if wiki_data['url']:
+                                st.markdown(f"[Devamını Oku]({wiki_data['url']})")
+            except FutureTimeoutError:
+                # gelmeyenler arka planda tamamlanıp önbelleğe giriyor
+                for topic in pending.values():
+                    registry.api_handler.record_deadline_miss()
+                    wiki_slots[topic].caption("⏳ Wikipedia özeti henüz gelmedi, bir sonraki aramada hazır olacak.")
+
+            complete_seconds = time.perf_counter() - search_start
+            registry.record_render(first_card_seconds, complete_seconds)
+            st.caption(f"⏱️ İlk kart {first_card_seconds * 1000:.0f} ms, tüm paneller {complete_seconds * 1000:.0f} ms")
+        else:
+            st.warning("⚠️ Öneri bulunamadı. Farklı kelimeler deneyin.")
 
     elif search_button:
         st.error("❌ Lütfen bir şeyler yazın!")
@@ -336,11 +395,36 @@ with tab1:
 with tab2:
     st.header("📚 Sorgu Geçmişi")
 
-    history_df = st.session_state.db_manager.get_query_history(limit=100)
+    # filtreler veritabanında uygulanıyor, sayfalar istendikçe okunuyor
+    filter_col1, filter_col2, filter_col3 = st.columns(3)
+    with filter_col1:
+        history_user = st.text_input("👤 Kullanıcı", value="", key="history_user").strip()
+    with filter_col2:
+        history_prefix = st.text_input("🔤 Sorgu şununla başlıyor", value="", key="history_prefix").strip()
+    with filter_col3:
+        history_dates = st.date_input("📅 Tarih aralığı", value=(), key="history_dates")
+
+    history_filters = {
+        'session_id': history_user or None,
+        'text_prefix': history_prefix or None,
+        'date_from': history_dates[0] if len(history_dates) > 0 else None,
+        'date_to': history_dates[1] if len(history_dates) > 1 else None,
+    }
+
+    # her sayfanın başlangıç imleci yığında; filtre değişince ilk sayfaya dönülüyor
+    if st.session_state.get('history_filter_key') != history_filters:
+        st.session_state.history_filter_key = history_filters
+        st.session_state.history_cursors = [None]
+
+    history_rows, next_cursor = registry.db_manager.get_query_history_page(
+        limit=HISTORY_PAGE_SIZE,
+        cursor=st.session_state.history_cursors[-1],
+        **history_filters
+    )
 
-    if not history_df.empty:
+    if history_rows:
         st.dataframe(
-            history_df,
+            [dict(zip(HISTORY_COLUMNS, row)) for row in history_rows],
             use_container_width=True,
             column_config={
                 "query_text": "Sorgu",
@@ -348,14 +432,32 @@ with tab2:
                 "user_session": "Kullanıcı"
             }
         )
+    elif any(history_filters.values()):
+        st.info("Filtreye uyan sorgu yok.")
     else:
         st.info("Henüz sorgu yok!")
 
+    nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+    with nav_col1:
+        st.button(
+            "◀ Önceki",
+            disabled=len(st.session_state.history_cursors) == 1,
+            on_click=lambda: st.session_state.history_cursors.pop()
+        )
+    with nav_col2:
+        st.caption(f"Sayfa {len(st.session_state.history_cursors)}")
+    with nav_col3:
+        st.button(
+            "Sonraki ▶",
+            disabled=next_cursor is None,
+            on_click=lambda cursor=next_cursor: st.session_state.history_cursors.append(cursor)
+        )
+
 # TAB 3: İstatistikler
 with tab3:
     st.header("📊 İstatistikler")
 
-    topics_stats = st.session_state.db_manager.get_topic_statistics()
+    topics_stats = registry.db_manager.get_topic_statistics()
 
     if not topics_stats.empty:
         col1, col2 = st.columns(2)
@@ -367,8 +469,8 @@ with tab3:
 
         with col2:
             st.subheader("📅 Zaman Çizelgesi")
-            history_df = st.session_state.db_manager.get_query_history(limit=1000)
-            fig2 = st.session_state.visualizer.create_timeline_chart(history_df)
+            daily_counts = registry.db_manager.get_daily_query_counts(days=90)
+            fig2 = st.session_state.visualizer.create_daily_count_chart(daily_counts)
             st.plotly_chart(fig2, use_container_width=True)
     else:
         st.info("İstatistik için sorgu yapın!")
@@ -378,35 +480,36 @@ with tab4:
     st.header("🎯 Konu Keşfi")
     st.write("Konu üzerine tıklayarak detayları görün.")
 
-    all_topics = st.session_state.text_processor.get_all_topics()
+    text_processor = registry.text_processor
+    all_topics = text_processor.get_all_topics()
 
     # Her konu için expander
     for topic in all_topics:
         with st.expander(f"📘 {topic}"):
-            topic_data = st.session_state.text_processor.get_topic_by_name(topic)
+            topic_data = text_processor.get_topic_by_name(topic)
 
-            if topic_data and 'difficulty' in topic_data:
+            if topic_data and topic_data.difficulty_levels:
                 st.markdown("#### 📚 Öğrenme Kaynakları")
 
                 col1, col2, col3 = st.columns(3)
 
                 with col1:
                     st.markdown("**🌱 Başlangıç**")
-                    if 'beginner' in topic_data['difficulty']:
-                        for i, link in enumerate(topic_data['difficulty']['beginner'][:3], 1):
-                            st.markdown(f"{i}. [Link]({link})")
+                    links = text_processor.get_resources_for_topic(topic, 'beginner', learning_style=[], per_level=3)
+                    for i, link in enumerate(links, 1):
+                        st.markdown(f"{i}. [Link]({link})")
 
                 with col2:
                     st.markdown("**🚀 Orta**")
-                    if 'intermediate' in topic_data['difficulty']:
-                        for i, link in enumerate(topic_data['difficulty']['intermediate'][:3], 1):
-                            st.markdown(f"{i}. [Link]({link})")
+                    links = text_processor.get_resources_for_topic(topic, 'intermediate', learning_style=[], per_level=3)
+                    for i, link in enumerate(links, 1):
+                        st.markdown(f"{i}. [Link]({link})")
 
                 with col3:
                     st.markdown("**⚡ İleri**")
-                    if 'advanced' in topic_data['difficulty']:
-                        for i, link in enumerate(topic_data['difficulty']['advanced'][:3], 1):
-                            st.markdown(f"{i}. [Link]({link})")
+                    links = text_processor.get_resources_for_topic(topic, 'advanced', learning_style=[], per_level=3)
+                    for i, link in enumerate(links, 1):
+                        st.markdown(f"{i}. [Link]({link})")
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,102 @@
+"""Tam arama ile LSH yaklaşık aramasının recall@k / gecikme karşılaştırması
+
+Çalıştırma: python benchmarks/bench_ann.py [konu_sayısı] [sorgu_sayısı]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.search_index import ExactIndex, LSHIndex
+
+
+def synthetic_catalog(n_topics, n_terms=50000, n_themes=2000, terms_per_theme=60, seed=0):
+    """Tema yapılı sentetik TF-IDF konu matrisi
+
+    Her konu bir temanın kelimelerinden ~12 terim ve tüm katalogda sık geçen
+    birkaç genel terim içerir (öğrenme, eğitim, temel gibi).
+    """
+    rng = np.random.default_rng(seed)
+    theme_terms = rng.integers(100, n_terms, size=(n_themes, terms_per_theme))
+    topic_themes = rng.integers(0, n_themes, size=n_topics)
+
+    per_topic, common = 12, 3
+    local = np.minimum(rng.zipf(1.5, size=(n_topics, per_topic)), terms_per_theme) - 1
+    cols = np.hstack([
+        theme_terms[topic_themes[:, np.newaxis], local],
+        np.minimum(rng.zipf(1.5, size=(n_topics, common)), 100) - 1,
+    ])
+    rows = np.repeat(np.arange(n_topics), per_topic + common)
+    counts = sparse.csr_matrix((np.ones(rows.size), (rows, cols.ravel())), shape=(n_topics, n_terms))
+    counts.sum_duplicates()
+    transformer = TfidfTransformer().fit(counts)
+    return transformer.transform(counts).tocsr(), transformer
+
+
+def synthetic_queries(matrix, transformer, count, seed=1):
+    """Rastgele konulardan birkaç terim + bir genel terimden sorgu üret"""
+    rng = np.random.default_rng(seed)
+    n_topics, n_terms = matrix.shape
+    rows, cols = [], []
+    for q, topic in enumerate(rng.integers(0, n_topics, size=count)):
+        terms = matrix.indices[matrix.indptr[topic]:matrix.indptr[topic + 1]]
+        picked = rng.choice(terms, size=min(4, len(terms)), replace=False)
+        for term in list(picked) + [int(rng.integers(0, 5))]:
+            rows.append(q)
+            cols.append(term)
+    counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(count, n_terms))
+    return transformer.transform(counts).tocsr()
+
+
+def run(index, queries, k):
+    latencies, results = [], []
+    for row in range(queries.shape[0]):
+        start = time.perf_counter()
+        results.append(index.search(queries[row], k)[0])
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    return results, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def recall_at_k(exact_results, approx_results):
+    hits, total = 0, 0
+    for (exact_idx, exact_scores), (approx_idx, _) in zip(exact_results, approx_results):
+        relevant = set(exact_idx[exact_scores > 0].tolist())
+        hits += len(relevant & set(approx_idx.tolist()))
+        total += len(relevant)
+    return hits / max(total, 1)
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    k = 10
+
+    matrix, transformer = synthetic_catalog(n_topics)
+    queries = synthetic_queries(matrix, transformer, n_queries)
+
+    exact = ExactIndex(matrix)
+    exact_results, p50, p99 = run(exact, queries, k)
+    print(f"konu: {n_topics:,}  sorgu: {n_queries}  k: {k}")
+    print(f"{'mod':<28}{'kurulum sn':>12}{'p50 ms':>10}{'p99 ms':>10}{'recall@k':>10}")
+    print(f"{'exact':<28}{'-':>12}{p50:>10.2f}{p99:>10.2f}{1.0:>10.3f}")
+
+    default_bits = LSHIndex.default_bits(n_topics)
+    for n_tables, n_bits in [(8, default_bits), (16, default_bits), (32, default_bits), (32, default_bits - 2)]:
+        start = time.perf_counter()
+        lsh = LSHIndex.build(matrix, n_tables=n_tables, n_bits=n_bits)
+        build_seconds = time.perf_counter() - start
+
+        approx_results, p50, p99 = run(lsh, queries, k)
+        recall = recall_at_k(exact_results, approx_results)
+        label = f"lsh tables={n_tables} bits={n_bits}"
+        print(f"{label:<28}{build_seconds:>12.2f}{p50:>10.2f}{p99:>10.2f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
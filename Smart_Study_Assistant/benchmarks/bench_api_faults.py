@@ -0,0 +1,84 @@
+"""Wikipedia yavaş ya da çökmüşken arama başına özet gecikmesi
+
+utils/wiki_stub.py taklit sunucusuna hata enjekte edilerek her senaryoda
+aynı aramalar (5 konunun özeti, SUMMARY_DEADLINE ile) soğuk önbellekle
+çalıştırılıyor. Arama süresi, süresinde gelen / yedek (bulunamadı) / hiç
+gelmeyen özet sayıları ve APIHandler.metrics() sayaçları raporlanıyor.
+
+Çalıştırma: python benchmarks/bench_api_faults.py [arama_sayısı]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_summary_cache import stub_pages
+from utils.wiki_stub import WikiStub
+from models.text_processor import TextProcessor
+from utils.api_handler import SUMMARY_DEADLINE, APIHandler
+from utils.summary_cache import SummaryCache
+
+SCENARIOS = [
+    ('sağlıklı', {}, {}),
+    ('TR 2 sn yavaş', {'language_delays': {'tr': 2.0}}, {}),
+    ('TR 2 sn yavaş + hedge 0.3 sn', {'language_delays': {'tr': 2.0}}, {'hedge_after': 0.3}),
+    ('TR 10 sn asılı', {'language_delays': {'tr': 10.0}}, {}),
+    ('TR 10 sn asılı + hedge 0.3 sn', {'language_delays': {'tr': 10.0}}, {'hedge_after': 0.3}),
+    ('TR hep 503', {'error_rate': 1.0, 'fault_languages': ['tr']}, {}),
+    ('%30 bağlantı kopuyor', {'drop_rate': 0.3}, {}),
+]
+
+
+def main():
+    n_searches = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    topics = TextProcessor().get_all_topics()
+    rng = random.Random(1)
+    searches = [rng.sample(topics, min(5, len(topics))) for _ in range(n_searches)]
+    pages = stub_pages(topics)
+
+    print(f"{n_searches} arama x 5 özet, süre bütçesi {SUMMARY_DEADLINE} sn, taban gecikme 30 ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        for index, (name, faults, options) in enumerate(SCENARIOS):
+            stub = WikiStub(pages=pages, delay=0.03, **faults).start()
+            # tek hatalı senaryo sonraki senaryoya önbellek bırakmasın
+            cache = SummaryCache(os.path.join(tmp, f'{index}.db'))
+            handler = APIHandler(cache=cache, api_url=stub.url, snapshot_path=None,
+                                 request_timeout=(1.0, 2.5), **options)
+
+            latencies, arrived, fallback, missed = [], 0, 0, 0
+            for topics_in_search in searches:
+                # önbelleği her aramada boşalt ki hep ağ yolu ölçülsün
+                cache.clear()
+                start = time.perf_counter()
+                results = handler.get_topic_summaries(topics_in_search)
+                latencies.append(time.perf_counter() - start)
+                for summary in results.values():
+                    if summary is None:
+                        missed += 1
+                    elif summary['exists']:
+                        arrived += 1
+                    else:
+                        fallback += 1
+
+            latencies = np.array(latencies) * 1000
+            metrics = handler.metrics()
+            breakers = ' '.join(f"{lang}:{b['state']}/{b['opened']}x" for lang, b in sorted(metrics['breakers'].items()))
+            print(f"{name:30} p50 {np.percentile(latencies, 50):7.1f} ms  p99 {np.percentile(latencies, 99):7.1f} ms  "
+                  f"özet {arrived:3d} yedek {fallback:3d} gelmedi {missed:3d}  "
+                  f"istek {metrics['requests']:4d} kesilen {metrics['short_circuits']:4d} "
+                  f"hedge {metrics['hedges']}/{metrics['hedge_wins']}  devre {breakers}")
+
+            handler._executor.shutdown(wait=True)
+            handler._hedge_executor.shutdown(wait=True)
+            cache.close()
+            stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Tekil get_recommendations döngüsü ile get_recommendations_batch karşılaştırması
+
+Çalıştırma: python benchmarks/bench_batch_recommendations.py [sorgu_sayısı]
+"""
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.ml_model import MLModel
+
+
+def load_logged_queries(db_path):
+    """user_queries tablosundaki sorguları salt okunur oku"""
+    if not os.path.exists(db_path):
+        return []
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in conn.execute('SELECT query_text FROM user_queries')]
+    finally:
+        conn.close()
+
+
+def synthetic_queries(model, count, seed=42):
+    """Konu anahtar kelimelerinden rastgele sorgular üret"""
+    rng = random.Random(seed)
+    words = ' '.join(model.text_processor.get_all_keywords()).split()
+    return [' '.join(rng.sample(words, rng.randint(1, 4))) for _ in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    model = MLModel()
+
+    db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'study_assistant.db')
+    queries = load_logged_queries(db_path)
+    queries = (queries + synthetic_queries(model, count))[:count]
+
+    start = time.perf_counter()
+    loop_results = [model.get_recommendations(q, top_n=5) for q in queries]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = model.get_recommendations_batch(queries, top_n=5)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for a, b in zip(loop_results, batch_results)
+        if [t for t, _ in a] != [t for t, _ in b]
+        or any(abs(x - y) > 1e-9 for (_, x), (_, y) in zip(a, b))
+    )
+
+    print(f"sorgu sayısı   : {len(queries)}")
+    print(f"tekil döngü    : {loop_seconds:.3f} sn ({len(queries) / loop_seconds:,.0f} sorgu/sn)")
+    print(f"batch          : {batch_seconds:.3f} sn ({len(queries) / batch_seconds:,.0f} sorgu/sn)")
+    print(f"hızlanma       : {loop_seconds / batch_seconds:.1f}x")
+    print(f"farklı sonuç   : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""TextProcessor.clean_text altın korpus kontrolü ve sorgu/sn ölçümü
+
+Eski (her çağrıda yedi re.sub) uygulama referans olarak burada duruyor;
+yeni pipeline'ın çıktısı korpusun tamamında onunla birebir aynı olmalı.
+
+Çalıştırma: python benchmarks/bench_clean_text.py [sorgu_sayısı]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.text_processor import TextProcessor
+
+
+def legacy_clean_text(text):
+    text = text.lower()
+    text = re.sub(r'[^\wşğüöçıİŞĞÜÖÇ\s]', '', text)
+    text = re.sub(r'(robot)ik\b', r'\1', text)
+    text = re.sub(r'(program)lama\b', r'\1', text)
+    text = re.sub(r'(öğren)me\b', r'\1', text)
+    text = re.sub(r'(geliştir)me\b', r'\1', text)
+    text = re.sub(r'(veri)\s+bilim\w*', r'\1', text)
+    text = re.sub(r'(web)\s+geliştir\w*', r'\1', text)
+    return text.strip()
+
+
+def golden_corpus(processor, size, seed=7):
+    """Konu verisi, kural tetikleyicileri, noktalama ve büyük harflerden korpus"""
+    rng = random.Random(seed)
+    words = ' '.join(processor.get_all_topics() + processor.get_all_keywords()).split()
+    words += ['robotik', 'Robotik!', 'programlama,', 'öğrenme', 'Öğrenmek', 'geliştirme', 'veri bilimi',
+              'VERİ  BİLİMCİSİ', 'web geliştirme', 'Web Geliştiriciliği', 'İstanbul', 'IŞIK', 'c++', 'c#',
+              'node.js', '😀', 'yapay-zeka', 'makine\töğrenmesi', '  ', '\n', 'kodlama?', 'robotikçi']
+    corpus = list(words)
+    for _ in range(size):
+        corpus.append(' '.join(rng.choice(words) for _ in range(rng.randint(1, 8))))
+    return corpus
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    processor = TextProcessor()
+    corpus = golden_corpus(processor, size)
+
+    mismatches = [text for text in corpus if processor._clean_text_uncached(text) != legacy_clean_text(text)]
+    print(f"altın korpus   : {len(corpus)} metin, {len(mismatches)} fark")
+    for text in mismatches[:5]:
+        print(f"  FARK: {text!r}")
+
+    start = time.perf_counter()
+    for text in corpus:
+        legacy_clean_text(text)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in corpus:
+        processor._clean_text_uncached(text)
+    compiled_seconds = time.perf_counter() - start
+
+    # gerçek trafik gibi tekrar eden sorgular: memoize yol
+    rng = random.Random(1)
+    repeated = [rng.choice(corpus[:500]) for _ in range(len(corpus))]
+    start = time.perf_counter()
+    for text in repeated:
+        processor.clean_text(text)
+    cached_seconds = time.perf_counter() - start
+
+    n = len(corpus)
+    print(f"eski           : {n / legacy_seconds:>12,.0f} sorgu/sn")
+    print(f"derlenmiş      : {n / compiled_seconds:>12,.0f} sorgu/sn")
+    print(f"memoize (tekrar): {n / cached_seconds:>11,.0f} sorgu/sn")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
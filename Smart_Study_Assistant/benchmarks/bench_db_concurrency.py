@@ -0,0 +1,115 @@
+"""Çok thread'li save_query / save_recommendations yük testi
+
+Eski (her çağrıda yeni bağlantı, rollback journal, satır satır INSERT)
+uygulama ile havuzlu WAL DatabaseManager aynı iş yükünde karşılaştırılıyor.
+Geçici veritabanı kullanılıyor, data/study_assistant.db'ye dokunulmuyor.
+
+Çalıştırma: python benchmarks/bench_db_concurrency.py [thread_sayısı] [thread_başına_istek]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database.db_manager import DatabaseManager
+from database.init_db import init_database
+
+
+class LegacyDatabaseManager:
+    """Havuzsuz eski uygulama, karşılaştırma için"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def save_query(self, query_text, session_id="default"):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('INSERT INTO user_queries (query_text, user_session) VALUES (?, ?)', (query_text, session_id))
+        query_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return query_id
+
+    def save_recommendations(self, query_id, recommendations):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        for topic, score in recommendations:
+            cursor.execute('''
+                INSERT INTO recommendations (query_id, recommended_topic, similarity_score)
+                VALUES (?, ?, ?)
+            ''', (query_id, topic, float(score)))
+        conn.commit()
+        conn.close()
+
+
+def hammer(manager, n_threads, per_thread):
+    recommendations = [(f'Konu {i}', 0.9 - i * 0.1) for i in range(5)]
+    latencies, errors = [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(n_threads)
+
+    def worker(worker_id):
+        local = []
+        barrier.wait()
+        for i in range(per_thread):
+            start = time.perf_counter()
+            try:
+                query_id = manager.save_query(f'sorgu {worker_id}-{i}', f'oturum-{worker_id}')
+                manager.save_recommendations(query_id, recommendations)
+            except sqlite3.Error as e:
+                with lock:
+                    errors.append(str(e))
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests_per_s': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'errors': len(errors),
+        'sample_error': errors[0] if errors else '',
+    }
+
+
+def main():
+    n_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print(f"{n_threads} thread x {per_thread} istek (save_query + 5 öneri)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, build in (
+            ('eski (bağlantı başına)', LegacyDatabaseManager),
+            ('havuz + WAL', DatabaseManager),
+        ):
+            db_path = os.path.join(tmp, f'{len(name)}.db')
+            init_database(db_path)
+            manager = build(db_path)
+            result = hammer(manager, n_threads, per_thread)
+            if hasattr(manager, 'close'):
+                manager.close()
+
+            with sqlite3.connect(db_path) as conn:
+                saved = conn.execute('SELECT COUNT(*) FROM user_queries').fetchone()[0]
+
+            print(f"{name:24} {result['requests_per_s']:8.0f} istek/sn  p50 {result['p50_ms']:7.2f} ms  "
+                  f"p99 {result['p99_ms']:8.2f} ms  hata {result['errors']}  kayıt {saved}  {result['sample_error']}")
+
+
+if __name__ == "__main__":
+    main()
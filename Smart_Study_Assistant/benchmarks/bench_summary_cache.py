@@ -0,0 +1,86 @@
+"""Kalıcı Wikipedia önbelleğinin ağ isteği / gecikme ölçümü
+
+utils/wiki_stub.py taklit sunucusu gerçek katalogdaki konularla
+dolduruluyor (bir kısmı sadece İngilizcede, bir kısmı hiç yok) ve her
+yanıta sabit gecikme ekleniyor. Aynı aramalar soğuk önbellekle, sıcak
+önbellekle (yeni süreç gibi, dosyadan) ve süresi dolmuş önbellekle
+(stale-while-revalidate) tekrarlanıyor. Geçici önbellek dosyası kullanılıyor.
+
+Çalıştırma: python benchmarks/bench_summary_cache.py [arama_sayısı] [gecikme_ms]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.wiki_stub import WikiStub
+from models.text_processor import TextProcessor
+from utils.api_handler import APIHandler
+from utils.summary_cache import SummaryCache
+
+
+def stub_pages(topics, seed=0):
+    rng = random.Random(seed)
+    pages = {'tr': {}, 'en': {}}
+    for topic in topics:
+        title = topic[:1].upper() + topic[1:]
+        roll = rng.random()
+        language = 'tr' if roll < 0.6 else 'en' if roll < 0.85 else None
+        if language:
+            pages[language][title] = {
+                'extract': f'{topic} hakkında özet. ' * 40,
+                'categories': [f'Kategori:{topic}', 'Kategori:Bilişim'],
+            }
+    return pages
+
+
+def run(handler, searches):
+    latencies = []
+    for topics in searches:
+        start = time.perf_counter()
+        handler.get_topic_summaries(topics, timeout=None)
+        handler.get_topic_categories(topics[0])
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000
+
+
+def main():
+    n_searches = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 100) / 1000
+
+    topics = TextProcessor().get_all_topics()
+    rng = random.Random(1)
+    searches = [rng.sample(topics, min(5, len(topics))) for _ in range(n_searches)]
+
+    stub = WikiStub(pages=stub_pages(topics), delay=delay).start()
+    print(f"{len(topics)} konu, {n_searches} arama x 5 özet + kategoriler, yanıt gecikmesi {delay * 1000:.0f} ms")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'wiki_cache.db')
+
+            for name, cache_kwargs in (
+                ('soğuk önbellek', {}),
+                ('sıcak önbellek (yeni süreç)', {}),
+                ('süresi dolmuş (bayat)', {'ttl': 0, 'negative_ttl': 0}),
+            ):
+                handler = APIHandler(cache=SummaryCache(path, **cache_kwargs), api_url=stub.url, snapshot_path=None)
+                before = stub.request_count()
+                latencies = run(handler, searches)
+                sync_requests = stub.request_count() - before
+                handler._executor.shutdown(wait=True)
+                stats = handler.cache_stats()
+                print(f"{name:28} istek {sync_requests:4d} (arka plan dahil {stub.request_count() - before:4d})  "
+                      f"p50 {np.percentile(latencies, 50):7.2f} ms  p99 {np.percentile(latencies, 99):7.2f} ms  "
+                      f"taze {stats['fresh']} bayat {stats['stale']} ıskalama {stats['misses']}")
+                handler.cache.close()
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Konu kayıtlarının bellek ölçümü: düz sözlükler vs kompakt Topic kayıtları
+
+Sentetik katalogda URL'ler gerçek veriye benzer şekilde tekrar ediyor
+(aynı dokümantasyon / video linki birden fazla konu ve kovada geçiyor).
+
+Çalıştırma: python benchmarks/bench_topic_memory.py [konu_sayısı]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.topic import BucketSchema, Topic, UrlTable, DIFFICULTY_LEVELS, LEARNING_STYLES
+
+
+def synthetic_topics(n_topics, n_urls=None, seed=42):
+    """Tekrarlayan URL havuzundan konu sözlükleri üret (JSON'dan okunmuş gibi)"""
+    rng = random.Random(seed)
+    n_urls = n_urls or max(100, n_topics // 2)
+    pool = [f"https://example.org/kaynak/{i}/{rng.getrandbits(32):08x}" for i in range(n_urls)]
+
+    topics = []
+    for i in range(n_topics):
+        topics.append({
+            'id': f'konu-{i}',
+            'name': f'Konu {i}',
+            'keywords': ' '.join(f'kelime{rng.randrange(5000)}' for _ in range(8)),
+            'difficulty': {level: rng.sample(pool, 3) for level in DIFFICULTY_LEVELS},
+            'learning_style': {style: rng.sample(pool, 2) for style in LEARNING_STYLES},
+            'popularity': rng.choice(['düşük', 'orta', 'yüksek']),
+        })
+
+    # gerçek yüklemedeki gibi her string ayrı nesne olsun
+    return json.loads(json.dumps(topics))
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    raw = json.dumps(synthetic_topics(n_topics))
+
+    dicts, dict_bytes, dict_time = measure(lambda: json.loads(raw))
+
+    def build_records():
+        schema, urls = BucketSchema(), UrlTable()
+        return [Topic.from_dict(topic, schema, urls) for topic in json.loads(raw)], urls
+
+    (records, urls), record_bytes, record_time = measure(build_records)
+
+    # iki temsil aynı içeriği vermeli
+    mismatches = sum(1 for d, t in zip(dicts, records) if t.to_dict() != d)
+
+    print(f"Konu sayısı: {n_topics}, tekil URL: {len(urls)}")
+    print(f"dict    : {dict_bytes / 1024 / 1024:8.1f} MB  ({dict_time:.2f} sn)")
+    print(f"Topic   : {record_bytes / 1024 / 1024:8.1f} MB  ({record_time:.2f} sn)")
+    print(f"Kazanç  : {dict_bytes / max(record_bytes, 1):.1f}x, uyuşmazlık: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
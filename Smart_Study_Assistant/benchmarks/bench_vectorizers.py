@@ -0,0 +1,137 @@
+"""Vektörleştirici modlarının kalite / bellek / gecikme karşılaştırması
+
+İki veri seti ölçülüyor:
+  - gerçek katalog + benchmarks/labelled_queries.json (elle etiketli sorgular)
+  - sentetik büyük katalog; sorgular bir konunun kendi kelimelerinden
+    üretildiği için etiketi biliniyor
+
+Her mod için hit@1 / hit@5, model kurulum belleği (tracemalloc), kurulum
+süresi ve sorgu başına gecikme (önbellek kapalı) raporlanıyor.
+
+Çalıştırma: python benchmarks/bench_vectorizers.py [konu_sayısı] [sorgu_sayısı]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+
+LABELLED_PATH = os.path.join(os.path.dirname(__file__), 'labelled_queries.json')
+
+MODES = [
+    ('vocabulary max_features=100', {'vectorizer_mode': 'vocabulary', 'max_features': 100}),
+    ('vocabulary max_features=None', {'vectorizer_mode': 'vocabulary', 'max_features': None}),
+    ('hashing n_features=2^16', {'vectorizer_mode': 'hashing', 'n_features': 2 ** 16}),
+    ('hashing n_features=2^18', {'vectorizer_mode': 'hashing', 'n_features': 2 ** 18}),
+    ('hashing n_features=2^20', {'vectorizer_mode': 'hashing', 'n_features': 2 ** 20}),
+]
+
+
+def synthetic_catalog(path, n_topics, n_themes=None, theme_words=40, seed=0):
+    """Tema yapılı sentetik konu dosyası yaz, (sorgu, konu) üretici için kelimeleri döndür"""
+    rng = random.Random(seed)
+    n_themes = n_themes or max(10, n_topics // 20)
+    syllables = ['ka', 're', 'mi', 'to', 'lu', 'sa', 'ne', 'po', 'di', 'ga', 'ver', 'sin', 'tek', 'bil']
+
+    def word():
+        return ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+    themes = [[word() for _ in range(theme_words)] for _ in range(n_themes)]
+    common = ['öğrenme', 'temel', 'ileri', 'giriş', 'eğitim', 'proje']
+
+    topics, topic_words = [], []
+    for i in range(n_topics):
+        theme = themes[rng.randrange(n_themes)]
+        words = [theme[min(int(rng.paretovariate(1.2)) - 1, theme_words - 1)] for _ in range(6)]
+        # konuya özgü iki kelime, etiketli sorguların ayırt edici kısmı
+        words += [word() + str(i % 97), word()]
+        topics.append({
+            'id': f'sentetik-{i}',
+            'name': f'Konu {i} {words[-1]}',
+            'keywords': ' '.join(words + rng.sample(common, 2)),
+        })
+        topic_words.append(words)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'topics': topics}, f, ensure_ascii=False)
+
+    return [topic['name'] for topic in topics], topic_words
+
+
+def synthetic_queries(names, topic_words, count, seed=1):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        topic = rng.randrange(len(names))
+        queries.append((' '.join(rng.sample(topic_words[topic], 3)), names[topic]))
+    return queries
+
+
+def evaluate(text_processor, settings, queries):
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = MLModel(text_processor=text_processor, index_dir=None, cache_size=0, **settings)
+    build_seconds = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    hits1 = hits5 = 0
+    latencies = []
+    for query, label in queries:
+        start = time.perf_counter()
+        recommendations = model.get_recommendations(query, top_n=5)
+        latencies.append(time.perf_counter() - start)
+        names = [name for name, _ in recommendations]
+        hits1 += names[:1] == [label]
+        hits5 += label in names
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'hit@1': hits1 / len(queries),
+        'hit@5': hits5 / len(queries),
+        'memory_mb': memory / 1024 / 1024,
+        'build_s': build_seconds,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'features': model.tfidf_matrix.shape[1],
+    }
+
+
+def report(title, text_processor, queries):
+    print(f"\n{title}: {len(text_processor.get_all_topics())} konu, {len(queries)} etiketli sorgu")
+    print(f"{'mod':32} {'hit@1':>6} {'hit@5':>6} {'bellek MB':>10} {'kurulum s':>10} "
+          f"{'p50 ms':>7} {'p99 ms':>7} {'sütun':>8}")
+    for name, settings in MODES:
+        r = evaluate(text_processor, settings, queries)
+        print(f"{name:32} {r['hit@1']:6.3f} {r['hit@5']:6.3f} {r['memory_mb']:10.1f} {r['build_s']:10.2f} "
+              f"{r['p50_ms']:7.2f} {r['p99_ms']:7.2f} {r['features']:8d}")
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with open(LABELLED_PATH, 'r', encoding='utf-8') as f:
+        labelled = [(row['query'], row['topic']) for row in json.load(f)]
+    report("Gerçek katalog", TextProcessor(), labelled)
+
+    path = os.path.join(os.path.dirname(__file__), f'.synthetic_topics_{n_topics}.json')
+    try:
+        names, topic_words = synthetic_catalog(path, n_topics)
+        text_processor = TextProcessor(sources=[path], lazy_resources=False)
+        report("Sentetik katalog", text_processor, synthetic_queries(names, topic_words, n_queries))
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
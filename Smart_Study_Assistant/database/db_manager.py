@@ -1,100 +1,265 @@
-import sqlite3
+import csv
 import os
 import pandas as pd
 from datetime import datetime
 
+from database.pool import ConnectionPool
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'study_assistant.db')
+
+# sorgular sabit metin; sqlite3 aynı bağlantıda aynı metni derlenmiş haliyle tekrar kullanıyor
+INSERT_QUERY_SQL = 'INSERT INTO user_queries (query_text, user_session) VALUES (?, ?)'
+INSERT_QUERY_WITH_ID_SQL = 'INSERT INTO user_queries (id, query_text, user_session) VALUES (?, ?, ?)'
+# AUTOINCREMENT silinen id'leri tekrar vermiyor, sqlite_sequence de hesaba katılıyor
+LAST_QUERY_ID_SQL = '''
+    SELECT MAX(
+        COALESCE((SELECT MAX(id) FROM user_queries), 0),
+        COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'user_queries'), 0)
+    )
+'''
+# seri dün ya da bugün devam ediyorsa geçerli, yoksa 0 (gün tarihleri UTC, query_date gibi)
+STREAK_SQL = '''
+    SELECT
+        CASE WHEN last_active_day >= date('now', '-1 day') THEN current_streak ELSE 0 END,
+        longest_streak,
+        last_active_day
+    FROM user_streaks
+    WHERE user_session = ?
+'''
+INSERT_RECOMMENDATION_SQL = '''
+    INSERT INTO recommendations (query_id, recommended_topic, similarity_score)
+    VALUES (?, ?, ?)
+'''
+
+# geçmiş sayfaları (query_date, id) üzerinden keyset ile ilerliyor; sıralamayı
+# idx_user_queries_date_text (kapsayan) ya da idx_user_queries_session karşılıyor
+HISTORY_COLUMNS = ('id', 'query_text', 'query_date', 'user_session')
+HISTORY_PAGE_SQL = '''
+    SELECT id, query_text, query_date, user_session
+    FROM user_queries
+    {where}
+    ORDER BY query_date DESC, id DESC
+    LIMIT ?
+'''
+DAILY_COUNTS_SQL = '''
+    SELECT date(query_date) AS day, COUNT(*)
+    FROM user_queries
+    WHERE query_date >= date('now', ?)
+    GROUP BY day
+    ORDER BY day
+'''
+# metin öneki aralık koşuluna çevriliyor, (query_date, id, query_text) indeksinde uygulanıyor
+_PREFIX_UPPER = '\U0010ffff'
+
 
 class DatabaseManager:
     """Veritabanı işlemlerini yöneten sınıf"""
 
-    def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'study_assistant.db')
+    def __init__(self, db_path: str = None, pool_size: int = 8):
+        self.db_path = db_path or DEFAULT_DB_PATH
         self._ensure_db_exists()
+        self.pool = ConnectionPool(self.db_path, size=pool_size)
 
     def _ensure_db_exists(self):
         """Veritabanının var olduğundan emin ol"""
         if not os.path.exists(self.db_path):
             from database.init_db import init_database
-            init_database()
+            init_database(self.db_path)
 
     def get_connection(self):
-        """Veritabanı bağlantısı döndür"""
-        return sqlite3.connect(self.db_path)
+        """Veritabanı bağlantısı döndür (havuz dışı, kapatmak çağırana ait)"""
+        return self.pool.connect()
+
+    def close(self):
+        """Havuzdaki bağlantıları kapat"""
+        self.pool.close()
 
     def save_query(self, query_text, session_id="default"):
         """Kullanıcı sorgusunu kaydet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO user_queries (query_text, user_session)
-            VALUES (?, ?)
-        ''', (query_text, session_id))
-
-        query_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.pool.connection() as conn:
+            with conn:
+                cursor = conn.execute(INSERT_QUERY_SQL, (query_text, session_id))
 
-        return query_id
+        return cursor.lastrowid
 
     def save_recommendations(self, query_id, recommendations):
         """Önerileri kaydet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        rows = [(query_id, topic, float(score)) for topic, score in recommendations]
 
-        for topic, score in recommendations:
-            cursor.execute('''
-                INSERT INTO recommendations (query_id, recommended_topic, similarity_score)
-                VALUES (?, ?, ?)
-            ''', (query_id, topic, float(score)))
+        with self.pool.connection() as conn:
+            with conn:
+                conn.executemany(INSERT_RECOMMENDATION_SQL, rows)
 
-        conn.commit()
-        conn.close()
+    def save_queries_with_recommendations(self, entries):
+        """
+        Sorguları ve önerilerini tek transaction'da toplu kaydet
 
-    def get_query_history(self, limit=50):
-        """Sorgu geçmişini getir"""
-        conn = self.get_connection()
+        id'ler yazma kilidi alındıktan sonra burada veriliyor, böylece
+        sorgular da öneriler de executemany ile tek seferde yazılabiliyor.
 
-        query = '''
-            SELECT 
-                id,
-                query_text,
-                query_date,
-                user_session
-            FROM user_queries
-            ORDER BY query_date DESC
-            LIMIT ?
-        '''
+        Args:
+            entries: [(sorgu_metni, oturum_id, [(konu, skor), ...]), ...]
 
-        df = pd.read_sql_query(query, conn, params=(limit,))
-        conn.close()
+        Returns:
+            Sırasıyla verilen sorgu id'leri
+        """
+        if not entries:
+            return []
 
-        return df
+        with self.pool.connection() as conn:
+            # BEGIN IMMEDIATE: id okunurken başka yazar araya giremez
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                last_id = conn.execute(LAST_QUERY_ID_SQL).fetchone()[0]
+                query_ids = list(range(last_id + 1, last_id + 1 + len(entries)))
+
+                conn.executemany(INSERT_QUERY_WITH_ID_SQL, [
+                    (query_id, query_text, session_id)
+                    for query_id, (query_text, session_id, _) in zip(query_ids, entries)
+                ])
+                conn.executemany(INSERT_RECOMMENDATION_SQL, [
+                    (query_id, topic, float(score))
+                    for query_id, (_, _, recommendations) in zip(query_ids, entries)
+                    for topic, score in recommendations
+                ])
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+        return query_ids
+
+    def get_streak(self, session_id):
+        """
+        Kullanıcının öğrenme serisi (tek satır, birincil anahtarla okunur)
+
+        Returns:
+            {'streak', 'longest_streak', 'last_active_day'} ya da hiç sorgusu yoksa None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute(STREAK_SQL, (session_id,)).fetchone()
+
+        if row is None:
+            return None
+        return {'streak': row[0], 'longest_streak': row[1], 'last_active_day': row[2]}
+
+    def backfill_streaks(self):
+        """Seri tablosunu tüm geçmişten yeniden hesapla"""
+        from database.migrations import backfill_streaks
+        return backfill_streaks(self.db_path)
+
+    @staticmethod
+    def _history_filters(session_id=None, date_from=None, date_to=None, text_prefix=None, cursor=None):
+        """Geçmiş filtrelerini indeksli WHERE koşullarına çevir"""
+        clauses, params = [], []
+        if session_id is not None:
+            clauses.append('user_session = ?')
+            params.append(session_id)
+        if date_from is not None:
+            clauses.append('query_date >= ?')
+            params.append(str(date_from))
+        if date_to is not None:
+            # bitiş günü dahil
+            clauses.append("query_date < date(?, '+1 day')")
+            params.append(str(date_to))
+        if text_prefix:
+            # unary + idx_user_queries_text'i devre dışı bırakıyor: o indeks tüm eşleşmeleri
+            # geçici B-tree'de sıralatıyordu; tarih indeksi sırayla okuyup LIMIT'te duruyor
+            clauses.append('+query_text >= ? AND +query_text < ?')
+            params.extend((text_prefix, text_prefix + _PREFIX_UPPER))
+        if cursor is not None:
+            clauses.append('(query_date, id) < (?, ?)')
+            params.extend(cursor)
+
+        where = 'WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return where, params
+
+    def get_query_history_page(self, limit=50, cursor=None, session_id=None,
+                               date_from=None, date_to=None, text_prefix=None):
+        """
+        Sorgu geçmişinin bir sayfası (yeniden eskiye)
+
+        OFFSET yerine son satırın (query_date, id) değerinden devam edildiği
+        için her sayfa, geçmiş ne kadar büyük olursa olsun indeksten okunur.
+
+        Args:
+            limit: Sayfadaki en fazla satır
+            cursor: Önceki sayfanın next_cursor değeri, ilk sayfa için None
+            session_id: Sadece bu kullanıcının sorguları
+            date_from: Bu günden itibaren (date ya da 'YYYY-MM-DD')
+            date_to: Bu gün dahil olmak üzere bu güne kadar
+            text_prefix: Sorgu metni bu önekle başlayanlar (büyük/küçük harf duyarlı)
+
+        Returns:
+            ([(id, query_text, query_date, user_session), ...], next_cursor);
+            son sayfada next_cursor None
+        """
+        where, params = self._history_filters(session_id, date_from, date_to, text_prefix, cursor)
+
+        with self.pool.connection() as conn:
+            # bir fazlası okunuyor, sonraki sayfa var mı boş sorgu atmadan biliniyor
+            rows = conn.execute(HISTORY_PAGE_SQL.format(where=where), params + [limit + 1]).fetchall()
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1][2], rows[-1][0])
+
+    def iter_query_history(self, batch_size=1000, **filters):
+        """
+        Filtreye uyan tüm geçmişi sayfa sayfa dolaş (bellekte tek sayfa tutulur)
+
+        Args:
+            batch_size: Veritabanından tek seferde okunan satır
+            **filters: get_query_history_page filtreleri
+
+        Yields:
+            (id, query_text, query_date, user_session)
+        """
+        cursor = None
+        while True:
+            rows, cursor = self.get_query_history_page(limit=batch_size, cursor=cursor, **filters)
+            yield from rows
+            if cursor is None:
+                return
+
+    def get_query_history(self, limit=50):
+        """Sorgu geçmişini getir (DataFrame; sayfalı okuma için get_query_history_page)"""
+        rows, _ = self.get_query_history_page(limit=limit)
+        return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+    def get_daily_query_counts(self, days=90):
+        """
+        Son günlerdeki günlük sorgu sayıları, veritabanında gruplanmış halde
+
+        Returns:
+            [('YYYY-MM-DD', sayı), ...] eskiden yeniye
+        """
+        with self.pool.connection() as conn:
+            return conn.execute(DAILY_COUNTS_SQL, (f'-{int(days)} day',)).fetchall()
 
     def get_topic_statistics(self):
         """Konu istatistiklerini getir"""
-        conn = self.get_connection()
-
         query = '''
-            SELECT 
+            SELECT
                 query_text,
                 search_count,
                 last_searched
             FROM topic_statistics
+            ORDER BY search_count DESC, query_text
             LIMIT 20
         '''
 
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(query, conn)
 
         return df
 
     def get_recommendations_for_query(self, query_id):
         """Belirli bir sorgu için önerileri getir"""
-        conn = self.get_connection()
-
         query = '''
-            SELECT 
+            SELECT
                 recommended_topic,
                 similarity_score
             FROM recommendations
@@ -102,14 +267,24 @@ class DatabaseManager:
             ORDER BY similarity_score DESC
         '''
 
-        df = pd.read_sql_query(query, conn, params=(query_id,))
-        conn.close()
+        with self.pool.connection() as conn:
+            df = pd.read_sql_query(query, conn, params=(query_id,))
 
         return df
 
-    def export_history_to_csv(self, filename="query_history.csv"):
-        """Geçmişi graph olarak dışa aktar"""
-        df = self.get_query_history(limit=1000)
+    def export_history_to_csv(self, filename="query_history.csv", **filters):
+        """
+        Geçmişi CSV olarak dışa aktar
+
+        Satırlar sayfa sayfa okunup dosyaya akıtılıyor; kesilmeden tüm geçmiş
+        (ya da filtreye uyan kısmı) yazılıyor.
+
+        Returns:
+            Dosya yolu
+        """
         export_path = os.path.join(os.path.dirname(__file__), '..', 'data', filename)
-        df.to_csv(export_path, index=False, encoding='utf-8')
-        return export_path
\ No newline at end of file
+        with open(export_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(HISTORY_COLUMNS)
+            writer.writerows(self.iter_query_history(**filters))
+        return export_path
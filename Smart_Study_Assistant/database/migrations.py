@@ -0,0 +1,258 @@
+import os
+import sqlite3
+import sys
+from typing import List, Tuple
+
+
+# kullanıcı başına seri tablosunu sorgu geçmişinden tek sorguda yeniden hesaplar.
+# Ardışık günler (gün - sıra numarası) ile aynı gruba düşüyor (gaps and islands)
+STREAK_BACKFILL_SQL = '''
+    INSERT INTO user_streaks (user_session, current_streak, longest_streak, last_active_day)
+    WITH days AS (
+        SELECT DISTINCT COALESCE(user_session, '') AS user_session, date(query_date) AS day
+        FROM user_queries
+        WHERE query_date IS NOT NULL
+    ),
+    islands AS (
+        SELECT user_session, day,
+               julianday(day) - ROW_NUMBER() OVER (PARTITION BY user_session ORDER BY day) AS island
+        FROM days
+    ),
+    runs AS (
+        SELECT user_session, COUNT(*) AS length, MAX(day) AS last_day
+        FROM islands
+        GROUP BY user_session, island
+    ),
+    ranked AS (
+        SELECT user_session, length, last_day,
+               FIRST_VALUE(length) OVER (PARTITION BY user_session ORDER BY last_day DESC) AS current_length
+        FROM runs
+    )
+    SELECT user_session, MAX(current_length), MAX(length), MAX(last_day)
+    FROM ranked
+    GROUP BY user_session
+'''
+
+# (sürüm, açıklama, SQL ifadeleri). Sürüm PRAGMA user_version'da tutuluyor;
+# yeni değişiklik her zaman listenin sonuna yeni sürüm olarak eklenmeli,
+# yayınlanmış bir migration sonradan değiştirilmemeli.
+MIGRATIONS: List[Tuple[int, str, Tuple[str, ...]]] = [
+    (1, 'temel şema', (
+        '''
+        CREATE TABLE IF NOT EXISTS user_queries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            query_text TEXT NOT NULL,
+            query_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            user_session TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS recommendations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            query_id INTEGER,
+            recommended_topic TEXT NOT NULL,
+            similarity_score REAL,
+            FOREIGN KEY (query_id) REFERENCES user_queries(id)
+        )
+        ''',
+        '''
+        CREATE VIEW IF NOT EXISTS topic_statistics AS
+        SELECT
+            query_text,
+            COUNT(*) as search_count,
+            MAX(query_date) as last_searched
+        FROM user_queries
+        GROUP BY query_text
+        ORDER BY search_count DESC
+        ''',
+    )),
+    (2, 'indeksler ve trigger ile güncellenen topic_statistics tablosu', (
+        'CREATE INDEX IF NOT EXISTS idx_user_queries_date ON user_queries (query_date)',
+        'CREATE INDEX IF NOT EXISTS idx_user_queries_session ON user_queries (user_session, query_date)',
+        'CREATE INDEX IF NOT EXISTS idx_user_queries_text ON user_queries (query_text)',
+        'CREATE INDEX IF NOT EXISTS idx_recommendations_query ON recommendations (query_id)',
+
+        # her açılışta tüm tabloyu gruplayan view yerine sayaç tablosu
+        'DROP VIEW IF EXISTS topic_statistics',
+        '''
+        CREATE TABLE topic_statistics (
+            query_text TEXT PRIMARY KEY,
+            search_count INTEGER NOT NULL,
+            last_searched TIMESTAMP
+        )
+        ''',
+        '''
+        INSERT INTO topic_statistics (query_text, search_count, last_searched)
+        SELECT query_text, COUNT(*), MAX(query_date)
+        FROM user_queries
+        GROUP BY query_text
+        ''',
+        'CREATE INDEX idx_topic_statistics_count ON topic_statistics (search_count DESC, query_text)',
+
+        '''
+        CREATE TRIGGER trg_topic_statistics_insert AFTER INSERT ON user_queries
+        BEGIN
+            INSERT INTO topic_statistics (query_text, search_count, last_searched)
+            VALUES (NEW.query_text, 1, NEW.query_date)
+            ON CONFLICT (query_text) DO UPDATE SET
+                search_count = search_count + 1,
+                last_searched = MAX(COALESCE(last_searched, excluded.last_searched),
+                                    COALESCE(excluded.last_searched, last_searched));
+        END
+        ''',
+        '''
+        CREATE TRIGGER trg_topic_statistics_delete AFTER DELETE ON user_queries
+        BEGIN
+            UPDATE topic_statistics SET
+                search_count = search_count - 1,
+                last_searched = (SELECT MAX(query_date) FROM user_queries WHERE query_text = OLD.query_text)
+            WHERE query_text = OLD.query_text;
+            DELETE FROM topic_statistics WHERE query_text = OLD.query_text AND search_count <= 0;
+        END
+        ''',
+        '''
+        CREATE TRIGGER trg_topic_statistics_update AFTER UPDATE OF query_text, query_date ON user_queries
+        BEGIN
+            UPDATE topic_statistics SET
+                search_count = search_count - 1,
+                last_searched = (SELECT MAX(query_date) FROM user_queries WHERE query_text = OLD.query_text)
+            WHERE query_text = OLD.query_text;
+            DELETE FROM topic_statistics WHERE query_text = OLD.query_text AND search_count <= 0;
+
+            INSERT INTO topic_statistics (query_text, search_count, last_searched)
+            VALUES (NEW.query_text, 1, NEW.query_date)
+            ON CONFLICT (query_text) DO UPDATE SET
+                search_count = search_count + 1,
+                last_searched = (SELECT MAX(query_date) FROM user_queries WHERE query_text = NEW.query_text);
+        END
+        ''',
+    )),
+    (3, 'kullanıcı başına öğrenme serisi (streak) tablosu', (
+        '''
+        CREATE TABLE user_streaks (
+            user_session TEXT PRIMARY KEY,
+            current_streak INTEGER NOT NULL,
+            longest_streak INTEGER NOT NULL,
+            last_active_day TEXT NOT NULL
+        )
+        ''',
+        STREAK_BACKFILL_SQL,
+
+        # sorgu kaydında O(1) güncelleme: aynı gün değişmez, ertesi gün +1,
+        # daha sonraki bir gün seriyi 1'den başlatır, geçmişe dönük kayıt seriyi bozmaz
+        '''
+        CREATE TRIGGER trg_user_streaks_insert AFTER INSERT ON user_queries
+        WHEN NEW.query_date IS NOT NULL
+        BEGIN
+            INSERT INTO user_streaks (user_session, current_streak, longest_streak, last_active_day)
+            VALUES (COALESCE(NEW.user_session, ''), 1, 1, date(NEW.query_date))
+            ON CONFLICT (user_session) DO UPDATE SET
+                current_streak = CASE
+                    WHEN excluded.last_active_day = date(last_active_day, '+1 day') THEN current_streak + 1
+                    WHEN excluded.last_active_day > last_active_day THEN 1
+                    ELSE current_streak
+                END,
+                longest_streak = MAX(longest_streak, CASE
+                    WHEN excluded.last_active_day = date(last_active_day, '+1 day') THEN current_streak + 1
+                    ELSE 1
+                END),
+                last_active_day = MAX(last_active_day, excluded.last_active_day);
+        END
+        ''',
+    )),
+    (4, 'geçmiş sayfaları için kapsayan (tarih, id, metin, oturum) indeksi', (
+        # sıralama indeksten geliyor, önek filtresi tablo satırı okumadan indekste uygulanıyor
+        '''
+        CREATE INDEX IF NOT EXISTS idx_user_queries_date_text
+        ON user_queries (query_date, id, query_text, user_session)
+        ''',
+    )),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(db_path: str) -> Tuple[int, int]:
+    """
+    Veritabanını son şema sürümüne yükselt
+
+    Her migration kendi transaction'ında çalışıyor ve user_version aynı
+    transaction'da artıyor; yarıda kalan migration geri alınır, bir sonraki
+    açılışta baştan denenir. Sürümü 0 olan eski dosyalar (şema var, sürüm yok)
+    1. migration IF NOT EXISTS olduğu için olduğu gibi yükseltilir.
+
+    Returns:
+        (eski_sürüm, yeni_sürüm)
+    """
+    # otomatik transaction kapalı, BEGIN/COMMIT elle
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0)
+    try:
+        start_version = get_version(conn)
+        if start_version > LATEST_VERSION:
+            raise RuntimeError(
+                f"Veritabanı sürümü ({start_version}) bu uygulamadan yeni ({LATEST_VERSION})"
+            )
+
+        for version, _, statements in MIGRATIONS:
+            if version <= start_version:
+                continue
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # başka bir süreç aynı anda yükseltmiş olabilir
+                if get_version(conn) >= version:
+                    conn.execute('ROLLBACK')
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {version}')
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+        return start_version, get_version(conn)
+    finally:
+        conn.close()
+
+
+def backfill_streaks(db_path: str) -> int:
+    """
+    user_streaks tablosunu tüm sorgu geçmişinden yeniden hesapla
+
+    Trigger'lar sadece eklemeyi izliyor; geçmiş silindiğinde ya da elle
+    düzeltildiğinde bu komutla tablo baştan kurulabilir.
+
+    Returns:
+        Serisi hesaplanan kullanıcı sayısı
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM user_streaks')
+            conn.execute(STREAK_BACKFILL_SQL)
+            count = conn.execute('SELECT COUNT(*) FROM user_streaks').fetchone()[0]
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return count
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # python -m database.migrations [veritabanı_yolu] [--backfill-streaks]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    path = args[0] if args else os.path.join(os.path.dirname(__file__), '..', 'data', 'study_assistant.db')
+
+    before, after = migrate(path)
+    print(f"✅ Şema sürümü: {before} -> {after}")
+
+    if '--backfill-streaks' in sys.argv:
+        print(f"✅ {backfill_streaks(path)} kullanıcının serisi yeniden hesaplandı")
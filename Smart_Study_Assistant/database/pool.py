@@ -0,0 +1,112 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+# her bağlantıda uygulanan ayarlar. WAL'da okuyucular yazarı beklemiyor,
+# synchronous=NORMAL WAL ile güvenli (son commit'ler sadece elektrik kesintisinde kaybolabilir)
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -8000',        # ~8 MB sayfa önbelleği
+    'PRAGMA mmap_size = 67108864',      # 64 MB memory-mapped okuma
+    'PRAGMA temp_store = MEMORY',
+)
+
+
+class ConnectionPool:
+    """Thread'ler arasında paylaşılan, WAL modunda SQLite bağlantı havuzu
+
+    Streamlit her oturum / yeniden çalıştırma için farklı thread kullanabildiği
+    için thread'e bağlı bağlantı yerine ödünç alınıp geri verilen bağlantılar
+    tutuluyor. Havuz doluysa bağlantı boşalana kadar bekleniyor.
+    """
+
+    def __init__(self, db_path: str, size: int = 8, busy_timeout: float = 5.0, cached_statements: int = 128):
+        """
+        Args:
+            db_path: Veritabanı dosyası
+            size: En fazla açık bağlantı
+            busy_timeout: Kilitli veritabanında bekleme süresi (saniye)
+            cached_statements: Bağlantı başına derlenmiş sorgu önbelleği
+        """
+        self.db_path = db_path
+        self.size = size
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # journal modu dosyada kalıcı, bir kez ayarlamak yeterli
+        conn = self.connect()
+        try:
+            conn.execute('PRAGMA journal_mode = WAL')
+        finally:
+            conn.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """Havuz dışı, ayarları uygulanmış yeni bağlantı"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}')
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Bağlantı havuzu kapatıldı")
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self.connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.busy_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Havuzda boş bağlantı yok") from None
+
+    @contextmanager
+    def connection(self):
+        """Havuzdan bağlantı ödünç al; blok bitince geri ver, hata olursa geri al"""
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapat, ödünçtekiler geri gelince kapanır"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,205 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+_STOP = object()
+
+# "database is locked" gibi geçici hatalarda batch bu kadar deneniyor (bekleme her seferinde ikiye katlanır)
+WRITE_ATTEMPTS = 3
+RETRY_BACKOFF = 0.05
+
+
+class QueryLogWriter:
+    """Sorgu ve öneri kayıtlarını arka planda toplu yazan write-behind kuyruğu
+
+    İstek yolunda log() sadece sınırlı kuyruğa ekler ve hemen döner. Arka plan
+    thread'i kayıtları batch_size'a ya da flush_interval süresine kadar biriktirip
+    DatabaseManager.save_queries_with_recommendations ile tek transaction'da yazar.
+
+    Kuyruk doluysa (yazıcı yetişemiyorsa) kayıt en fazla block_timeout kadar
+    bekler, sonra düşürülür ve sayılır; öneri yanıtı hiçbir zaman yazıcıyı
+    beklemez. Geçici veritabanı hatasında batch kısa aralıklarla tekrar
+    deneniyor. close() kuyrukta kalanları yazıp thread'i durdurur.
+    """
+
+    def __init__(self, db_manager, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 0.5, block_timeout: float = 0.0):
+        """
+        Args:
+            db_manager: Yazımın yapılacağı DatabaseManager
+            max_queue: Kuyruktaki en fazla kayıt (back-pressure sınırı)
+            batch_size: Tek transaction'da yazılacak en fazla kayıt
+            flush_interval: İlk kayıttan sonra batch'in dolmasını bekleme süresi (saniye)
+            block_timeout: Kuyruk doluysa log()'un bekleyeceği süre, 0 ise hiç beklemez
+        """
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # log() kapanma kontrolüyle kuyruğa ekleme arasında close() araya girmesin
+        self._puts_done = threading.Condition(self._lock)
+        self._puts_in_flight = 0
+        self._closed = False
+        self._stats = {'queued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'failed': 0}
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name='query-log-writer', daemon=True)
+        self._thread.start()
+
+    def log(self, query_text: str, session_id: str, recommendations: List[Tuple[str, float]]) -> bool:
+        """
+        Sorguyu ve önerilerini yazılmak üzere kuyruğa ekle
+
+        Returns:
+            Kuyruğa alındıysa True, kuyruk doluysa False
+
+        Raises:
+            RuntimeError: Yazıcı kapatıldıysa (kayıt sessizce kaybolmasın)
+        """
+        entry = (query_text, session_id, [(topic, float(score)) for topic, score in recommendations])
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("QueryLogWriter kapatıldı, kayıt alınamıyor")
+            self._puts_in_flight += 1
+
+        # kilit bekleme sırasında tutulmuyor; yazıcı thread'i sayaçları güncelleyebilsin
+        try:
+            if self.block_timeout > 0:
+                self._queue.put(entry, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            accepted = False
+        else:
+            accepted = True
+        finally:
+            with self._lock:
+                self._puts_in_flight -= 1
+                if self._puts_in_flight == 0:
+                    self._puts_done.notify_all()
+
+        self._count('queued' if accepted else 'dropped')
+        return accepted
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _next_batch(self):
+        """İlk kaydı bekle, sonra batch dolana ya da süre bitene kadar topla"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _save(self, batch):
+        """Batch'i yaz; kilitli veritabanı gibi geçici hatalarda bekleyip tekrar dene
+
+        Yazım tek transaction, başarısız deneme geri alındığı için tekrar
+        denemek kayıtları çoğaltmıyor.
+        """
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                self.db_manager.save_queries_with_recommendations(batch)
+                return
+            except sqlite3.OperationalError:
+                if attempt == WRITE_ATTEMPTS - 1:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    def _write(self, batch):
+        try:
+            self._save(batch)
+        except Exception as e:
+            # hatalı kayıt ya da veritabanı hatası thread'i öldürmesin; hata sayılıyor
+            self.last_error = e
+            self._count('failed', len(batch))
+        else:
+            self._count('written', len(batch))
+            self._count('batches')
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._write(batch)
+
+        # durdurulurken kuyrukta kalanlar da yazılıyor
+        remaining = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                remaining.append(entry)
+        for start in range(0, len(remaining), self.batch_size):
+            self._write(remaining[start:start + self.batch_size])
+        self._queue.task_done()
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekle"""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0):
+        """Yeni kayıt almayı bırak, kalanları yaz ve thread'i durdur (en fazla timeout saniye)"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # kontrolü geçmiş log() çağrıları kuyruğa eklemeyi bitirsin (en fazla block_timeout)
+            self._puts_done.wait_for(lambda: self._puts_in_flight == 0, timeout=timeout)
+
+        if self._thread.is_alive():
+            try:
+                # yazıcı takıldıysa kuyruk boşalmaz; süreç çıkışı sonsuza kadar beklemesin
+                self._queue.put(_STOP, timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Full:
+                pass
+            self._thread.join(max(deadline - time.monotonic(), 0.0))
+
+        if self._thread.is_alive():
+            return
+
+        # kapanırken araya giren (ya da thread durduktan sonra kalan) kayıtlar da kaybolmasın
+        late = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                self._queue.task_done()
+            else:
+                late.append(entry)
+        for start in range(0, len(late), self.batch_size):
+            self._write(late[start:start + self.batch_size])
+
+    def stats(self) -> Dict:
+        """Kuyruk / yazım / düşürme sayaçları"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['pending'] = self._queue.qsize()
+        return stats
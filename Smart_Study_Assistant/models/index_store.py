@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+# artifact formatı değişirse artır, eski indeksler otomatik geçersiz olur
+INDEX_FORMAT_VERSION = 3
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'index')
+
+
+def compute_content_hash(paths: Iterable[str], params: Dict) -> str:
+    """Konu dosyalarının içeriği ve vektörleştirici ayarlarından hash üret"""
+    digest = hashlib.sha256()
+    digest.update(f"format={INDEX_FORMAT_VERSION}".encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _artifact_dir(index_dir: str, content_hash: str) -> str:
+    # her hash kendi klasöründe, yarım yazılmış indeks okunmaz
+    return os.path.join(index_dir, content_hash[:16])
+
+
+def _prune_artifacts(index_dir: str, keep: str):
+    """Güncel artifact dışındaki eski hash klasörlerini sil
+
+    Yarım yazılan (.tmp-*) klasörlere dokunulmuyor, başka bir süreç yazıyor
+    olabilir. Eski indeksi memory-map ile açmış süreçler etkilenmiyor.
+    """
+    try:
+        names = os.listdir(index_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(index_dir, name)
+        if name != keep and len(name) == 16 and os.path.isdir(path) and \
+                all(char in '0123456789abcdef' for char in name):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def save_index(index_dir: str, content_hash: str, vocabulary: Dict[str, int],
+               idf: np.ndarray, tfidf_matrix: sparse.csr_matrix, topic_names: Iterable[str],
+               arrays: Optional[Dict[str, np.ndarray]] = None) -> str:
+    """
+    Eğitilmiş TF-IDF indeksini diske yaz
+
+    Args:
+        index_dir: İndeks kök klasörü
+        content_hash: compute_content_hash() çıktısı
+        vocabulary: terim -> sütun sözlüğü
+        idf: IDF ağırlıkları
+        tfidf_matrix: Konu x terim CSR matrisi
+        topic_names: Satır sırasına göre konu isimleri
+        arrays: İndeksle birlikte saklanacak ek diziler (ör. komşu grafiği)
+
+    Returns:
+        Yazılan artifact klasörü; diğer hash klasörleri silinir
+    """
+    target = _artifact_dir(index_dir, content_hash)
+    tmp = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+
+    matrix = sparse.csr_matrix(tfidf_matrix)
+    np.save(os.path.join(tmp, 'data.npy'), matrix.data)
+    np.save(os.path.join(tmp, 'indices.npy'), matrix.indices)
+    np.save(os.path.join(tmp, 'indptr.npy'), matrix.indptr)
+    np.save(os.path.join(tmp, 'idf.npy'), np.asarray(idf))
+
+    arrays = arrays or {}
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp, f'{name}.npy'), np.asarray(array))
+
+    # sözlük yerine sütun sırasına göre terim listesi daha kompakt
+    terms = [None] * len(vocabulary)
+    for term, column in vocabulary.items():
+        terms[column] = term
+
+    with open(os.path.join(tmp, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+        json.dump(terms, f, ensure_ascii=False)
+
+    topic_names = list(topic_names)
+    manifest = {
+        'format_version': INDEX_FORMAT_VERSION,
+        'content_hash': content_hash,
+        'shape': list(matrix.shape),
+        'nnz': int(matrix.nnz),
+        'topic_count': len(topic_names),
+        'arrays': sorted(arrays),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(os.path.join(tmp, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    # klasörü tek hamlede yerine koy
+    if os.path.exists(target):
+        shutil.rmtree(tmp, ignore_errors=True)
+    else:
+        try:
+            os.replace(tmp, target)
+        except OSError:
+            # başka bir süreç aynı anda yazdı
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    # her katalog değişikliğinde yeni klasör yazılıyor, eskiler birikmesin
+    _prune_artifacts(index_dir, os.path.basename(target))
+    return target
+
+
+def load_index(index_dir: str, content_hash: str) -> Optional[Dict]:
+    """
+    Hash eşleşiyorsa indeksi memory-map ile yükle
+
+    Returns:
+        {'vocabulary', 'idf', 'tfidf_matrix', 'arrays', 'manifest'} ya da None
+    """
+    target = _artifact_dir(index_dir, content_hash)
+    manifest_path = os.path.join(target, 'manifest.json')
+
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION or manifest.get('content_hash') != content_hash:
+            return None
+
+        data = np.load(os.path.join(target, 'data.npy'), mmap_mode='r')
+        indices = np.load(os.path.join(target, 'indices.npy'), mmap_mode='r')
+        indptr = np.load(os.path.join(target, 'indptr.npy'), mmap_mode='r')
+        idf = np.load(os.path.join(target, 'idf.npy'))
+        arrays = {
+            name: np.load(os.path.join(target, f'{name}.npy'), mmap_mode='r')
+            for name in manifest.get('arrays', [])
+        }
+
+        with open(os.path.join(target, 'vocabulary.json'), 'r', encoding='utf-8') as f:
+            terms = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    tfidf_matrix = sparse.csr_matrix((data, indices, indptr), shape=tuple(manifest['shape']), copy=False)
+
+    return {
+        'vocabulary': {term: column for column, term in enumerate(terms)},
+        'idf': idf,
+        'tfidf_matrix': tfidf_matrix,
+        'arrays': arrays,
+        'manifest': manifest,
+    }
+
+
+if __name__ == "__main__":
+    # build adımı: python -m models.index_store
+    from models.ml_model import MLModel
+
+    model = MLModel(rebuild_index=True)
+    print(f"✅ İndeks yazıldı: {model.index_path}")
@@ -1,23 +1,156 @@
+import os
+from types import MappingProxyType
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Tuple
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from typing import Dict, Iterable, List, Tuple
 from models.text_processor import TextProcessor
+from models.ranking import top_k_rows
+from models.similarity_graph import DEFAULT_GRAPH_K, SimilarityGraph
+from models.search_index import INDEX_MODES, ExactIndex, LSHIndex
+from models.index_store import DEFAULT_INDEX_DIR, compute_content_hash, load_index, save_index
+from models.vectorizers import (
+    DEFAULT_HASH_FEATURES, VECTORIZER_MODES, HashingTfidfVectorizer, idf_from_counts, weight_counts
+)
+from utils.cache import LRUCache
+
+
+# önerilerde minimum benzerlik eşiği
+MIN_SIMILARITY = 0.01
+
+# çok büyük kataloglarda 'lsh' (yaklaşık) arama seçilebilir
+DEFAULT_INDEX_MODE = os.environ.get('SMART_STUDY_INDEX_MODE', 'exact')
+
+# katalog büyüyünce 100 terimlik sözlük yetmiyor; 'hashing' tüm terimleri sabit bellekle tutar
+DEFAULT_VECTORIZER_MODE = os.environ.get('SMART_STUDY_VECTORIZER_MODE', 'vocabulary')
+DEFAULT_MAX_FEATURES = 100
+
+# son tam eğitimden beri değişen konu oranı bunu geçince artımlı güncelleme
+# yerine baştan eğitiliyor (sabit sözlük ve eski skorlardan gelen sapma sınırlı kalsın)
+DEFAULT_REFIT_RATIO = 0.1
+
+
+def _tfidf_from_counts(counts: sparse.csr_matrix) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """Terim sayılarından IDF ve l2 normalize TF-IDF matrisi"""
+    idf = idf_from_counts(counts)
+    return idf, weight_counts(counts, idf)
 
 
 class MLModel:
     """Makine öğrenmesi modeli sınıfı"""
 
-    def __init__(self):
-        self.text_processor = TextProcessor()
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            ngram_range=(1, 2),  # Unigram ve bigram
-            lowercase=True
-        )
+    def __init__(self, text_processor: TextProcessor = None, index_dir: str = DEFAULT_INDEX_DIR,
+                 rebuild_index: bool = False, graph_k: int = DEFAULT_GRAPH_K,
+                 index_mode: str = DEFAULT_INDEX_MODE, cache_size: int = 1024,
+                 cache_ttl: float = 3600.0, refit_ratio: float = DEFAULT_REFIT_RATIO,
+                 vectorizer_mode: str = DEFAULT_VECTORIZER_MODE, max_features: int = DEFAULT_MAX_FEATURES,
+                 n_features: int = DEFAULT_HASH_FEATURES):
+        """
+        Args:
+            vectorizer_mode: 'vocabulary' (en sık max_features terim) ya da 'hashing'
+                (sözlüksüz, n_features sütun, bellek katalogdan bağımsız)
+            max_features: Sözlük modunda terim sınırı, None ise sınırsız
+            n_features: Hashing modunda sütun sayısı
+        """
+        # paylaşılan işlemci verilirse tekrar json okumaya gerek yok
+        self._configure(text_processor or TextProcessor(), index_dir, rebuild_index, graph_k,
+                        index_mode, cache_size, cache_ttl, refit_ratio, vectorizer_mode,
+                        max_features, n_features)
 
         # Modeli eğit
         self._train_model()
+        self._prepare_scoring()
+
+        # eğitimden sonra model salt okunur, tüm oturumlar aynı nesneyi kullanıyor
+        self._freeze()
+
+    def _configure(self, text_processor: TextProcessor, index_dir: str, rebuild_index: bool,
+                   graph_k: int, index_mode: str, cache_size: int, cache_ttl: float,
+                   refit_ratio: float, vectorizer_mode: str, max_features: int, n_features: int):
+        if index_mode not in INDEX_MODES:
+            raise ValueError(f"Bilinmeyen index_mode: {index_mode} ({', '.join(INDEX_MODES)})")
+        if vectorizer_mode not in VECTORIZER_MODES:
+            raise ValueError(f"Bilinmeyen vectorizer_mode: {vectorizer_mode} ({', '.join(VECTORIZER_MODES)})")
+
+        self.text_processor = text_processor
+        self.index_dir = index_dir
+        self.rebuild_index = rebuild_index
+        self.graph_k = graph_k
+        self.index_mode = index_mode
+        self.refit_ratio = refit_ratio
+        self.vectorizer_mode = vectorizer_mode
+
+        # (genişletilmiş sorgu, top_n) -> öneriler. Model yeniden eğitilince ya da
+        # konular güncellenince yeni MLModel nesnesi kuruluyor, önbellek de onunla sıfırdan başlıyor
+        self.result_cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        if vectorizer_mode == 'hashing':
+            self.vectorizer = HashingTfidfVectorizer(
+                n_features=n_features,
+                ngram_range=(1, 2),
+                lowercase=True
+            )
+        else:
+            self.vectorizer = TfidfVectorizer(
+                max_features=max_features,
+                ngram_range=(1, 2),  # Unigram ve bigram
+                lowercase=True
+            )
+
+    def _settings(self) -> Dict:
+        """Aynı ayarlarla yeni model kurmak için yapıcı argümanları"""
+        return {
+            'index_dir': self.index_dir,
+            'graph_k': self.graph_k,
+            'index_mode': self.index_mode,
+            'cache_size': self.result_cache.maxsize,
+            'cache_ttl': self.result_cache.ttl,
+            'refit_ratio': self.refit_ratio,
+            'vectorizer_mode': self.vectorizer_mode,
+            'max_features': self.vectorizer.max_features,
+            'n_features': getattr(self.vectorizer, 'n_features', DEFAULT_HASH_FEATURES)
+        }
+
+    def _count_vectorizer(self):
+        """TF-IDF ile aynı analizörü kullanan terim sayacı"""
+        if self.vectorizer_mode == 'hashing':
+            return self.vectorizer.counter()
+        return CountVectorizer(
+            max_features=self.vectorizer.max_features,
+            ngram_range=self.vectorizer.ngram_range,
+            lowercase=self.vectorizer.lowercase
+        )
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"MLModel salt okunur, '{name}' değiştirilemez")
+        super().__setattr__(name, value)
+
+    def _freeze(self):
+        """Matrisi ve konu listesini değiştirilemez yap"""
+        self.topic_names = tuple(self.topic_names)
+        self.topic_texts = tuple(self.topic_texts)
+        for matrix in (self.tfidf_matrix, self.term_counts, self.exact_index.matrix_t):
+            for array in (matrix.data, matrix.indices, matrix.indptr):
+                array.flags.writeable = False
+        for array in (self.similarity_graph.neighbors, self.similarity_graph.scores):
+            array.flags.writeable = False
+        self._frozen = True
+
+    def _prepare_scoring(self):
+        """Skorlama için arama indekslerini bir kez hazırla"""
+        self.exact_index = ExactIndex(self.tfidf_matrix)
+        self.search_index = self.lsh_index if self.index_mode == 'lsh' else self.exact_index
+
+    def _search(self, vectors, top_n: int) -> List[List[Tuple[str, float]]]:
+        """Vektörleri seçili indekste ara, eşiği geçen (konu, skor) listelerini döndür"""
+        return [
+            [
+                (self.topic_names[idx], float(score))
+                for idx, score in zip(indices, scores)
+                if score > MIN_SIMILARITY  # Minimum benzerlik eşiği
+            ]
+            for indices, scores in self.search_index.search(vectors, top_n)
+        ]
 
     def _train_model(self):
         """Modeli örnek verilerle eğit"""
@@ -28,8 +161,169 @@ class MLModel:
         self.topic_texts = [f"{topic} {keyword}" for topic, keyword in zip(topics, keywords)]
         self.topic_names = topics
 
-        # TF-IDF matrisi oluştur
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.topic_texts)
+        # isim -> satır indeksi, get_similar_topics için O(1) arama
+        self.topic_index = MappingProxyType({name: idx for idx, name in enumerate(topics)})
+
+        # konu verisi değişmediyse diskteki indeksi kullan
+        params = {
+            'max_features': self.vectorizer.max_features,
+            'ngram_range': self.vectorizer.ngram_range,
+            'lowercase': self.vectorizer.lowercase,
+            'graph_k': self.graph_k,
+            'index_mode': self.index_mode,
+            'vectorizer_mode': self.vectorizer_mode,
+            'n_features': getattr(self.vectorizer, 'n_features', None)
+        }
+        content_hash = compute_content_hash(self.text_processor.source_paths, params)
+
+        # bellekte değiştirilmiş konular dosyalarla eşleşmiyor, disk indeksi kullanılamaz
+        use_disk = bool(self.index_dir) and not self.text_processor.modified
+        self.changes_since_fit = 0
+
+        index = None
+        if use_disk and not self.rebuild_index:
+            index = load_index(self.index_dir, content_hash)
+
+        if index is not None and index['manifest']['topic_count'] == len(self.topic_names):
+            self.vectorizer.vocabulary_ = index['vocabulary']
+            self.vectorizer.idf_ = index['idf']
+            self.tfidf_matrix = index['tfidf_matrix']
+            # sayılar TF-IDF ile aynı seyreklik desenini paylaşıyor
+            self.term_counts = sparse.csr_matrix(
+                (index['arrays']['term_counts'], self.tfidf_matrix.indices, self.tfidf_matrix.indptr),
+                shape=self.tfidf_matrix.shape, copy=False
+            )
+            self.similarity_graph = SimilarityGraph.from_arrays(index['arrays'])
+            self.lsh_index = LSHIndex.from_arrays(self.tfidf_matrix, index['arrays']) \
+                if self.index_mode == 'lsh' else None
+            self.index_path = os.path.join(self.index_dir, content_hash[:16])
+            return
+
+        # TF-IDF matrisi oluştur. Terim sayıları artımlı güncelleme için saklanıyor,
+        # IDF ve ağırlıklar TfidfVectorizer ile aynı formülle onlardan hesaplanıyor
+        count_vectorizer = self._count_vectorizer()
+        self.term_counts = count_vectorizer.fit_transform(self.topic_texts)
+        if self.vectorizer_mode == 'vocabulary':
+            self.vectorizer.vocabulary_ = count_vectorizer.vocabulary_
+        self.vectorizer.idf_, self.tfidf_matrix = _tfidf_from_counts(self.term_counts)
+
+        # benzer konular grafiği eğitim sırasında bir kez hesaplanıyor
+        self.similarity_graph = SimilarityGraph.build(self.tfidf_matrix, k=self.graph_k)
+        arrays = self.similarity_graph.to_arrays()
+        arrays['term_counts'] = self.term_counts.data
+
+        self.lsh_index = None
+        if self.index_mode == 'lsh':
+            self.lsh_index = LSHIndex.build(self.tfidf_matrix)
+            arrays.update(self.lsh_index.to_arrays())
+
+        self.index_path = None
+        if use_disk:
+            try:
+                self.index_path = save_index(
+                    self.index_dir, content_hash, self.vectorizer.vocabulary_,
+                    self.vectorizer.idf_, self.tfidf_matrix, self.topic_names,
+                    arrays=arrays
+                )
+            except OSError:
+                # salt okunur disk olabilir, bellekteki model yeterli
+                pass
+
+    def updated(self, text_processor: TextProcessor) -> 'MLModel':
+        """
+        Konu listesi değişmiş işlemciyle yeni model döndür
+
+        Artımlı güncelleme yalnızca hashing modunda: sadece eklenen ve metni
+        değişen konular vektörleştiriliyor; belge frekansları, IDF, matris
+        satırları ve komşu grafiği güncelleniyor. Son tam eğitimden beri değişen
+        konu oranı refit_ratio'yu geçince baştan eğitiliyor. Sözlük modunda her
+        zaman baştan eğitiliyor; sabit sözlükle yeni konunun terimleri sözlükte
+        olmuyor, konu aranamaz hale geliyor. Bu model hiç değişmiyor; yenisini
+        ModelRegistry tek hamlede yerine koyuyor, süren istekler eski modelle bitiyor.
+
+        Args:
+            text_processor: Güncel konuları içeren işlemci
+
+        Returns:
+            Yeni MLModel
+        """
+        names = text_processor.get_all_topics()
+        texts = [f"{topic} {keyword}" for topic, keyword in zip(names, text_processor.get_all_keywords())]
+
+        # yeni her satırın eski satırı; yeni ya da metni değişen konular -1
+        previous = np.full(len(names), -1, dtype=np.int64)
+        for row, name in enumerate(names):
+            old = self.topic_index.get(name)
+            if old is not None and self.topic_texts[old] == texts[row]:
+                previous[row] = old
+
+        removed = len(set(self.topic_names) - set(names))
+        changes = self.changes_since_fit + int((previous < 0).sum()) + removed
+
+        if self.vectorizer_mode != 'hashing' or changes > self.refit_ratio * max(len(names), 1):
+            return MLModel(text_processor=text_processor, **self._settings())
+
+        settings = self._settings()
+        model = MLModel.__new__(MLModel)
+        model._configure(text_processor, settings.pop('index_dir'), False, **settings)
+        model._apply_update(self, names, texts, previous, changes)
+        model._prepare_scoring()
+        model._freeze()
+        return model
+
+    def _apply_update(self, base: 'MLModel', names: Tuple[str, ...], texts: List[str],
+                      previous: np.ndarray, changes: int):
+        """Eski modelin terim sayılarını kullanarak artımlı eğitim"""
+        self.topic_texts = texts
+        self.topic_names = names
+        self.topic_index = MappingProxyType({name: idx for idx, name in enumerate(names)})
+        self.changes_since_fit = changes
+
+        dirty = np.nonzero(previous < 0)[0]
+        clean = np.nonzero(previous >= 0)[0]
+
+        parts = [base.term_counts[previous[clean]]]
+        if len(dirty):
+            parts.append(self._count_vectorizer().transform([texts[row] for row in dirty]))
+        stacked = sparse.vstack(parts, format='csr')
+
+        # yığın [değişmeyenler, değişenler] sırasında, konu sırasına geri çevir
+        order = np.concatenate([clean, dirty])
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        self.term_counts = sparse.csr_matrix(stacked[inverse], dtype=base.term_counts.dtype)
+        self.term_counts.sort_indices()
+
+        self.vectorizer.idf_, self.tfidf_matrix = _tfidf_from_counts(self.term_counts)
+        self.similarity_graph = base.similarity_graph.update_rows(self.tfidf_matrix, previous)
+        self.lsh_index = LSHIndex.build(self.tfidf_matrix) if self.index_mode == 'lsh' else None
+
+        # artımlı model tam eğitimle birebir aynı değil, diske yazılmıyor
+        self.index_path = None
+
+    def add_topics(self, topics: Iterable[Dict]) -> 'MLModel':
+        """Yeni konuları eklenmiş model döndür (aynı isimde konu varsa ValueError)"""
+        topics = list(topics)
+        existing = [topic['name'] for topic in topics if self.text_processor.get_topic_by_name(topic['name'])]
+        if existing:
+            raise ValueError(f"Konu zaten var: {', '.join(existing)}")
+        return self.updated(self.text_processor.with_topics(upserts=topics))
+
+    def update_topics(self, topics: Iterable[Dict]) -> 'MLModel':
+        """Mevcut konuları değiştirilmiş model döndür (olmayan konu için ValueError)"""
+        topics = list(topics)
+        missing = [topic['name'] for topic in topics if not self.text_processor.get_topic_by_name(topic['name'])]
+        if missing:
+            raise ValueError(f"Konu bulunamadı: {', '.join(missing)}")
+        return self.updated(self.text_processor.with_topics(upserts=topics))
+
+    def remove_topics(self, names: Iterable[str]) -> 'MLModel':
+        """Konuları çıkarılmış model döndür (olmayan konu için ValueError)"""
+        names = list(names)
+        missing = [name for name in names if not self.text_processor.get_topic_by_name(name)]
+        if missing:
+            raise ValueError(f"Konu bulunamadı: {', '.join(missing)}")
+        return self.updated(self.text_processor.with_topics(removed=names))
 
     def get_recommendations(self, query: str, top_n: int = 5) -> List[Tuple[str, float]]:
         """
@@ -46,25 +340,48 @@ class MLModel:
         cleaned_query = self.text_processor.clean_text(query)
         expanded_query = self.text_processor.expand_query(cleaned_query)
 
+        # aynı sorgu daha önce hesaplandıysa önbellekten ver
+        cache_key = (expanded_query, top_n)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         # Sorguyu vektörize et
         query_vector = self.vectorizer.transform([expanded_query])
 
-        # Kosinüs benzerliği hesapla
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix)[0]
+        # Kosinüs benzerliği hesapla, en yüksek skorları bul
+        recommendations = self._search(query_vector, top_n)[0]
+        self.result_cache.set(cache_key, tuple(recommendations))
+        return recommendations
+
+    def cache_stats(self) -> dict:
+        """Öneri önbelleğinin isabet / ıskalama / çıkarma sayaçları"""
+        return self.result_cache.stats()
 
-        # En yüksek skorları bul
-        top_indices = np.argsort(similarities)[-top_n:][::-1]
+    def get_recommendations_batch(self, queries: List[str], top_n: int = 5,
+                                  batch_size: int = 1024) -> List[List[Tuple[str, float]]]:
+        """
+        Birden fazla sorgu için önerileri tek seferde hesapla
 
-        # Sonuçları hazırla
-        recommendations = []
-        for idx in top_indices:
-            if similarities[idx] > 0.01:  # Minimum benzerlik eşiği
-                recommendations.append((
-                    self.topic_names[idx],
-                    float(similarities[idx])
-                ))
+        Args:
+            queries: Sorgu listesi
+            top_n: Her sorgu için döndürülecek öneri sayısı
+            batch_size: Tek matris çarpımında işlenecek sorgu sayısı (bellek sınırı)
 
-        return recommendations
+        Returns:
+            Her sorgu için get_recommendations() ile aynı formatta liste
+        """
+        expanded_queries = [
+            self.text_processor.expand_query(self.text_processor.clean_text(query))
+            for query in queries
+        ]
+
+        results = []
+        for start in range(0, len(expanded_queries), batch_size):
+            query_matrix = self.vectorizer.transform(expanded_queries[start:start + batch_size])
+            results.extend(self._search(query_matrix, top_n))
+
+        return results
 
     def get_similar_topics(self, topic_name: str, top_n: int = 3) -> List[Tuple[str, float]]:
         """
@@ -77,30 +394,36 @@ class MLModel:
         Returns:
             [(benzer_konu, benzerlik_skoru), ...] listesi
         """
-        try:
-            # Konunun indeksini bul
-            topic_idx = self.topic_names.index(topic_name)
+        # Konunun indeksini bul
+        topic_idx = self.topic_index.get(topic_name)
+        if topic_idx is None:
+            return []
 
-            # Bu konuyla diğer konular arasındaki benzerliği hesapla
-            topic_vector = self.tfidf_matrix[topic_idx]
-            similarities = cosine_similarity(topic_vector, self.tfidf_matrix)[0]
+        # önceden hesaplanmış graftan oku
+        if top_n <= self.similarity_graph.k:
+            return [
+                (self.topic_names[idx], score)
+                for idx, score in self.similarity_graph.neighbors_of(topic_idx, top_n)
+            ]
 
-            # Kendisini hariç tut ve en benzer konuları bul
-            similarities[topic_idx] = -1  # Kendisini -1 yap
-            top_indices = np.argsort(similarities)[-top_n:][::-1]
+        # graftaki k'dan fazla komşu istenirse canlı hesapla
+        topic_vector = self.tfidf_matrix[topic_idx]
+        similarities = self.exact_index.score(topic_vector)
 
-            similar_topics = []
-            for idx in top_indices:
-                if similarities[idx] > 0:
-                    similar_topics.append((
-                        self.topic_names[idx],
-                        float(similarities[idx])
-                    ))
+        # Kendisini hariç tut ve en benzer konuları bul
+        similarities[0, topic_idx] = -1  # Kendisini -1 yap
+        top_indices = top_k_rows(similarities, top_n)[0]
+        similarities = similarities[0]
 
-            return similar_topics
+        similar_topics = []
+        for idx in top_indices:
+            if similarities[idx] > 0:
+                similar_topics.append((
+                    self.topic_names[idx],
+                    float(similarities[idx])
+                ))
 
-        except ValueError:
-            return []
+        return similar_topics
 
     def analyze_query_intent(self, query: str) -> dict:
         """
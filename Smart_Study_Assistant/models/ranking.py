@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Her satırdaki en yüksek k skorun indekslerini sıralı döndür (argpartition ile O(n))"""
+    n_cols = scores.shape[1]
+    k = min(k, n_cols)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+
+    if k < n_cols:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(n_cols), (scores.shape[0], 1))
+
+    # sadece k aday sıralanıyor; eşit skorda küçük indeks önce
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.lexsort((candidates, -candidate_scores), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,265 @@
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, Optional
+
+# bu kadar süre istek gelmeyen oturum aktif sayılmıyor (saniye)
+SESSION_TTL = 30 * 60
+
+# bileşen belleği RSS farkıyla ölçülüyor (mmap ve numpy dahil); tek /proc okuması,
+# SMART_STUDY_MEASURE_MEMORY=0 ile kapatılabilir
+MEASURE_MEMORY = os.environ.get('SMART_STUDY_MEASURE_MEMORY', '1') != '0'
+
+
+def _rss_bytes() -> Optional[int]:
+    """Sürecin anlık RSS'i, okunamıyorsa (Linux dışı) None"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """Süreç genelinde paylaşılan model ve servis nesnelerini yöneten sınıf
+
+    Streamlit her tarayıcı oturumu için scripti baştan çalıştırıyor. Model,
+    metin işlemci, veritabanı ve API nesneleri burada bir kez kurulur ve
+    tüm oturumlar aynı (salt okunur) nesneleri kullanır.
+
+    Konular değişince yeni model arka planda kurulur ve bileşen sözlüğü tek
+    referans atamasıyla değiştirilir; okuyanlar kilit beklemez.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, measure_memory: bool = MEASURE_MEMORY, session_ttl: float = SESSION_TTL):
+        """
+        Args:
+            measure_memory: Bileşen kurulumlarının RSS farkını ölç
+            session_ttl: Son isteğinden bu kadar saniye geçen oturum aktif sayılmaz
+        """
+        self._lock = threading.RLock()
+        self._components = {}
+        self._build_stats = {}
+        self.measure_memory = measure_memory
+        self.session_ttl = session_ttl
+        # oturum -> son görülme, en eskisi başta
+        self._sessions = OrderedDict()
+        # son aramaların (ilk kart, tüm paneller) süreleri
+        self._render_timings = deque(maxlen=500)
+        # aynı anda tek güncelleme; okuma yolunu kilitlemiyor
+        self._update_lock = threading.Lock()
+        self._watcher = None
+
+    @classmethod
+    def instance(cls) -> 'ModelRegistry':
+        """Süreçteki tek registry nesnesini döndür"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _get_or_build(self, name: str, factory: Callable):
+        """Bileşen yoksa bir kez kur, kurulum süresini (istenirse belleğini) ölç"""
+        component = self._components.get(name)
+        if component is not None:
+            return component
+
+        with self._lock:
+            # başka bir thread kurmuş olabilir
+            if name in self._components:
+                return self._components[name]
+
+            memory_before = _rss_bytes() if self.measure_memory else None
+            start = time.perf_counter()
+
+            component = factory()
+
+            build_seconds = time.perf_counter() - start
+            memory_bytes = None
+            if memory_before is not None:
+                memory_after = _rss_bytes()
+                memory_bytes = max(memory_after - memory_before, 0) if memory_after is not None else None
+
+            self._build_stats[name] = {
+                'build_seconds': build_seconds,
+                'memory_bytes': memory_bytes
+            }
+            self._components = {**self._components, name: component}
+            return component
+
+    def _publish(self, **components):
+        """Bileşenleri tek hamlede yerine koy (copy-on-write)"""
+        with self._lock:
+            self._components = {**self._components, **components}
+
+    @property
+    def text_processor(self):
+        from models.text_processor import TextProcessor
+        return self._get_or_build('text_processor', TextProcessor)
+
+    @property
+    def ml_model(self):
+        from models.ml_model import MLModel
+        # işlemciyi önce kur ki model ölçümüne karışmasın
+        text_processor = self.text_processor
+        return self._get_or_build('ml_model', lambda: MLModel(text_processor=text_processor))
+
+    @property
+    def db_manager(self):
+        from database.db_manager import DatabaseManager
+        from database.init_db import init_database
+
+        def build():
+            manager = DatabaseManager()
+            init_database(manager.db_path)
+            return manager
+
+        return self._get_or_build('db_manager', build)
+
+    @property
+    def query_log(self):
+        from database.write_behind import QueryLogWriter
+        db_manager = self.db_manager
+
+        def build():
+            writer = QueryLogWriter(db_manager)
+            # süreç kapanırken kuyrukta kalan kayıtlar yazılsın
+            atexit.register(writer.close)
+            return writer
+
+        return self._get_or_build('query_log', build)
+
+    @property
+    def api_handler(self):
+        from utils.api_handler import APIHandler
+        return self._get_or_build('api_handler', APIHandler)
+
+    def update_topics(self, upserts: Iterable[Dict] = (), removed: Iterable[str] = ()):
+        """
+        Konuları ekle / güncelle / sil ve yeni modeli yayınla
+
+        Args:
+            upserts: Konu sözlükleri (aynı isim varsa güncellenir)
+            removed: Silinecek konu isimleri
+
+        Returns:
+            Yayınlanan MLModel
+        """
+        with self._update_lock:
+            model = self.ml_model.updated(self.text_processor.with_topics(upserts, removed))
+            self._publish(text_processor=model.text_processor, ml_model=model)
+            return model
+
+    def reload_topics(self):
+        """
+        Konu dosyalarını yeniden oku, değişen konularla modeli güncelle
+
+        Dosya yarım yazılmışsa yükleme hata verir (OSError / ValueError) ve
+        mevcut model yerinde kalır.
+
+        Returns:
+            Yayınlanan MLModel
+        """
+        from models.text_processor import TextProcessor
+        from models.topic_store import discover_topic_sources
+
+        with self._update_lock:
+            # kaynaklar açıkça veriliyor ki bozuk dosyada örnek veriye düşmesin
+            text_processor = TextProcessor(sources=discover_topic_sources())
+            model = self.ml_model.updated(text_processor)
+            self._publish(text_processor=text_processor, ml_model=model)
+            return model
+
+    def watch_topics(self, interval: float = 2.0):
+        """Konu dosyalarını izleyen arka plan thread'ini (bir kez) başlat"""
+        from models.topic_watcher import TopicWatcher
+
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = TopicWatcher(self.reload_topics, interval=interval)
+                self._watcher.start()
+            return self._watcher
+
+    def register_session(self, session_id: str):
+        """Paylaşılan nesneleri kullanan oturumu kaydet (her istekte çağrılıyor)"""
+        with self._lock:
+            self._sessions[session_id] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            self._expire_sessions()
+
+    def _expire_sessions(self):
+        """session_ttl boyunca görülmeyen oturumları at, küme sınırsız büyümesin"""
+        cutoff = time.monotonic() - self.session_ttl
+        while self._sessions:
+            session_id, last_seen = next(iter(self._sessions.items()))
+            if last_seen >= cutoff:
+                break
+            del self._sessions[session_id]
+
+    def record_render(self, first_card_seconds: float, complete_seconds: float):
+        """Bir aramanın ilk karta ve tüm panellere kadar geçen süresini kaydet"""
+        with self._lock:
+            self._render_timings.append((first_card_seconds, complete_seconds))
+
+    def render_report(self) -> Dict:
+        """
+        Son aramaların çizim sürelerini raporla
+
+        Returns:
+            {'searches': int, 'first_card': {'p50', 'p95'}, 'complete': {'p50', 'p95'}} (saniye)
+        """
+        with self._lock:
+            timings = list(self._render_timings)
+
+        report = {'searches': len(timings)}
+        for index, name in enumerate(('first_card', 'complete')):
+            values = sorted(timing[index] for timing in timings)
+            report[name] = {
+                'p50': values[int(0.50 * (len(values) - 1))] if values else 0.0,
+                'p95': values[int(0.95 * (len(values) - 1))] if values else 0.0,
+            }
+        return report
+
+    def savings_report(self) -> Dict:
+        """
+        Paylaşımın sağladığı tasarrufu raporla
+
+        Returns:
+            {
+                'sessions': int,  # son session_ttl içinde görülen oturumlar
+                'per_session': {'build_seconds': float, 'memory_bytes': int | None},
+                'total': {'build_seconds': float, 'memory_bytes': int | None},
+                'components': {isim: {'build_seconds', 'memory_bytes'}}
+            }
+            Bellek ölçülmediyse (measure_memory kapalı ya da Linux dışı) memory_bytes None.
+        """
+        with self._lock:
+            self._expire_sessions()
+            components = {name: dict(stats) for name, stats in self._build_stats.items()}
+            sessions = len(self._sessions)
+
+        memory = [s['memory_bytes'] for s in components.values()]
+        per_session = {
+            'build_seconds': sum(s['build_seconds'] for s in components.values()),
+            'memory_bytes': sum(memory) if None not in memory else None
+        }
+
+        # ilk oturum zaten kurulumu ödüyor, sonrakiler bedava
+        reused = max(sessions - 1, 0)
+
+        return {
+            'sessions': sessions,
+            'per_session': per_session,
+            'total': {
+                'build_seconds': per_session['build_seconds'] * reused,
+                'memory_bytes': per_session['memory_bytes'] * reused
+                if per_session['memory_bytes'] is not None else None
+            },
+            'components': components
+        }
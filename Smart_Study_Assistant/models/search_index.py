@@ -0,0 +1,158 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from models.ranking import top_k_rows
+
+
+# MLModel'in desteklediği arama modları
+INDEX_MODES = ('exact', 'lsh')
+
+SearchResult = Tuple[np.ndarray, np.ndarray]
+
+
+class ExactIndex:
+    """Tüm konulara karşı tam kosinüs araması"""
+
+    def __init__(self, tfidf_matrix: sparse.csr_matrix):
+        # TF-IDF satırları zaten l2 normalize, kosinüs = düz nokta çarpım.
+        # csr @ csr her istekte format dönüşümü yapmasın diye transpozu CSR tutuyoruz
+        self.matrix_t = sparse.csr_matrix(tfidf_matrix).T.tocsr()
+
+    def score(self, vectors: sparse.csr_matrix) -> np.ndarray:
+        """Vektör(ler) ile tüm konular arasındaki skorlar (satır başına)"""
+        return (vectors @ self.matrix_t).toarray()
+
+    def search(self, vectors: sparse.csr_matrix, k: int) -> List[SearchResult]:
+        """Her sorgu satırı için (indeksler, skorlar) döndür, skor sırasıyla"""
+        scores = self.score(vectors)
+        top = top_k_rows(scores, k)
+        return [(indices, scores[row, indices]) for row, indices in enumerate(top)]
+
+
+class LSHIndex:
+    """Rastgele izdüşüm (SimHash) tabanlı yaklaşık kosinüs araması
+
+    Her tabloda n_bits rastgele hiperdüzlem var; bir vektörün kodu hangi
+    tarafında kaldığı bitlerden oluşur. Aynı kovadaki (ve tek bit farklı
+    komşu kovalardaki) konular aday olur, adaylar tam skorla yeniden sıralanır.
+    """
+
+    def __init__(self, tfidf_matrix: sparse.csr_matrix, planes: np.ndarray,
+                 sorted_codes: np.ndarray, order: np.ndarray, multi_probe: bool = True):
+        self.matrix = sparse.csr_matrix(tfidf_matrix)
+        self.planes = planes
+        self.sorted_codes = sorted_codes
+        self.order = order
+        self.multi_probe = multi_probe
+
+    @property
+    def n_tables(self) -> int:
+        return self.sorted_codes.shape[0]
+
+    @property
+    def n_bits(self) -> int:
+        return self.planes.shape[1] // self.n_tables
+
+    @staticmethod
+    def default_bits(n_topics: int, bucket_size: int = 32) -> int:
+        """Kova başına ~bucket_size konu düşecek bit sayısı"""
+        return int(min(24, max(1, round(math.log2(max(n_topics, 1) / bucket_size)))))
+
+    @classmethod
+    def build(cls, tfidf_matrix: sparse.csr_matrix, n_tables: int = 16, n_bits: int = None,
+              seed: int = 0, block_size: int = 65536) -> 'LSHIndex':
+        """
+        Konu matrisinden LSH tablolarını kur
+
+        Args:
+            tfidf_matrix: l2 normalize konu matrisi
+            n_tables: Hash tablosu sayısı (recall artar, gecikme artar)
+            n_bits: Tablo başına bit (None ise katalog boyutundan seçilir)
+            seed: Hiperdüzlemler için tohum
+            block_size: Aynı anda izdüşümü alınacak satır sayısı
+        """
+        matrix = sparse.csr_matrix(tfidf_matrix)
+        n_topics, n_features = matrix.shape
+        n_bits = n_bits or cls.default_bits(n_topics)
+
+        rng = np.random.default_rng(seed)
+        planes = rng.standard_normal((n_features, n_tables * n_bits)).astype(np.float32)
+
+        codes = np.empty((n_tables, n_topics), dtype=np.uint32)
+        for start in range(0, n_topics, block_size):
+            stop = min(start + block_size, n_topics)
+            codes[:, start:stop] = cls._codes(matrix[start:stop] @ planes, n_tables, n_bits).T
+
+        order = np.argsort(codes, axis=1, kind='stable').astype(np.int32)
+        sorted_codes = np.take_along_axis(codes, order, axis=1)
+        return cls(matrix, planes, sorted_codes, order)
+
+    @staticmethod
+    def _codes(projection: np.ndarray, n_tables: int, n_bits: int) -> np.ndarray:
+        """İzdüşümlerden (satır, tablo) kodları üret"""
+        bits = (np.asarray(projection) > 0).reshape(-1, n_tables, n_bits)
+        weights = (1 << np.arange(n_bits, dtype=np.uint32))
+        return (bits * weights).sum(axis=2, dtype=np.uint32)
+
+    def _project(self, vectors: sparse.csr_matrix) -> np.ndarray:
+        """Seyrek vektörlerin hiperdüzlem izdüşümleri
+
+        Sadece sıfır olmayan terimlerin satırları okunuyor; sparse @ dense
+        çarpımı float32 düzlemleri her sorguda float64'e kopyalıyordu.
+        """
+        projection = np.zeros((vectors.shape[0], self.planes.shape[1]), dtype=np.float32)
+        for row in range(vectors.shape[0]):
+            start, stop = vectors.indptr[row], vectors.indptr[row + 1]
+            if stop > start:
+                projection[row] = vectors.data[start:stop].astype(np.float32) @ self.planes[vectors.indices[start:stop]]
+        return projection
+
+    def _candidates(self, codes: np.ndarray) -> np.ndarray:
+        """Bir sorgunun tablo kodlarından aday konu indeksleri"""
+        if self.multi_probe:
+            flips = np.concatenate(([0], 1 << np.arange(self.n_bits, dtype=np.uint32)))
+        else:
+            flips = np.zeros(1, dtype=np.uint32)
+
+        found = []
+        for table, code in enumerate(codes):
+            probes = np.bitwise_xor(code, flips).astype(np.uint32)
+            lows = np.searchsorted(self.sorted_codes[table], probes, side='left')
+            highs = np.searchsorted(self.sorted_codes[table], probes, side='right')
+            for low, high in zip(lows, highs):
+                if high > low:
+                    found.append(self.order[table, low:high])
+
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def search(self, vectors: sparse.csr_matrix, k: int) -> List[SearchResult]:
+        """Her sorgu satırı için yaklaşık (indeksler, skorlar) döndür"""
+        vectors = sparse.csr_matrix(vectors)
+        all_codes = self._codes(self._project(vectors), self.n_tables, self.n_bits)
+
+        results = []
+        for row, codes in enumerate(all_codes):
+            candidates = self._candidates(codes)
+            if len(candidates) == 0:
+                results.append((candidates, np.empty(0)))
+                continue
+
+            # adaylar tam skorla yeniden sıralanıyor
+            scores = (self.matrix[candidates] @ vectors[row].T).toarray().ravel()
+            top = top_k_rows(scores[np.newaxis, :], k)[0]
+            results.append((candidates[top], scores[top]))
+
+        return results
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """İndeks artifact'ına yazılacak diziler"""
+        return {'lsh_planes': self.planes, 'lsh_sorted_codes': self.sorted_codes, 'lsh_order': self.order}
+
+    @classmethod
+    def from_arrays(cls, tfidf_matrix: sparse.csr_matrix, arrays: Dict[str, np.ndarray]) -> 'LSHIndex':
+        return cls(tfidf_matrix, arrays['lsh_planes'], arrays['lsh_sorted_codes'], arrays['lsh_order'])
@@ -0,0 +1,158 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from models.ranking import top_k_rows
+
+
+# her konu için saklanan komşu sayısı
+DEFAULT_GRAPH_K = 10
+
+
+class SimilarityGraph:
+    """Konu-konu k en yakın komşu grafiği
+
+    Her satır bir konunun en benzer k komşusunu skor sırasıyla tutar.
+    Boş yerler -1 indeks ile doldurulur. Nesne salt okunur; güncelleme
+    yeni bir graf döndürür.
+    """
+
+    def __init__(self, neighbors: np.ndarray, scores: np.ndarray):
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @property
+    def k(self) -> int:
+        return self.neighbors.shape[1]
+
+    @classmethod
+    def build(cls, tfidf_matrix: sparse.csr_matrix, k: int = DEFAULT_GRAPH_K,
+              block_size: int = 2048) -> 'SimilarityGraph':
+        """
+        Tüm konular için komşu grafiğini blok blok hesapla
+
+        Args:
+            tfidf_matrix: l2 normalize konu matrisi
+            k: Konu başına komşu sayısı
+            block_size: Aynı anda skorlanacak satır sayısı (bellek sınırı)
+        """
+        n_topics = tfidf_matrix.shape[0]
+        matrix = sparse.csr_matrix(tfidf_matrix)
+        matrix_t = matrix.T.tocsr()
+
+        neighbors = np.full((n_topics, k), -1, dtype=np.int32)
+        scores = np.zeros((n_topics, k), dtype=np.float64)
+
+        for start in range(0, n_topics, block_size):
+            stop = min(start + block_size, n_topics)
+            block_scores = (matrix[start:stop] @ matrix_t).toarray()
+
+            # kendisini hariç tut
+            rows = np.arange(stop - start)
+            block_scores[rows, rows + start] = -1
+
+            cls._fill_rows(neighbors[start:stop], scores[start:stop], block_scores)
+
+        return cls(neighbors, scores)
+
+    @staticmethod
+    def _fill_rows(neighbors: np.ndarray, scores: np.ndarray, block_scores: np.ndarray):
+        """Skor bloğundan pozitif komşuları satırlara yaz"""
+        top = top_k_rows(block_scores, neighbors.shape[1])
+        top_scores = np.take_along_axis(block_scores, top, axis=1)
+        positive = top_scores > 0
+
+        width = top.shape[1]
+        neighbors[:, :width] = np.where(positive, top, -1)
+        scores[:, :width] = np.where(positive, top_scores, 0.0)
+
+    def neighbors_of(self, topic_idx: int, top_n: int) -> List[Tuple[int, float]]:
+        """Bir konunun ilk top_n komşusunu [(indeks, skor), ...] olarak döndür"""
+        result = []
+        for neighbor, score in zip(self.neighbors[topic_idx, :top_n], self.scores[topic_idx, :top_n]):
+            if neighbor < 0:
+                break
+            result.append((int(neighbor), float(score)))
+        return result
+
+    def update_rows(self, tfidf_matrix: sparse.csr_matrix, previous: np.ndarray,
+                    block_size: int = 2048) -> 'SimilarityGraph':
+        """
+        Eklenen, değişen ve silinen konulardan sonraki grafı döndür
+
+        Değişen satırlar ve silinen/değişen bir komşusunu kaybeden satırlar
+        tüm konularla yeniden skorlanıyor. Diğer satırların eski komşuları
+        güncel matrisle (yeni IDF ile) yeniden skorlanıp değişen satırlarla
+        birleştiriyor; böylece tüm skorlar aynı IDF'ten geliyor.
+
+        Args:
+            tfidf_matrix: Güncel konu matrisi
+            previous: Yeni her satırın eski graftaki indeksi, yeni/değişen satırlar için -1
+            block_size: Aynı anda skorlanacak satır sayısı (bellek sınırı)
+        """
+        matrix = sparse.csr_matrix(tfidf_matrix)
+        n_topics, k = matrix.shape[0], self.k
+        previous = np.asarray(previous)
+        dirty = np.nonzero(previous < 0)[0]
+
+        # eski indeks -> yeni indeks, silinen ya da değişen konular -1
+        remap = np.full(self.neighbors.shape[0] + 1, -1, dtype=np.int32)
+        clean = np.nonzero(previous >= 0)[0]
+        remap[previous[clean]] = clean
+
+        # komşusu silinen ya da değişen satırın k+1'inci adayı bilinmiyor, baştan hesaplanmalı
+        old_neighbors = self.neighbors[previous[clean]]
+        lost = ((old_neighbors >= 0) & (remap[old_neighbors] < 0)).any(axis=1)
+        full = np.sort(np.concatenate([dirty, clean[lost]]))
+        clean = clean[~lost]
+
+        neighbors = np.full((n_topics, k), -1, dtype=np.int32)
+        scores = np.zeros((n_topics, k), dtype=np.float64)
+
+        dirty_t = matrix[dirty].T.tocsr()
+        for start in range(0, len(clean), block_size):
+            rows = clean[start:start + block_size]
+            row_matrix = matrix[rows]
+
+            # remap'in son elemanı -1 komşular için
+            kept = remap[self.neighbors[previous[rows]]]
+            kept_scores = np.full(kept.shape, -1.0)
+            for column in range(k):
+                valid = kept[:, column] >= 0
+                if valid.any():
+                    kept_scores[valid, column] = np.asarray(
+                        row_matrix[valid].multiply(matrix[kept[valid, column]]).sum(axis=1)
+                    ).ravel()
+
+            candidate_ids = np.hstack([kept, np.broadcast_to(dirty.astype(np.int32), (len(rows), len(dirty)))])
+            candidate_scores = np.hstack([kept_scores, (row_matrix @ dirty_t).toarray()])
+
+            top = top_k_rows(candidate_scores, k)
+            top_scores = np.take_along_axis(candidate_scores, top, axis=1)
+            positive = top_scores > 0
+            neighbors[rows] = np.where(positive, np.take_along_axis(candidate_ids, top, axis=1), -1)
+            scores[rows] = np.where(positive, top_scores, 0.0)
+
+        # değişen ve komşu kaybeden satırlar tüm konularla baştan
+        matrix_t = matrix.T.tocsr()
+        for start in range(0, len(full), block_size):
+            rows = full[start:start + block_size]
+            block_scores = (matrix[rows] @ matrix_t).toarray()
+            block_scores[np.arange(len(rows)), rows] = -1
+
+            block_neighbors = np.full((len(rows), k), -1, dtype=np.int32)
+            block_neighbor_scores = np.zeros((len(rows), k), dtype=np.float64)
+            self._fill_rows(block_neighbors, block_neighbor_scores, block_scores)
+            neighbors[rows] = block_neighbors
+            scores[rows] = block_neighbor_scores
+
+        return SimilarityGraph(neighbors, scores)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """İndeks artifact'ına yazılacak diziler"""
+        return {'graph_neighbors': self.neighbors, 'graph_scores': self.scores}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'SimilarityGraph':
+        return cls(arrays['graph_neighbors'], arrays['graph_scores'])
@@ -0,0 +1,62 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+
+class SynonymLexicon:
+    """Token tabanlı eş anlamlı kelime sözlüğü
+
+    Anahtarlar tam kelime (ya da kelime grubu) olarak eşleşir; 'kod' artık
+    'kodlama'nın içinde eşleşmiyor. Sorgu soldan sağa taranır, her konumda
+    en uzun kelime grubu hash map'te aranır. Maliyet sözlük boyutundan
+    bağımsız, O(sorgu kelimesi x en uzun grup).
+    """
+
+    def __init__(self, entries: Dict[str, str], normalize: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            entries: anahtar -> eklenecek kelimeler
+            normalize: Anahtarları sorgularla aynı biçime getiren fonksiyon (ör. clean_text)
+        """
+        self._expansions = {}
+        for key, value in entries.items():
+            tokens = tuple((normalize(key) if normalize else key.lower()).split())
+            if not tokens:
+                continue
+
+            # normalize sonrası çakışan anahtarların kelimeleri birleşiyor
+            words = self._expansions.get(tokens, [])
+            words.extend(word for word in value.split() if word not in words)
+            self._expansions[tokens] = words
+
+        self._expansions = {tokens: ' '.join(words) for tokens, words in self._expansions.items()}
+        self.max_phrase_len = max((len(tokens) for tokens in self._expansions), default=0)
+
+    @classmethod
+    def from_file(cls, path: str, normalize: Optional[Callable[[str], str]] = None) -> 'SynonymLexicon':
+        """JSON sözlük dosyasından yükle ({'entries': {anahtar: değer}})"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('entries', {}), normalize=normalize)
+
+    def __len__(self):
+        return len(self._expansions)
+
+    def expansions_for(self, tokens: List[str]) -> List[str]:
+        """Token listesinde eşleşen anahtarların eklenecek kelimelerini sırayla döndür"""
+        found = []
+        seen = set()
+        i = 0
+        while i < len(tokens):
+            # en uzun kelime grubundan başla
+            for length in range(min(self.max_phrase_len, len(tokens) - i), 0, -1):
+                key = tuple(tokens[i:i + length])
+                expansion = self._expansions.get(key)
+                if expansion is not None:
+                    if key not in seen:
+                        seen.add(key)
+                        found.append(expansion)
+                    i += length
+                    break
+            else:
+                i += 1
+        return found
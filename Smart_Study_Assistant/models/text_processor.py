@@ -1,116 +1,344 @@
+import copy
 import re
 import json
 import os
-from typing import List, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterable, List, Dict, Optional, Tuple
+from models.synonyms import SynonymLexicon
+from utils.cache import LRUCache
+from models.topic import BucketSchema, Topic, UrlTable
+from models.topic_store import (
+    DATA_DIR, LAZY_THRESHOLD_BYTES, STORE_DIR, ResourceStore,
+    discover_topic_sources, iter_topics, split_topic
+)
+
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'text_rules.json')
+SYNONYMS_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'synonyms.json')
+
+# türkçe i/ı ayrımı arama anahtarında kaybolsun: "İLERİ", "ileri", "Ileri" aynı
+_DOTTED_I_FOLD = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+_SLUG_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+# arayüzdeki "📹 Video" gibi etiketlerin başındaki emoji / işaretler
+_STYLE_PREFIX = re.compile(r'^[^\w]+')
+
+# kaynak panelinde zorluk başına, tarz başına ve toplam gösterilen link sayısı
+DIFFICULTY_PICK = 2
+STYLE_PICK = 1
+MAX_RESOURCES = 5
+# seçim tablosunda zorluk başına tutulan link (konu keşfi sekmesi 3 gösteriyor)
+DIFFICULTY_ROW = 3
+
+
+def topic_key(name: str) -> str:
+    """Konu ismini büyük/küçük harf ve i/ı farkına duyarsız arama anahtarına çevir"""
+    return ' '.join(name.translate(_DOTTED_I_FOLD).casefold().split())
+
+
+def slugify(name: str) -> str:
+    """Konu isminden URL dostu slug üret ('UI/UX Tasarım' -> 'ui-ux-tasarim')"""
+    return _SLUG_SEPARATORS.sub('-', name.translate(_ASCII_FOLD).lower()).strip('-')
+
+
+@lru_cache(maxsize=256)
+def normalize_style(style: str) -> str:
+    """Öğrenme tarzı etiketini veri anahtarına çevir ('📹 Video' -> 'video')"""
+    return _STYLE_PREFIX.sub('', style.lower()).strip()
 
 
 class TextProcessor:
     """Metin işleme ve temizleme sınıfı"""
 
-    def __init__(self):
-        self.topics_data = self._load_topics()
+    def __init__(self, sources: List[str] = None, lazy_resources: bool = None):
+        """
+        Args:
+            sources: Konu dosyaları (None ise data/ altından bulunur, parçalı olabilir)
+            lazy_resources: Kaynak listelerini diskte tut (None ise katalog boyutuna göre)
+        """
+        # hangi dosyalardan yüklendiğini tut, model indeksi bunların hash'ine bakıyor
+        self.source_paths = list(sources) if sources else discover_topic_sources()
+        self.resource_store = None
+        # with_topics() ile bellekte değiştirilen konular kaynak dosyalarla artık aynı değil
+        self.modified = False
+        # tüm konular aynı URL tablosunu ve kova şemasını paylaşıyor
+        self.url_table = UrlTable()
+        self.bucket_schema = BucketSchema()
+        self.topics_data = self._load_topics(lazy_resources, fallback=sources is None)
+        self._build_topic_indexes()
+        self._build_resource_table()
+
+        # normalizasyon kuralları bir kez derleniyor
+        self._load_text_rules(RULES_PATH)
+        self._clean_text_cached = lru_cache(maxsize=8192)(self._clean_text_uncached)
 
-    def _load_topics(self) -> List[Dict]:
-        """Örnek konuları yükle - önce complete'i dene"""
-        # önce complete versiyonunu dene
-        complete_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_topics_complete.json')
-        topics_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_topics.json')
+        # eş anlamlılar bir kez yükleniyor, anahtarlar sorgu gibi temizleniyor
+        self.synonyms = SynonymLexicon.from_file(SYNONYMS_PATH, normalize=self._clean_text_uncached)
 
-        #complete varsa onu kullan
-        if os.path.exists(complete_path):
-            try:
-                with open(complete_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data['topics']
-            except:
-                pass
+    def _load_topics(self, lazy_resources: bool = None, fallback: bool = True) -> List[Topic]:
+        """Konuları akış halinde yükle - önce parçaları/complete'i dene"""
+        try:
+            return self._stream_topics(lazy_resources)
+        except (OSError, ValueError):
+            sample_path = os.path.join(DATA_DIR, 'sample_topics.json')
+            if not fallback or self.source_paths == [sample_path]:
+                raise
 
         #yoksa normal kullan
-        with open(topics_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('topics', [])
+        self.source_paths = [sample_path]
+        self.url_table = UrlTable()
+        self.bucket_schema = BucketSchema()
+        return self._stream_topics(lazy_resources)
+
+    def _stream_topics(self, lazy_resources: bool = None) -> List[Topic]:
+        """Dosyaları konu konu oku, büyük katalogda ağır alanları diske ayır"""
+        if lazy_resources is None:
+            total_bytes = sum(os.path.getsize(path) for path in self.source_paths)
+            lazy_resources = total_bytes > LAZY_THRESHOLD_BYTES
+
+        def all_topics():
+            for path in self.source_paths:
+                yield from iter_topics(path)
+
+        if not lazy_resources:
+            return [Topic.from_dict(topic, self.bucket_schema, self.url_table) for topic in all_topics()]
+
+        store_path = os.path.join(STORE_DIR, f"resources-{ResourceStore.fingerprint(self.source_paths)}.db")
+        store = ResourceStore(store_path)
+        # kaynak dosyalar değişmediyse depo tekrar yazılmıyor
+        writer = None if store.is_complete() else store.writer()
+
+        topics = []
+        try:
+            for position, topic in enumerate(all_topics()):
+                hot, payload = split_topic(topic)
+                if writer is not None:
+                    writer.add(position, payload)
+                topics.append(Topic.from_store(hot, self.bucket_schema, self.url_table, store, position))
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            raise
+
+        if writer is not None:
+            writer.commit()
+
+        # bağlantı şimdi açılıyor: katalog değişince yeni depo eskisini siliyor,
+        # bu işlemciyi kullanan oturumlar açık bağlantıyla okumaya devam ediyor
+        self.resource_store = store.open()
+        return topics
+
+    def _load_text_rules(self, rules_path: str):
+        """Temizleme ve kök eşleştirme kurallarını yükle ve derle"""
+        with open(rules_path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+
+        self._strip_re = re.compile(rules['strip_pattern'])
+
+        # her kuralın deseni trigger kelimesini aynen içeriyor; metinde
+        # trigger yoksa kural zaten eşleşemez, regex hiç çalıştırılmıyor
+        self._stem_rules = []
+        for rule in rules.get('stem_rules', []):
+            if rule['trigger'] not in rule['pattern']:
+                raise ValueError(f"Kural deseni trigger içermiyor: {rule['pattern']}")
+            self._stem_rules.append((rule['trigger'], re.compile(rule['pattern']), rule['replacement']))
+
+        # hiçbir trigger geçmeyen metinler için tek geçişlik hızlı yol
+        triggers = sorted({trigger for trigger, _, _ in self._stem_rules}, key=len, reverse=True)
+        self._trigger_re = re.compile('|'.join(map(re.escape, triggers))) if triggers else None
 
     def clean_text(self, text: str) -> str:
         """Metni temizle ve normalize et"""
+        return self._clean_text_cached(text)
+
+    def _clean_text_uncached(self, text: str) -> str:
         # küçük harfe çevir
         text = text.lower()
 
         # türkçe karakterler de oldsun
-        text = re.sub(r'[^\wşğüöçıİŞĞÜÖÇ\s]', '', text)
+        text = self._strip_re.sub('', text)
 
-        #kelime köklerini eşleştir
-        text = re.sub(r'(robot)ik\b', r'\1', text)
-        text = re.sub(r'(program)lama\b', r'\1', text)
-        text = re.sub(r'(öğren)me\b', r'\1', text)
-        text = re.sub(r'(geliştir)me\b', r'\1', text)
-        text = re.sub(r'(veri)\s+bilim\w*', r'\1', text)
-        text = re.sub(r'(web)\s+geliştir\w*', r'\1', text)
+        #kelime köklerini eşleştir (kurallar sırayla, önceki kuralın çıktısı sonrakine girer)
+        if self._trigger_re is not None and self._trigger_re.search(text):
+            for trigger, pattern, replacement in self._stem_rules:
+                if trigger in text:
+                    text = pattern.sub(replacement, text)
 
         return text.strip()
 
-    def get_all_topics(self) -> List[str]:
+    def _build_topic_indexes(self):
+        """Yükleme sırasında isim, slug ve id indekslerini bir kez kur"""
+        by_key, by_slug, by_id = {}, {}, {}
+        topic_ids = []
+
+        for position, topic in enumerate(self.topics_data):
+            slug = slugify(topic.name)
+
+            # veride id yoksa slug kullanılıyor, çakışırsa numara ekleniyor
+            topic_id = str(topic.id or slug)
+            base_id, suffix = topic_id, 2
+            while topic_id in by_id:
+                topic_id = f"{base_id}-{suffix}"
+                suffix += 1
+
+            by_id[topic_id] = position
+            by_key.setdefault(topic_key(topic.name), position)
+            by_slug.setdefault(slug, position)
+            topic_ids.append(topic_id)
+            topic.id = topic_id
+
+        self._topic_by_key = MappingProxyType(by_key)
+        self._topic_by_slug = MappingProxyType(by_slug)
+        self._topic_by_id = MappingProxyType(by_id)
+
+        # erişimciler her çağrıda liste kurmasın diye hazır, değiştirilemez görünümler
+        self._topic_ids = tuple(topic_ids)
+        self._topic_names = tuple(topic.name for topic in self.topics_data)
+        self._topic_keywords = tuple(topic.keywords for topic in self.topics_data)
+
+    def _build_resource_table(self):
+        """
+        Kaynak seçim tablosunu yükleme sırasında kur
+
+        Her konu için zorluk seviyesi başına ilk DIFFICULTY_ROW ve tarz başına
+        ilk STYLE_PICK link hazırlanıyor. Tarz kombinasyonları önceden
+        üretilmiyor (2^n patlaması olmasın); istenen tarzlar bit maskesine
+        çevrilip sonuç (konu, zorluk, maske) anahtarıyla önbelleğe alınıyor.
+        Kaynakları diskte duran büyük kataloglarda konu satırı ilk istekte doluyor.
+        """
+        self._resource_rows = [
+            None if topic._store is not None else self._resource_row(topic)
+            for topic in self.topics_data
+        ]
+        self._resource_selections = LRUCache(maxsize=4096, ttl=None)
+
+    def _resource_row(self, topic: Topic) -> Tuple[Dict[str, Tuple[str, ...]], Tuple[Tuple[str, ...], ...]]:
+        difficulty = {level: topic.difficulty_urls(level)[:DIFFICULTY_ROW] for level in topic.difficulty_levels}
+        styles = tuple(topic.style_urls(style)[:STYLE_PICK] for style in self.bucket_schema.styles)
+        return difficulty, styles
+
+    def _style_mask(self, learning_style) -> int:
+        """İstenen tarzları şema sırasına göre bit maskesine çevir, bilinmeyenler atlanır"""
+        mask = 0
+        for style in learning_style:
+            style_id = self.bucket_schema.style_id(normalize_style(style))
+            if style_id is not None:
+                mask |= 1 << style_id
+        return mask
+
+    def with_topics(self, upserts: Iterable[Dict] = (), removed: Iterable[str] = ()) -> 'TextProcessor':
+        """
+        Konuları eklenmiş / güncellenmiş / silinmiş yeni işlemci döndür
+
+        Mevcut işlemci değişmiyor, onu kullanan oturumlar etkilenmez. Kurallar,
+        eş anlamlılar, URL tablosu ve değişmeyen konu kayıtları paylaşılıyor.
+
+        Args:
+            upserts: Konu sözlükleri; aynı isimde konu varsa yerine geçer, yoksa sona eklenir
+            removed: Silinecek konu isimleri (upserts'ten önce uygulanır)
+        """
+        drop = {self._topic_position(name) for name in removed}
+        topics = [topic for position, topic in enumerate(self.topics_data) if position not in drop]
+
+        positions = {}
+        for position, topic in enumerate(topics):
+            positions.setdefault(topic_key(topic.name), position)
+
+        for data in upserts:
+            record = Topic.from_dict(data, self.bucket_schema, self.url_table)
+            position = positions.get(topic_key(record.name))
+            if position is None:
+                positions[topic_key(record.name)] = len(topics)
+                topics.append(record)
+            else:
+                # güncellenen konu kararlı id'sini korusun
+                if record.id is None:
+                    record.id = topics[position].id
+                topics[position] = record
+
+        clone = copy.copy(self)
+        clone.topics_data = topics
+        clone.modified = True
+        clone._build_topic_indexes()
+        clone._build_resource_table()
+        return clone
+
+    def get_all_topics(self) -> Tuple[str, ...]:
         """Tüm konu isimlerini döndür"""
-        return [topic['name'] for topic in self.topics_data]
+        return self._topic_names
 
-    def get_all_keywords(self) -> List[str]:
+    def get_all_keywords(self) -> Tuple[str, ...]:
         """Tüm anahtar kelimeleri döndür"""
-        return [topic['keywords'] for topic in self.topics_data]
+        return self._topic_keywords
+
+    def get_all_topic_ids(self) -> Tuple[str, ...]:
+        """Konu sırasına göre kararlı konu id'leri"""
+        return self._topic_ids
+
+    def _topic_position(self, name: str) -> Optional[int]:
+        """İsim ya da slug ile konunun sırasını bul"""
+        position = self._topic_by_key.get(topic_key(name))
+        if position is None:
+            position = self._topic_by_slug.get(slugify(name))
+        return position
 
-    def get_topic_by_name(self, name: str) -> Dict:
+    def get_topic_by_name(self, name: str) -> Optional[Topic]:
         """İsme göre konu detaylarını getir"""
-        for topic in self.topics_data:
-            if topic['name'].lower() == name.lower():
-                return topic
-        return None
-
-    def get_resources_for_topic(self, topic_name: str, difficulty: str = "beginner", learning_style: list = None) -> \
-    List[str]:
-        """Konu için kaynakları getir - yeni format"""
+        position = self._topic_position(name)
+        return self.topics_data[position] if position is not None else None
+
+    def get_topic_by_id(self, topic_id: str) -> Optional[Topic]:
+        """Kararlı id'ye göre konu detaylarını getir"""
+        position = self._topic_by_id.get(topic_id)
+        return self.topics_data[position] if position is not None else None
+
+    def get_topic_id(self, name: str) -> Optional[str]:
+        """Konu isminin kararlı id'si"""
+        position = self._topic_position(name)
+        return self._topic_ids[position] if position is not None else None
+
+    def get_resources_for_topic(self, topic_name: str, difficulty: str = "beginner", learning_style: list = None,
+                                per_level: int = DIFFICULTY_PICK) -> List[str]:
+        """Konu için kaynakları getir - yeni format
+
+        per_level zorluk seviyesinden alınacak link sayısı (en fazla DIFFICULTY_ROW);
+        learning_style=[] ile sadece zorluk seviyesinin linkleri dönüyor.
+        """
         if learning_style is None:
             learning_style = ["video"]
+        per_level = min(per_level, DIFFICULTY_ROW)
 
-        topic = self.get_topic_by_name(topic_name)
-        if not topic:
+        position = self._topic_position(topic_name)
+        if position is None:
             return []
 
-        resources = []
+        key = (position, difficulty, self._style_mask(learning_style), per_level)
+        selection = self._resource_selections.get(key)
+        if selection is None:
+            row = self._resource_rows[position]
+            if row is None:
+                row = self._resource_rows[position] = self._resource_row(self.topics_data[position])
+            difficulty_links, style_links = row
 
-        #zorluk seviyesine göre
-        if 'difficulty' in topic and difficulty in topic['difficulty']:
-            resources.extend(topic['difficulty'][difficulty][:2])
+            #zorluk seviyesi önce, sonra tarzlar şema sırasıyla
+            resources = list(difficulty_links.get(difficulty, ())[:per_level])
+            for style_id, links in enumerate(style_links):
+                if key[2] >> style_id & 1:
+                    resources.extend(links)
 
-        #öğrenme tarzına göre
-        if 'learning_style' in topic:
-            for style in learning_style:
-                style_key = style.lower().replace('📹 ', '').replace('📚 ', '').replace('💻 ', '').replace('🎮 ', '')
-                if style_key in topic['learning_style']:
-                    resources.extend(topic['learning_style'][style_key][:1])
+            #tekrarları ilk görülme sırası korunarak kaldır
+            selection = tuple(dict.fromkeys(resources))[:MAX_RESOURCES]
+            self._resource_selections.set(key, selection)
 
-        #tekrarları kaldır
-        return list(set(resources))[:5]
+        return list(selection)
 
     def expand_query(self, query: str) -> str:
         """Sorguyu genişlet (sinonimler, ilgili kelimeler ekle)"""
-        #eş anlamlı falan olması lazım
-        synonyms = {
-            'öğrenmek': 'öğrenme eğitim',
-            'öğrenme': 'öğrenmek eğitim',
-            'yapmak': 'geliştirme yapma',
-            'yapma': 'yapmak geliştirme',
-            'kod': 'programlama kod yazma',
-            'programlama': 'kod yazma program',
-            'uygulama': 'app yazılım program',
-            'robot': 'robotik robotics otomasyon',
-            'robotik': 'robot robotics otomasyon',
-            'web': 'website site internet',
-            'veri': 'data bilim analiz',
-            'yapay': 'ai artificial zeka',
-            'makine': 'machine learning öğrenme',
-        }
-
-        expanded = query
-        for key, value in synonyms.items():
-            if key in query.lower():
-                expanded += ' ' + value
-
-        return expanded
\ No newline at end of file
+        #eş anlamlılar tam kelime olarak eşleşiyor
+        expansions = self.synonyms.expansions_for(query.lower().split())
+
+        if not expansions:
+            return query
+        return query + ' ' + ' '.join(expansions)
@@ -0,0 +1,213 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# bilinen kova isimleri; veride başka isim çıkarsa şemanın sonuna ekleniyor
+DIFFICULTY_LEVELS = ('beginner', 'intermediate', 'advanced')
+LEARNING_STYLES = ('video', 'reading', 'practice', 'game')
+
+
+class UrlTable:
+    """Katalogdaki URL'leri tek kopyada tutan string tablosu
+
+    Aynı link birden fazla konu ya da kovada geçse de (ör. Python YouTube
+    linkleri hem 'beginner' hem 'video' altında) bir kez saklanır; konular
+    sadece tamsayı id tutar.
+    """
+
+    __slots__ = ('_urls', '_ids')
+
+    def __init__(self):
+        self._urls = []
+        self._ids = {}
+
+    def intern(self, url: str) -> int:
+        """URL'in id'sini döndür, yoksa tabloya ekle"""
+        url_id = self._ids.get(url)
+        if url_id is None:
+            url_id = len(self._urls)
+            self._urls.append(url)
+            self._ids[url] = url_id
+        return url_id
+
+    def __getitem__(self, url_id: int) -> str:
+        return self._urls[url_id]
+
+    def __len__(self):
+        return len(self._urls)
+
+
+class BucketSchema:
+    """Zorluk ve öğrenme tarzı kovalarının isim <-> tamsayı eşlemesi"""
+
+    __slots__ = ('difficulty', 'styles', '_difficulty_ids', '_style_ids')
+
+    def __init__(self, difficulty=DIFFICULTY_LEVELS, styles=LEARNING_STYLES):
+        self.difficulty = list(difficulty)
+        self.styles = list(styles)
+        self._difficulty_ids = {name: i for i, name in enumerate(self.difficulty)}
+        self._style_ids = {name: i for i, name in enumerate(self.styles)}
+
+    def difficulty_id(self, name: str, add: bool = False) -> Optional[int]:
+        if add and name not in self._difficulty_ids:
+            self._difficulty_ids[name] = len(self.difficulty)
+            self.difficulty.append(name)
+        return self._difficulty_ids.get(name)
+
+    def style_id(self, name: str, add: bool = False) -> Optional[int]:
+        if add and name not in self._style_ids:
+            self._style_ids[name] = len(self.styles)
+            self.styles.append(name)
+        return self._style_ids.get(name)
+
+
+class Resource:
+    """Bir konunun kovasındaki tek öğrenme kaynağı"""
+
+    __slots__ = ('kind', 'bucket', 'url')
+
+    def __init__(self, kind: str, bucket: str, url: str):
+        self.kind = kind        # 'difficulty' | 'learning_style'
+        self.bucket = bucket    # ör. 'beginner', 'video'
+        self.url = url
+
+    def __repr__(self):
+        return f"Resource({self.kind}/{self.bucket}: {self.url})"
+
+
+class Topic:
+    """Kompakt konu kaydı
+
+    Kaynaklar tek bir array('I') içinde URL id'leri olarak durur; her kovanın
+    dilimi offsets dizisinden okunur: önce zorluk kovaları, sonra öğrenme
+    tarzları. Büyük katalogda ağır alanlar diskte kalıyorsa (store verilmişse)
+    kovalar erişim anında depodan okunur.
+    """
+
+    __slots__ = ('id', 'name', 'keywords', 'popularity', 'extra',
+                 '_schema', '_urls', '_url_ids', '_offsets', '_split', '_store', '_position')
+
+    def __init__(self, topic_id: str, name: str, keywords: str, popularity: Optional[str],
+                 schema: BucketSchema, urls: UrlTable, extra: Optional[Dict] = None):
+        self.id = topic_id
+        self.name = name
+        self.keywords = keywords
+        self.popularity = popularity
+        self.extra = extra
+        self._schema = schema
+        self._urls = urls
+        self._url_ids = None
+        self._offsets = None
+        self._split = 0
+        self._store = None
+        self._position = None
+
+    @classmethod
+    def from_dict(cls, data: Dict, schema: BucketSchema, urls: UrlTable, topic_id: str = None) -> 'Topic':
+        """JSON konu sözlüğünden kayıt kur, URL'leri tabloda tekilleştir"""
+        topic = cls(topic_id or data.get('id'), data['name'], data.get('keywords', ''),
+                    data.get('popularity'), schema, urls)
+        topic._set_buckets(data.get('difficulty', {}), data.get('learning_style', {}))
+
+        extra = {k: v for k, v in data.items()
+                 if k not in ('id', 'name', 'keywords', 'popularity', 'difficulty', 'learning_style')}
+        topic.extra = extra or None
+        return topic
+
+    @classmethod
+    def from_store(cls, hot: Dict, schema: BucketSchema, urls: UrlTable, store, position: int,
+                   topic_id: str = None) -> 'Topic':
+        """Kaynakları diskteki depoda duran (tembel) kayıt kur"""
+        topic = cls(topic_id or hot.get('id'), hot['name'], hot.get('keywords', ''),
+                    hot.get('popularity'), schema, urls)
+        topic._store = store
+        topic._position = position
+        return topic
+
+    def _set_buckets(self, difficulty: Dict[str, List[str]], styles: Dict[str, List[str]]):
+        schema = self._schema
+        buckets = {}
+        for name, links in difficulty.items():
+            buckets[schema.difficulty_id(name, add=True)] = links
+        n_difficulty = len(schema.difficulty)
+        for name, links in styles.items():
+            buckets[n_difficulty + schema.style_id(name, add=True)] = links
+
+        n_buckets = n_difficulty + len(schema.styles)
+        url_ids = array('I')
+        offsets = array('I', [0])
+        for bucket in range(n_buckets):
+            url_ids.extend(self._urls.intern(url) for url in buckets.get(bucket, ()))
+            offsets.append(len(url_ids))
+
+        self._url_ids = url_ids
+        self._offsets = offsets
+        # tarz kovaları, kurulum anındaki zorluk kovası sayısından sonra başlıyor
+        self._split = n_difficulty
+
+    def _bucket(self, position: Optional[int]) -> Tuple[str, ...]:
+        offsets = self._offsets
+        if position is None or position + 1 >= len(offsets):
+            return ()
+        return tuple(self._urls[url_id] for url_id in self._url_ids[offsets[position]:offsets[position + 1]])
+
+    def _payload(self) -> Dict:
+        return self._store.get(self._position) if self._store is not None else {}
+
+    def difficulty_urls(self, level: str) -> Tuple[str, ...]:
+        """Zorluk seviyesine göre kaynak linkleri"""
+        if self._store is not None:
+            return tuple(self._payload().get('difficulty', {}).get(level, ()))
+
+        difficulty_id = self._schema.difficulty_id(level)
+        if difficulty_id is None or difficulty_id >= self._split:
+            return ()
+        return self._bucket(difficulty_id)
+
+    def style_urls(self, style: str) -> Tuple[str, ...]:
+        """Öğrenme tarzına göre kaynak linkleri"""
+        if self._store is not None:
+            return tuple(self._payload().get('learning_style', {}).get(style, ()))
+
+        style_id = self._schema.style_id(style)
+        if style_id is None:
+            return ()
+        # şema bu konudan sonra genişlediyse offset'ler kısa kalır, _bucket boş döner
+        return self._bucket(self._split + style_id)
+
+    @property
+    def difficulty_levels(self) -> Tuple[str, ...]:
+        """Bu konuda kaynağı olan zorluk seviyeleri"""
+        return tuple(level for level in self._schema.difficulty if self.difficulty_urls(level))
+
+    @property
+    def learning_styles(self) -> Tuple[str, ...]:
+        """Bu konuda kaynağı olan öğrenme tarzları"""
+        return tuple(style for style in self._schema.styles if self.style_urls(style))
+
+    def resources(self) -> Iterator[Resource]:
+        """Tüm kaynakları kova sırasıyla dolaş"""
+        for level in self._schema.difficulty:
+            for url in self.difficulty_urls(level):
+                yield Resource('difficulty', level, url)
+        for style in self._schema.styles:
+            for url in self.style_urls(style):
+                yield Resource('learning_style', style, url)
+
+    def to_dict(self) -> Dict:
+        """Eski sözlük biçimine çevir (dışa aktarma / uyumluluk)"""
+        data = {'name': self.name, 'keywords': self.keywords}
+        if self.id is not None:
+            data['id'] = self.id
+        data['difficulty'] = {level: list(self.difficulty_urls(level)) for level in self.difficulty_levels}
+        data['learning_style'] = {style: list(self.style_urls(style)) for style in self.learning_styles}
+        if self.popularity is not None:
+            data['popularity'] = self.popularity
+        if self.extra:
+            data.update(self.extra)
+        elif self._store is not None:
+            data.update({k: v for k, v in self._payload().items() if k not in ('difficulty', 'learning_style')})
+        return data
+
+    def __repr__(self):
+        return f"Topic({self.id!r}, {self.name!r})"
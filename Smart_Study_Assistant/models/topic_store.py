@@ -0,0 +1,313 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterator, List, Tuple
+
+from utils.cache import LRUCache
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+STORE_DIR = os.path.join(DATA_DIR, 'index')
+
+# vektörleştiricinin ve listelerin ihtiyaç duyduğu alanlar bellekte kalıyor
+HOT_FIELDS = ('id', 'name', 'keywords', 'popularity')
+
+# toplam konu verisi bundan büyükse ağır alanlar diske yazılıyor
+LAZY_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+_CHUNK_SIZE = 1 << 20
+_WHITESPACE = ' \t\r\n'
+
+
+def discover_topic_sources(data_dir: str = DATA_DIR) -> List[str]:
+    """
+    Yüklenecek konu dosyalarını bul
+
+    Öncelik: data/topics/ altındaki parçalar (*.json, *.jsonl, isim sırasıyla),
+    sonra sample_topics_complete.json, en son sample_topics.json
+    """
+    shard_dir = os.path.join(data_dir, 'topics')
+    if os.path.isdir(shard_dir):
+        shards = sorted(
+            glob.glob(os.path.join(shard_dir, '*.json')) + glob.glob(os.path.join(shard_dir, '*.jsonl'))
+        )
+        if shards:
+            return shards
+
+    complete_path = os.path.join(data_dir, 'sample_topics_complete.json')
+    if os.path.exists(complete_path):
+        return [complete_path]
+
+    return [os.path.join(data_dir, 'sample_topics.json')]
+
+
+def iter_topics(path: str) -> Iterator[Dict]:
+    """
+    Konu dosyasını bütünüyle belleğe almadan konu konu oku
+
+    Desteklenen biçimler: {"topics": [...]}, düz [...] dizi ve satır başına
+    bir konu olan .jsonl
+    """
+    if path.endswith('.jsonl'):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        return
+
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(_CHUNK_SIZE)
+        pos = _find_topics_array(f, buffer)
+        if pos is None:
+            return
+        buffer, pos = pos
+
+        chunk_size = _CHUNK_SIZE
+        while True:
+            # boşluk ve virgülleri atla
+            while True:
+                while pos < len(buffer) and (buffer[pos] in _WHITESPACE or buffer[pos] == ','):
+                    pos += 1
+                if pos < len(buffer):
+                    break
+                more = f.read(chunk_size)
+                if not more:
+                    raise ValueError(f"{path}: konu dizisi kapanmadan dosya bitti")
+                buffer, pos = more, 0
+
+            if buffer[pos] == ']':
+                return
+
+            try:
+                topic, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # konu tamponda yarım kaldı, devamını oku
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buffer = buffer[pos:] + more
+                pos = 0
+                chunk_size *= 2
+                continue
+
+            chunk_size = _CHUNK_SIZE
+            yield topic
+            pos = end
+
+            # işlenmiş kısmı bırak, tampon büyümesin
+            if pos > _CHUNK_SIZE:
+                buffer, pos = buffer[pos:], 0
+
+
+def _find_topics_array(f, buffer: str):
+    """Tamponda konu dizisinin başladığı '[' karakterini bul
+
+    Düz dizide ilk '[', nesnede üst düzeydeki "topics" anahtarının değeri.
+    Önceki alanların değerleri JSON olarak atlanıyor; string değerlerdeki ya
+    da iç içe nesnelerdeki "topics" eşleşmiyor. Dizi yoksa None.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = _skip_whitespace(f, buffer, 0)
+    if pos is None or buffer[pos] not in '[{':
+        return None
+    if buffer[pos] == '[':
+        return buffer, pos + 1
+
+    pos += 1
+    while True:
+        buffer, pos = _skip_whitespace(f, buffer, pos)
+        if pos is None or buffer[pos] != '"':
+            # anahtarlar bitti ('}'), "topics" yok
+            return None
+        key, buffer, pos = _decode_value(f, decoder, buffer, pos)
+
+        buffer, pos = _skip_whitespace(f, buffer, pos)
+        if pos is None or buffer[pos] != ':':
+            raise ValueError(f"Konu dosyasında '{key}' anahtarından sonra ':' yok")
+        buffer, pos = _skip_whitespace(f, buffer, pos + 1)
+        if pos is None:
+            return None
+
+        if key == 'topics':
+            if buffer[pos] != '[':
+                raise ValueError('Konu dosyasında "topics" alanı dizi değil')
+            return buffer, pos + 1
+
+        _, buffer, pos = _decode_value(f, decoder, buffer, pos)
+        buffer, pos = _skip_whitespace(f, buffer, pos)
+        if pos is None or buffer[pos] != ',':
+            return None
+        pos += 1
+
+
+def _skip_whitespace(f, buffer: str, pos: int):
+    """Boşlukları atla, gerekirse dosyadan oku; dosya bittiyse konum None"""
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            return buffer, pos
+        more = f.read(_CHUNK_SIZE)
+        if not more:
+            return buffer, None
+        buffer, pos = more, 0
+
+
+def _decode_value(f, decoder: json.JSONDecoder, buffer: str, pos: int):
+    """pos'taki JSON değerini çöz, yarım kaldıysa devamını okuyup tekrar dene"""
+    chunk_size = _CHUNK_SIZE
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            error = None
+        except json.JSONDecodeError as e:
+            value, end, error = None, None, e
+        # tampon sonunda biten değer (ör. sayı) devam ediyor olabilir
+        if end is not None and end < len(buffer):
+            return value, buffer, end
+
+        more = f.read(chunk_size)
+        if not more:
+            if error is not None:
+                raise error
+            return value, buffer, end
+        buffer, pos = buffer[pos:] + more, 0
+        chunk_size *= 2
+
+
+def split_topic(topic: Dict) -> Tuple[Dict, Dict]:
+    """Konuyu bellekte kalacak sıcak alanlar ve ağır alanlar olarak ayır"""
+    hot = {field: topic[field] for field in HOT_FIELDS if field in topic}
+    payload = {field: value for field, value in topic.items() if field not in HOT_FIELDS}
+    return hot, payload
+
+
+def _prune_stores(directory: str, keep: str):
+    """Güncel depo dışındaki resources-*.db dosyalarını sil
+
+    Yazılmakta olan .tmp-* dosyalarına dokunulmuyor. Eski depoyu açmış
+    işlemciler açık bağlantıyla okumaya devam ediyor; silinemeyen (ör.
+    Windows'ta açık) dosya bir sonraki yazımda tekrar deneniyor.
+    """
+    for path in glob.glob(os.path.join(directory, 'resources-*.db')):
+        if os.path.abspath(path) != os.path.abspath(keep):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ResourceStore:
+    """Konuların ağır alanlarını (kaynak URL listeleri) diskte tutan sıkıştırılmış depo
+
+    Her konunun payload'ı zlib ile sıkıştırılmış JSON olarak sırasına göre
+    SQLite'a yazılır; okuma tembel ve küçük bir LRU önbellekle yapılır.
+    """
+
+    def __init__(self, path: str, cache_size: int = 256):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._cache = LRUCache(maxsize=cache_size, ttl=None)
+
+    @staticmethod
+    def fingerprint(sources: List[str]) -> str:
+        """Kaynak dosyaların boyut ve değişiklik zamanından kısa parmak izi"""
+        parts = []
+        for path in sources:
+            stat = os.stat(path)
+            parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        return format(zlib.crc32('|'.join(parts).encode('utf-8')), '08x')
+
+    def is_complete(self) -> bool:
+        """Depo önceki bir çalıştırmada tamamen yazılmış mı"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'complete'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+        return row is not None and row[0] == '1'
+
+    def writer(self) -> 'ResourceStoreWriter':
+        """Depoyu baştan yazmak için toplu yazıcı"""
+        return ResourceStoreWriter(self.path)
+
+    def open(self) -> 'ResourceStore':
+        """Okuma bağlantısını hemen aç; dosya sonradan silinse de açık bağlantıyla okunuyor"""
+        with self._lock:
+            self._connection()
+        return self
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        return self._conn
+
+    def get(self, position: int) -> Dict:
+        """Bir konunun ağır alanlarını getir"""
+        payload = self._cache.get(position)
+        if payload is not None:
+            return payload
+
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT payload FROM payloads WHERE position = ?', (position,)
+            ).fetchone()
+
+        payload = json.loads(zlib.decompress(row[0]).decode('utf-8')) if row else {}
+        self._cache.set(position, payload)
+        return payload
+
+
+class ResourceStoreWriter:
+    """ResourceStore'u tek transaction'da dolduran yazıcı"""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.tmp_path = f"{path}.tmp-{os.getpid()}"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+        self._conn = sqlite3.connect(self.tmp_path)
+        self._conn.execute('PRAGMA journal_mode = OFF')
+        self._conn.execute('PRAGMA synchronous = OFF')
+        self._conn.execute('CREATE TABLE payloads (position INTEGER PRIMARY KEY, payload BLOB NOT NULL)')
+        self._conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._batch = []
+        self._batch_size = batch_size
+
+    def add(self, position: int, payload: Dict):
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        self._batch.append((position, blob))
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        self._conn.executemany('INSERT INTO payloads (position, payload) VALUES (?, ?)', self._batch)
+        self._batch = []
+
+    def commit(self):
+        """Yazımı bitir ve depoyu tek hamlede yerine koy"""
+        self._flush()
+        self._conn.execute("INSERT INTO meta (key, value) VALUES ('complete', '1')")
+        self._conn.commit()
+        self._conn.close()
+        os.replace(self.tmp_path, self.path)
+        # kaynak dosyalar her değiştiğinde yeni parmak izli depo yazılıyor, eskiler birikmesin
+        _prune_stores(os.path.dirname(self.path), self.path)
+
+    def abort(self):
+        self._conn.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
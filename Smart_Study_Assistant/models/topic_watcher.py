@@ -0,0 +1,86 @@
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+from models.topic_store import DATA_DIR, discover_topic_sources
+
+
+class TopicWatcher:
+    """Konu dosyalarını yoklayan ve değişince yeniden yükleme tetikleyen thread
+
+    Bağımlılık eklememek için dosya sistemi olayları yerine boyut / mtime
+    yoklanıyor. Yarım yazılmış dosyayı okumamak için imza iki ardışık
+    yoklamada aynı kalınca yükleme yapılıyor.
+    """
+
+    def __init__(self, on_change: Callable[[], object], data_dir: str = DATA_DIR, interval: float = 2.0):
+        """
+        Args:
+            on_change: Değişiklikte çağrılacak fonksiyon (ör. ModelRegistry.reload_topics)
+            data_dir: Konu dosyalarının aranacağı klasör
+            interval: Yoklama aralığı (saniye)
+        """
+        self.on_change = on_change
+        self.data_dir = data_dir
+        self.interval = interval
+        self.reloads = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._loaded = self._signature()
+
+    def _signature(self) -> Tuple:
+        """Konu dosyalarının (yol, boyut, mtime) listesi; yeni parça eklenmesi de sayılır"""
+        signature = []
+        for path in discover_topic_sources(self.data_dir):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def poll(self, pending: Optional[Tuple] = None) -> Optional[Tuple]:
+        """
+        Tek yoklama adımı
+
+        Args:
+            pending: Önceki yoklamada görülen yeni imza
+
+        Returns:
+            Bir sonraki yoklamaya taşınacak imza (değişiklik yoksa None)
+        """
+        signature = self._signature()
+        if signature == self._loaded:
+            return None
+        if signature != pending:
+            # dosya hâlâ yazılıyor olabilir, bir tur daha bekle
+            return signature
+
+        try:
+            self.on_change()
+        except Exception as e:
+            # bozuk / yarım dosya (eksik alan, yanlış tip, geçersiz JSON): mevcut model
+            # kalıyor, thread ölmüyor ve dosya tekrar değişince yeniden deneniyor
+            self.last_error = e
+        else:
+            self.reloads += 1
+            self.last_error = None
+        self._loaded = signature
+        return None
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            pending = self.poll(pending)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='topic-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,68 @@
+from typing import Iterable, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+# 'vocabulary': sözlüklü TfidfVectorizer (max_features ile sınırlı)
+# 'hashing': sözlüksüz, sabit bellekli feature hashing + IDF
+VECTORIZER_MODES = ('vocabulary', 'hashing')
+
+# hashing modunda sütun sayısı; çakışma oranı ~ terim sayısı / n_features
+DEFAULT_HASH_FEATURES = 2 ** 18
+
+
+def idf_from_counts(counts: sparse.csr_matrix) -> np.ndarray:
+    """Belge frekanslarından IDF (TfidfTransformer(smooth_idf=True) ile aynı formül)"""
+    n_docs = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    return np.log((1 + n_docs) / (1 + df)) + 1.0
+
+
+def weight_counts(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    """
+    Terim sayılarını IDF ile ağırlıklandırıp satırları l2 normalize et
+
+    Çıktı sayı matrisiyle aynı seyreklik desenini kullanıyor, böylece sayılar
+    indeksle birlikte tek bir data dizisi olarak saklanabiliyor.
+    """
+    data = counts.data * idf[counts.indices]
+    tfidf = sparse.csr_matrix((data, counts.indices.copy(), counts.indptr.copy()), shape=counts.shape)
+    return normalize(tfidf, norm='l2', copy=False)
+
+
+class HashingTfidfVectorizer:
+    """Sözlük tutmayan TF-IDF vektörleştirici
+
+    Terimler hash ile n_features sütundan birine düşer; bellek katalog ve
+    terim sayısından bağımsız (IDF dizisi n_features uzunluğunda). Nadiren
+    iki terim aynı sütuna düşebilir. Arayüz MLModel'in kullandığı kadarıyla
+    TfidfVectorizer ile aynı: idf_, ngram_range, lowercase, transform().
+    """
+
+    def __init__(self, n_features: int = DEFAULT_HASH_FEATURES, ngram_range: Tuple[int, int] = (1, 2),
+                 lowercase: bool = True):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.lowercase = lowercase
+        # sözlük yok; tüm terimler tutuluyor
+        self.max_features = None
+        self.vocabulary_ = {}
+        self.idf_ = None
+
+    def counter(self) -> HashingVectorizer:
+        """Ham terim sayıları üreten durumsuz hasher"""
+        return HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=self.ngram_range,
+            lowercase=self.lowercase,
+            alternate_sign=False,
+            norm=None
+        )
+
+    def transform(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        if self.idf_ is None:
+            raise ValueError("HashingTfidfVectorizer için önce idf_ atanmalı")
+        return weight_counts(self.counter().transform(texts), self.idf_)
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import summary_cache
+from utils.api_handler import APIHandler
+from utils.summary_cache import SummaryCache
+from utils.wiki_stub import WikiStub
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+DAY = 24 * 3600
+# dinlenmeyen port: isteğe çıkılırsa hemen bağlantı hatası
+UNREACHABLE_URL = 'http://127.0.0.1:9/{language}/w/api.php'
+
+# tests/fixtures/wiki_replay.json bu sayfalardan kaydedildi
+STUB_PAGES = {
+    'tr': {'Python Programlama': {'extract': 'Python, okunabilirliği ön planda tutan genel amaçlı bir programlama dilidir.',
+                                  'categories': ['Kategori:Programlama dilleri']}},
+    'en': {'Machine learning': {'extract': 'Machine learning is a field of study in artificial intelligence.',
+                                'categories': ['Category:Machine learning']}},
+}
+STUB_REDIRECTS = {'en': {'Machine Learning': 'Machine learning'}}
+
+
+@pytest.fixture
+def wiki_stub():
+    stub = WikiStub(pages=STUB_PAGES, redirects=STUB_REDIRECTS).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'wiki_cache.db')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """SummaryCache'in gördüğü saat, elle ilerletiliyor"""
+    now = [1_000_000_000.0]
+    monkeypatch.setattr(summary_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(cache_path):
+    cache = SummaryCache(cache_path, ttl=7 * DAY, negative_ttl=1 * DAY, stale_ttl=30 * DAY)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def make_handler(cache_path):
+    """Geçici önbellekli APIHandler kurucu; test sonunda thread'ler ve önbellek kapanıyor"""
+    handlers = []
+
+    def make(api_url, cache=None, **kwargs):
+        kwargs.setdefault('snapshot_path', None)
+        handler = APIHandler(cache=cache or SummaryCache(cache_path), api_url=api_url, **kwargs)
+        handlers.append(handler)
+        return handler
+
+    yield make
+    for handler in handlers:
+        handler._executor.shutdown(wait=True)
+        handler._hedge_executor.shutdown(wait=True)
+        handler.cache.close()
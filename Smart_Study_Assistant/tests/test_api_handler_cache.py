@@ -0,0 +1,91 @@
+import os
+import time
+
+from conftest import FIXTURE_DIR
+from utils.summary_cache import SummaryCache
+from utils.wiki_stub import WikiStub
+
+TOPICS = ['Python Programlama', 'Machine Learning', 'Olmayan Konu']
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_summaries_from_stub(wiki_stub, make_handler):
+    summaries = make_handler(wiki_stub.url).get_topic_summaries(TOPICS, timeout=None)
+
+    assert summaries['Python Programlama']['exists']
+    assert summaries['Python Programlama']['language'] == 'tr'
+    assert summaries['Machine Learning']['exists']
+    assert summaries['Machine Learning']['language'] == 'en'
+    assert not summaries['Olmayan Konu']['exists']
+
+
+def test_repeat_lookups_make_no_requests(wiki_stub, make_handler):
+    handler = make_handler(wiki_stub.url)
+    first = handler.get_topic_summaries(TOPICS, timeout=None)
+    categories = handler.get_topic_categories('Python Programlama')
+    requests = wiki_stub.request_count()
+    assert requests > 0
+
+    # bulunamayan konu da (negatif kayıt) tekrar sorulmuyor
+    assert handler.get_topic_summaries(TOPICS, timeout=None) == first
+    assert handler.get_topic_categories('Python Programlama') == categories
+    assert wiki_stub.request_count() == requests
+
+
+def test_cache_survives_restart(wiki_stub, make_handler, cache_path):
+    first = make_handler(wiki_stub.url).get_topic_summaries(TOPICS, timeout=None)
+    requests = wiki_stub.request_count()
+
+    # yeni süreç gibi: aynı önbellek dosyasıyla yeni handler
+    restarted = make_handler(wiki_stub.url, cache=SummaryCache(cache_path))
+    assert restarted.get_topic_summaries(TOPICS, timeout=None) == first
+    assert wiki_stub.request_count() == requests
+    assert restarted.cache_stats()['misses'] == 0
+
+
+def test_stale_entry_is_served_then_revalidated(wiki_stub, make_handler, cache_path):
+    handler = make_handler(wiki_stub.url, cache=SummaryCache(cache_path, ttl=0))
+    old = handler.get_topic_summary('Python Programlama')
+
+    wiki_stub.pages['tr']['Python Programlama'] = {'extract': 'Güncellenmiş Python özeti.'}
+    requests = wiki_stub.request_count()
+
+    # süresi dolmuş kayıt beklemeden dönüyor, yenileme arka planda
+    assert handler.get_topic_summary('Python Programlama') == old
+    assert handler.cache_stats()['stale'] >= 1
+    assert wait_for(lambda: handler.cache.peek('summary', 'tr', 'Python Programlama')['summary']
+                    == 'Güncellenmiş Python özeti.')
+    assert wiki_stub.request_count() > requests
+
+
+def test_failed_revalidation_keeps_stale_entry(wiki_stub, make_handler, cache_path):
+    handler = make_handler(wiki_stub.url, cache=SummaryCache(cache_path, ttl=0))
+    old = handler.get_topic_summary('Python Programlama')
+
+    wiki_stub.error_rate = 1.0
+    assert handler.get_topic_summary('Python Programlama') == old
+    assert wait_for(lambda: handler.metrics()['failures'] > 0)
+    assert handler.cache.peek('summary', 'tr', 'Python Programlama') == old
+
+
+def test_replay_fixture_answers_without_pages(make_handler):
+    stub = WikiStub(fixture_path=os.path.join(FIXTURE_DIR, 'wiki_replay.json')).start()
+    try:
+        handler = make_handler(stub.url)
+        summaries = handler.get_topic_summaries(TOPICS, timeout=None)
+        categories = handler.get_topic_categories('Python Programlama')
+    finally:
+        stub.stop()
+
+    assert summaries['Python Programlama']['summary'].startswith('Python, okunabilirliği')
+    assert summaries['Machine Learning']['url'] == 'https://en.wikipedia.org/wiki/Machine_learning'
+    assert not summaries['Olmayan Konu']['exists']
+    assert categories == ['Programlama dilleri']
@@ -0,0 +1,160 @@
+import time
+
+import pytest
+
+from utils.api_handler import CircuitBreaker, CircuitOpenError
+from utils.wiki_stub import WikiStub
+
+# aynı konu iki dilde de var; hangi dilin yanıtının kullanıldığı özetten anlaşılıyor
+BILINGUAL_PAGES = {
+    'tr': {'Python Programlama': {'extract': 'Türkçe özet.'}},
+    'en': {'Python Programlama': {'extract': 'English summary.'}},
+}
+
+
+@pytest.fixture
+def make_stub():
+    stubs = []
+
+    def make(**kwargs):
+        stub = WikiStub(**kwargs).start()
+        stubs.append(stub)
+        return stub
+
+    yield make
+    for stub in stubs:
+        stub.stop()
+
+
+def test_breaker_allows_single_trial_when_half_open():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # deneme sürerken diğer istekler kesiliyor
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.abandon()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0,
+                               'successes': 1, 'failures': 2, 'rejected': 2, 'opened': 1}
+
+
+def test_read_timeout_is_counted_as_timeout(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES, language_delays={'tr': 2.0})
+    handler = make_handler(stub.url, request_timeout=(1.0, 0.2))
+
+    summary = handler.get_topic_summary('Python Programlama')
+
+    # Türkçe sunucu asılı, İngilizce yanıt kısa süreli kullanılıyor
+    assert summary['summary'] == 'English summary.'
+    metrics = handler.metrics()
+    assert metrics['timeouts'] == 1
+    assert metrics['failures'] == 0
+
+
+def test_breaker_opens_and_short_circuits(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES, error_rate=1.0, fault_languages=['tr'])
+    handler = make_handler(stub.url, failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            handler._query('tr', ['Python Programlama'])
+    assert handler.breaker('tr').state == CircuitBreaker.OPEN
+
+    requests = stub.request_count()
+    with pytest.raises(CircuitOpenError):
+        handler._query('tr', ['Python Programlama'])
+    assert stub.request_count() == requests
+    assert handler.metrics()['short_circuits'] == 1
+
+    # devre dil başına: İngilizce etkilenmiyor, özet yedekten geliyor
+    assert handler.get_topic_summary('Python Programlama')['summary'] == 'English summary.'
+    assert handler.breaker('en').state == CircuitBreaker.CLOSED
+
+
+def test_half_open_trial_closes_or_reopens(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES, error_rate=1.0, fault_languages=['tr'])
+    handler = make_handler(stub.url, failure_threshold=1, reset_timeout=0.1)
+    breaker = handler.breaker('tr')
+
+    with pytest.raises(Exception):
+        handler._query('tr', ['Python Programlama'])
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # deneme isteği de hata verirse devre yeniden açılıyor
+    time.sleep(0.12)
+    with pytest.raises(Exception):
+        handler._query('tr', ['Python Programlama'])
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()['opened'] == 2
+
+    # sunucu düzelince deneme isteği devreyi kapatıyor
+    stub.error_rate = 0.0
+    time.sleep(0.12)
+    pages, _ = handler._query('tr', ['Python Programlama'])
+    assert pages[0]['title'] == 'Python Programlama'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_releases_half_open_trial(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES)
+    handler = make_handler(stub.url, failure_threshold=1, reset_timeout=0.05)
+    breaker = handler.breaker('tr')
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    class BrokenRateLimiter:
+        def acquire(self):
+            raise KeyError('hata')
+
+    handler.rate_limiter = BrokenRateLimiter()
+    with pytest.raises(KeyError):
+        handler._query('tr', ['Python Programlama'])
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # deneme hakkı geri verildi, sonraki istek geçiyor ve devreyi kapatıyor
+    handler.rate_limiter = None
+    handler._query('tr', ['Python Programlama'])
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedge_uses_english_when_turkish_is_slow(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES, language_delays={'tr': 1.0})
+    handler = make_handler(stub.url, hedge_after=0.1)
+
+    start = time.perf_counter()
+    summary = handler.get_topic_summary('Python Programlama')
+    elapsed = time.perf_counter() - start
+
+    assert summary['summary'] == 'English summary.'
+    assert elapsed < 0.8
+    metrics = handler.metrics()
+    assert (metrics['hedges'], metrics['hedge_wins']) == (1, 1)
+
+
+def test_hedge_not_started_when_turkish_is_fast(make_stub, make_handler):
+    stub = make_stub(pages=BILINGUAL_PAGES)
+    handler = make_handler(stub.url, hedge_after=0.5)
+
+    assert handler.get_topic_summary('Python Programlama')['summary'] == 'Türkçe özet.'
+    assert handler.metrics()['hedges'] == 0
+    assert {language for language, _ in stub.requests} == {'tr'}
+
+
+def test_hedge_keeps_turkish_when_english_is_missing(make_stub, make_handler):
+    stub = make_stub(pages={'tr': BILINGUAL_PAGES['tr']}, language_delays={'tr': 0.3})
+    handler = make_handler(stub.url, hedge_after=0.05)
+
+    assert handler.get_topic_summary('Python Programlama')['summary'] == 'Türkçe özet.'
+    metrics = handler.metrics()
+    assert (metrics['hedges'], metrics['hedge_wins']) == (1, 0)
@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+from scipy import sparse
+
+from models.index_store import load_index, save_index
+
+
+def save(index_dir, content_hash):
+    matrix = sparse.csr_matrix(np.eye(2))
+    return save_index(index_dir, content_hash, {'a': 0, 'b': 1}, np.ones(2), matrix, ['A', 'B'])
+
+
+def test_save_keeps_only_current_artifact(tmp_path):
+    index_dir = str(tmp_path)
+    old = save(index_dir, 'a' * 64)
+    # yarım yazılmış klasörler ve ilgisiz dosyalar silinmiyor
+    os.makedirs(os.path.join(index_dir, 'b' * 16 + '.tmp-1'))
+    (tmp_path / 'notlar.txt').write_text('x')
+
+    current = save(index_dir, 'c' * 64)
+
+    assert not os.path.exists(old)
+    assert sorted(os.listdir(index_dir)) == sorted(['b' * 16 + '.tmp-1', 'c' * 16, 'notlar.txt'])
+    assert load_index(index_dir, 'c' * 64)['manifest']['topic_count'] == 2
+    assert os.path.basename(current) == 'c' * 16
@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.bench_vectorizers import synthetic_catalog
+from models.ml_model import MLModel
+from models.text_processor import TextProcessor
+
+
+@pytest.fixture
+def text_processor(tmp_path):
+    path = str(tmp_path / 'topics.json')
+    synthetic_catalog(path, 200)
+    return TextProcessor(sources=[path])
+
+
+def edited(text_processor, count=3):
+    """İlk konuların anahtar kelimelerine yeni terim eklenmiş işlemci"""
+    upserts = [
+        {'name': name, 'keywords': text_processor.get_topic_by_name(name).keywords + ' kuantum qubit'}
+        for name in text_processor.get_all_topics()[:count]
+    ]
+    return text_processor.with_topics(upserts=upserts)
+
+
+@pytest.mark.parametrize('max_features', [100, None])
+def test_vocabulary_mode_always_refits(text_processor, max_features):
+    model = MLModel(text_processor=text_processor, index_dir=None, vectorizer_mode='vocabulary',
+                    max_features=max_features)
+
+    updated = model.updated(edited(text_processor))
+
+    assert updated.changes_since_fit == 0
+    if max_features is None:
+        # yeni terimler sözlüğe giriyor, güncellenen konu aranabiliyor
+        assert 'qubit' in updated.vectorizer.vocabulary_
+
+
+def test_hashing_mode_updates_incrementally(text_processor):
+    model = MLModel(text_processor=text_processor, index_dir=None, vectorizer_mode='hashing')
+    changed = edited(text_processor)
+
+    updated = model.updated(changed)
+    full = MLModel(text_processor=changed, index_dir=None, vectorizer_mode='hashing')
+
+    assert updated.changes_since_fit == 3
+    assert updated.index_path is None
+    for name in changed.get_all_topics()[:3]:
+        query = f'{name} kuantum qubit'
+        assert updated.get_recommendations(query) == pytest.approx(full.get_recommendations(query))
+
+
+def test_hashing_mode_refits_past_refit_ratio(text_processor):
+    model = MLModel(text_processor=text_processor, index_dir=None, vectorizer_mode='hashing',
+                    refit_ratio=0.01)
+
+    assert model.updated(edited(text_processor)).changes_since_fit == 0
@@ -0,0 +1,43 @@
+from conftest import DAY
+from utils.summary_cache import SummaryCache
+
+
+def test_ttl_fresh_then_stale_then_miss(cache, clock):
+    cache.set('summary', 'tr', 'Python', {'summary': 'x'})
+
+    clock[0] += 7 * DAY - 1
+    assert cache.get('summary', 'tr', 'Python') == ({'summary': 'x'}, True)
+
+    clock[0] += 1
+    assert cache.get('summary', 'tr', 'Python') == ({'summary': 'x'}, False)
+
+    clock[0] += 30 * DAY
+    assert cache.get('summary', 'tr', 'Python') is None
+
+    stats = cache.stats()
+    assert (stats['fresh'], stats['stale'], stats['misses']) == (1, 1, 1)
+
+
+def test_negative_entries_use_negative_ttl(cache, clock):
+    cache.set('summary', 'tr', 'Olmayan', None, negative=True)
+
+    clock[0] += DAY - 1
+    assert cache.get('summary', 'tr', 'Olmayan') == (None, True)
+
+    clock[0] += 1
+    assert cache.get('summary', 'tr', 'Olmayan') == (None, False)
+
+    clock[0] += 30 * DAY
+    assert cache.get('summary', 'tr', 'Olmayan') is None
+
+
+def test_ttl_is_applied_on_read(cache_path, clock):
+    cache = SummaryCache(cache_path, ttl=7 * DAY)
+    cache.set('summary', 'tr', 'Python', 'x')
+    cache.close()
+    clock[0] += 2 * DAY
+
+    # ayar değişince eski kayıtlar da yeni süreye uyuyor
+    shorter = SummaryCache(cache_path, ttl=DAY)
+    assert shorter.get('summary', 'tr', 'Python') == ('x', False)
+    shorter.close()
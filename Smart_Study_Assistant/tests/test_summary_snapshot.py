@@ -0,0 +1,117 @@
+import sqlite3
+import time
+
+import pytest
+
+from conftest import DAY, STUB_PAGES, UNREACHABLE_URL
+from utils.summary_cache import SummaryCache, read_snapshot, write_snapshot
+from utils.wiki_stub import WikiStub
+
+
+def entry(title, value, fetched_at, negative=False, kind='summary', language='tr'):
+    return {'kind': kind, 'language': language, 'title': title,
+            'value': value, 'negative': negative, 'fetched_at': fetched_at}
+
+
+def test_purge_removes_only_expired_live_rows(cache, clock, tmp_path):
+    cache.set('summary', 'tr', 'Eski', 'a')
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(path, [entry('Snapshot', 'b', clock[0])])
+    cache.load_snapshot(path)
+
+    clock[0] += 40 * DAY
+    cache.set('summary', 'tr', 'Yeni', 'c')
+
+    assert cache.purge() == 1
+    assert cache.peek('summary', 'tr', 'Eski') is None
+    assert cache.peek('summary', 'tr', 'Snapshot') == 'b'
+    assert cache.get('summary', 'tr', 'Yeni') == ('c', True)
+
+
+def test_snapshot_round_trip(cache, tmp_path, clock):
+    entries = [
+        entry('Python', {'summary': 'Python özeti', 'url': 'https://tr.wikipedia.org/wiki/Python'}, clock[0]),
+        entry('Olmayan', None, clock[0], negative=True),
+        entry('Python', ['Programlama dilleri'], clock[0], kind='categories'),
+    ]
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(path, entries)
+
+    key = lambda item: (item['kind'], item['language'], item['title'])
+    assert sorted(read_snapshot(path), key=key) == sorted(entries, key=key)
+
+    assert cache.load_snapshot(path) == 3
+    assert cache.get('summary', 'tr', 'Python') == (entries[0]['value'], True)
+    assert cache.get('summary', 'tr', 'Olmayan') == (None, True)
+    assert cache.get('categories', 'tr', 'Python') == (['Programlama dilleri'], True)
+
+
+def test_snapshot_does_not_overwrite_newer_local_rows(cache, tmp_path, clock):
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(path, [entry('Python', 'snapshot', clock[0] - DAY)])
+    cache.set('summary', 'tr', 'Python', 'canlı')
+
+    cache.load_snapshot(path)
+    assert cache.get('summary', 'tr', 'Python') == ('canlı', True)
+
+
+def test_old_snapshot_rows_are_served_stale(cache, tmp_path, clock):
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(path, [entry('Python', 'snapshot', clock[0] - 365 * DAY)])
+    cache.load_snapshot(path)
+
+    assert cache.get('summary', 'tr', 'Python') == ('snapshot', False)
+
+    # canlı yanıt snapshot kaydının yerine geçiyor, artık normal süreler geçerli
+    cache.set('summary', 'tr', 'Python', 'canlı')
+    clock[0] += 40 * DAY
+    assert cache.get('summary', 'tr', 'Python') is None
+
+
+@pytest.mark.parametrize('content', ['', '{"format_version": 0, "entries": []}', '{yarım'])
+def test_invalid_snapshot_is_ignored(cache, tmp_path, content):
+    path = tmp_path / 'snapshot.json'
+    path.write_text(content, encoding='utf-8')
+    assert read_snapshot(str(path)) == []
+    assert cache.load_snapshot(str(path)) == 0
+    assert cache.load_snapshot(str(tmp_path / 'yok.json')) == 0
+
+
+def test_old_cache_file_gets_snapshot_column(cache_path):
+    conn = sqlite3.connect(cache_path)
+    conn.execute('''
+        CREATE TABLE wiki_cache (
+            kind TEXT NOT NULL, language TEXT NOT NULL, title TEXT NOT NULL, value TEXT NOT NULL,
+            negative INTEGER NOT NULL, fetched_at REAL NOT NULL, PRIMARY KEY (kind, language, title)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("INSERT INTO wiki_cache VALUES ('summary', 'tr', 'Python', '\"x\"', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    cache = SummaryCache(cache_path)
+    assert cache.peek('summary', 'tr', 'Python') == 'x'
+    cache.close()
+
+
+def test_snapshot_serves_offline(make_handler, cache_path, tmp_path):
+    # stub'dan alınan yanıtlarla snapshot, sonra Wikipedia'ya hiç ulaşılamıyor
+    stub = WikiStub(pages=STUB_PAGES).start()
+    try:
+        online = make_handler(stub.url, cache=SummaryCache(str(tmp_path / 'online.db')))
+        entries = [
+            {'kind': kind, 'language': language, 'title': title, 'value': value,
+             'negative': negative, 'fetched_at': time.time()}
+            for (kind, language, title), value, negative in online.fetch_topic_entries('Python Programlama')
+        ]
+        expected = online.get_topic_summary('Python Programlama')
+    finally:
+        stub.stop()
+
+    path = str(tmp_path / 'snapshot.json')
+    write_snapshot(path, entries)
+
+    offline = make_handler(UNREACHABLE_URL, snapshot_path=path)
+    assert offline.snapshot_entries == len(entries)
+    assert offline.get_topic_summary('Python Programlama') == expected
+    assert offline.metrics()['requests'] == 0
@@ -0,0 +1,30 @@
+import pytest
+
+from models.text_processor import TextProcessor
+
+LEVELS = ('beginner', 'intermediate', 'advanced')
+
+
+@pytest.fixture(scope='module')
+def text_processor():
+    return TextProcessor()
+
+
+def test_difficulty_panels_match_topic_links(text_processor):
+    for name in text_processor.get_all_topics():
+        topic = text_processor.get_topic_by_name(name)
+        for level in LEVELS:
+            expected = list(topic.difficulty_urls(level)) if level in topic.difficulty_levels else []
+            for per_level in (2, 3):
+                links = text_processor.get_resources_for_topic(name, level, learning_style=[], per_level=per_level)
+                assert links == list(dict.fromkeys(expected[:per_level]))
+
+
+def test_selection_is_cached_per_level_count(text_processor):
+    name = text_processor.get_all_topics()[0]
+    first = text_processor.get_resources_for_topic(name, 'beginner', learning_style=[], per_level=3)
+    # dönen liste kopya, değiştirmek önbelleği bozmuyor
+    first.append('x')
+
+    assert text_processor.get_resources_for_topic(name, 'beginner', learning_style=[], per_level=3) == first[:-1]
+    assert len(text_processor.get_resources_for_topic(name, 'beginner', learning_style=[])) <= 2
@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+from models import topic_store
+from models.topic_store import ResourceStore, iter_topics
+
+
+def write_store(path, payloads):
+    writer = ResourceStore(path).writer()
+    for position, payload in enumerate(payloads):
+        writer.add(position, payload)
+    writer.commit()
+    return ResourceStore(path)
+
+
+def test_new_store_removes_old_ones(tmp_path):
+    old_path = str(tmp_path / 'resources-00000001.db')
+    new_path = str(tmp_path / 'resources-00000002.db')
+    old = write_store(old_path, [{'urls': ['eski']}]).open()
+    (tmp_path / 'resources-00000003.db.tmp-1').write_bytes(b'')
+
+    new = write_store(new_path, [{'urls': ['yeni']}])
+
+    assert sorted(os.listdir(tmp_path)) == ['resources-00000002.db', 'resources-00000003.db.tmp-1']
+    assert new.is_complete()
+    assert new.get(0) == {'urls': ['yeni']}
+    # eski depoyu açmış işlemci okumaya devam ediyor
+    assert old.get(0) == {'urls': ['eski']}
+
+
+@pytest.mark.parametrize('chunk_size', [1 << 20, 5])
+@pytest.mark.parametrize('document', [
+    {'topics': [{'name': 'A'}, {'name': 'B'}]},
+    # "topics" string ve iç içe nesnelerde de geçiyor, sadece üst düzey anahtar sayılıyor
+    {'description': 'bkz. "topics": [1, 2]', 'meta': {'topics': ['x'], 'count': 12345},
+     'version': 3, 'topics': [{'name': 'A'}, {'name': 'B'}]},
+    [{'name': 'A'}, {'name': 'B'}],
+])
+def test_iter_topics_reads_top_level_array(tmp_path, monkeypatch, chunk_size, document):
+    monkeypatch.setattr(topic_store, '_CHUNK_SIZE', chunk_size)
+    path = tmp_path / 'topics.json'
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=1), encoding='utf-8')
+
+    assert [topic['name'] for topic in iter_topics(str(path))] == ['A', 'B']
+
+
+def test_iter_topics_without_topics_key(tmp_path):
+    path = tmp_path / 'topics.json'
+    path.write_text(json.dumps({'meta': {'topics': [{'name': 'A'}]}, 'note': '"topics": ['}), encoding='utf-8')
+
+    assert list(iter_topics(str(path))) == []
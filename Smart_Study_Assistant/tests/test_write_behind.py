@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database import write_behind
+from database.write_behind import QueryLogWriter
+
+
+class FakeDatabase:
+    """save_queries_with_recommendations'ı taklit eden, hataları sırayla veren yazıcı"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+        self.saved = []
+
+    def save_queries_with_recommendations(self, entries):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.saved.extend(entries)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(write_behind, 'RETRY_BACKOFF', 0.001)
+
+
+def test_locked_database_is_retried():
+    db = FakeDatabase([sqlite3.OperationalError('database is locked')] * 2)
+    writer = QueryLogWriter(db, flush_interval=0.01)
+    writer.log('python', 's1', [('Python Programlama', 0.9)])
+    writer.close()
+
+    assert db.calls == 3
+    assert db.saved == [('python', 's1', [('Python Programlama', 0.9)])]
+    assert (writer.stats()['written'], writer.stats()['failed']) == (1, 0)
+
+
+def test_batch_fails_after_last_attempt():
+    db = FakeDatabase([sqlite3.OperationalError('database is locked')] * write_behind.WRITE_ATTEMPTS)
+    writer = QueryLogWriter(db, flush_interval=0.01)
+    writer.log('python', 's1', [])
+    writer.close()
+
+    assert db.calls == write_behind.WRITE_ATTEMPTS
+    assert writer.stats()['failed'] == 1
+    assert isinstance(writer.last_error, sqlite3.OperationalError)
+
+
+def test_other_errors_are_not_retried():
+    db = FakeDatabase([ValueError('bozuk kayıt')])
+    writer = QueryLogWriter(db, flush_interval=0.01)
+    writer.log('python', 's1', [])
+    writer.close()
+
+    assert db.calls == 1
+    assert writer.stats()['failed'] == 1
+
+
+def test_no_accepted_entry_is_lost_on_close():
+    db = FakeDatabase()
+    writer = QueryLogWriter(db, flush_interval=0.001)
+    accepted = []
+    start = threading.Barrier(5)
+
+    def produce(worker):
+        start.wait()
+        for i in range(2000):
+            try:
+                if writer.log(f'{worker}-{i}', 's', []):
+                    accepted.append(f'{worker}-{i}')
+            except RuntimeError:
+                return
+
+    threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    writer.close()
+    for thread in threads:
+        thread.join()
+
+    # close() dönmeden kabul edilen her kayıt yazılmış olmalı
+    assert sorted(query for query, _, _ in db.saved) == sorted(accepted)
+    with pytest.raises(RuntimeError):
+        writer.log('geç', 's', [])
@@ -1,57 +1,190 @@
-import wikipediaapi
-from typing import Optional, Dict
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.summary_cache import DEFAULT_SNAPSHOT_PATH, SummaryCache
+
+
+# testlerde / çevrimdışı çalışırken yerel bir sunucuya yönlendirilebilir
+WIKI_API_URL = os.environ.get('SMART_STUDY_WIKI_API_URL', 'https://{language}.wikipedia.org/w/api.php')
+USER_AGENT = 'SmartStudyAssistant/1.0'
+SUMMARY_LENGTH = 500
+# sayfanın özetler için beklediği toplam süre (saniye)
+SUMMARY_DEADLINE = 3.0
+# ağ hatası sayılan istisnalar (JSON olmayan yanıt ValueError)
+LOOKUP_ERRORS = (requests.RequestException, ValueError)
+
+
+class RateLimiter:
+    """Thread'ler arasında paylaşılan, saniyede en fazla rate istek bırakan sınırlayıcı"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Sıradaki istek zamanı gelene kadar bekle"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Devre açıkken istek gönderilmeden verilen hata"""
+
+
+class CircuitBreaker:
+    """Üst üste hata veren servise istekleri bir süre kesen devre kesici
+
+    closed: istekler geçiyor, ardışık hatalar sayılıyor.
+    open: failure_threshold hataya ulaşıldı; reset_timeout dolana kadar
+        istekler hiç gönderilmeden CircuitOpenError ile dönüyor.
+    half_open: süre doldu; tek bir deneme isteği geçiyor, başarılıysa
+        devre kapanıyor, hata verirse yeniden açılıyor.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Devreyi açan ardışık hata sayısı
+            reset_timeout: Açık devrenin deneme isteğine izin vermeden önce beklediği süre (saniye)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self._stats = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def before_call(self):
+        """İsteğe izin ver ya da CircuitOpenError fırlat"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            self._stats['rejected'] += 1
+        raise CircuitOpenError("Wikipedia devresi açık, istek gönderilmedi")
+
+    def record_success(self):
+        with self._lock:
+            self._stats['successes'] += 1
+            self._failures = 0
+            self._trial_running = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._stats['failures'] += 1
+            self._failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self._stats['opened'] += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def abandon(self):
+        """İstek servisten sonuç almadan bitti (beklenmedik hata); deneme hakkını geri ver"""
+        with self._lock:
+            self._trial_running = False
+
+    def stats(self) -> Dict:
+        """Durum ve sayaçlar"""
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self._failures, **self._stats}
 
 
 class APIHandler:
     """Dış API işlemlerini yöneten sınıf"""
 
-    def __init__(self):
-        # Wikipedia API için Türkçe wiki
-        self.wiki_tr = wikipediaapi.Wikipedia(
-            language='tr',
-            user_agent='SmartStudyAssistant/1.0'
-        )
+    def __init__(self, max_workers: int = 8, request_timeout=(3.05, 5.0),
+                 cache: SummaryCache = None, api_url: str = None,
+                 snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH, rate_limiter: RateLimiter = None,
+                 hedge_after: Optional[float] = None, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            max_workers: Aynı anda çalışan Wikipedia isteği
+            request_timeout: Tek HTTP isteği için (bağlanma, okuma) süresi
+            cache: Kalıcı yanıt önbelleği, verilmezse data/wiki_cache.db
+            api_url: '{language}' içeren MediaWiki API adresi
+            snapshot_path: Açılışta önbelleğe alınacak snapshot, None ise okunmaz
+            rate_limiter: Verilirse her HTTP isteği öncesi beklenir
+            hedge_after: Türkçe yanıt bu süre (saniye) içinde gelmezse İngilizce
+                istek de paralel başlatılır; None ise sırayla denenir
+            failure_threshold: Dil başına devre kesiciyi açan ardışık hata sayısı
+            reset_timeout: Açık devrenin yeniden denemeden önce beklediği süre (saniye)
+        """
+        self.api_url = api_url or WIKI_API_URL
 
-        # İngilizce alternatif
-        self.wiki_en = wikipediaapi.Wikipedia(
-            language='en',
-            user_agent='SmartStudyAssistant/1.0'
-        )
+        # tüm thread'lerin paylaştığı, bağlantıları açık tutan oturum
+        self.request_timeout = request_timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        # bağlantı kurulamazsa ve geçici 5xx / 429 yanıtlarında bir kez daha deneniyor;
+        # okuma zaman aşımı tekrar edilmiyor, süre bütçesini ikiye katlamasın; read=False
+        # ile ReadTimeout olduğu gibi geliyor ve 'timeouts' sayacına yazılıyor
+        retry = Retry(total=1, connect=1, read=False, status=1, backoff_factor=0.1,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({'GET'}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-    def get_topic_summary(self, topic_name: str, language: str = 'tr') -> Optional[Dict]:
-        """Wikipedia'dan konu özetini getir"""
-        wiki = self.wiki_tr if language == 'tr' else self.wiki_en
+        self.cache = cache or SummaryCache()
+        self.snapshot_entries = self.cache.load_snapshot(snapshot_path) if snapshot_path else 0
+        self.rate_limiter = rate_limiter
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wiki-summary')
+        # TR/EN isteklerini paralel çalıştırmak için ayrı havuz, ana havuzu dolduran işler kilitlenmesin
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wiki-hedge')
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.last_error = None
 
-        # Daha fazla arama terimi
-        search_terms = [
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'requests': 0, 'failures': 0, 'timeouts': 0, 'short_circuits': 0,
+            'hedges': 0, 'hedge_wins': 0, 'fallbacks': 0, 'deadline_misses': 0,
+        }
+
+    @staticmethod
+    def _title_variants(topic_name: str) -> List[str]:
+        """Denenecek başlıklar, öncelik sırasıyla ve tekrarsız"""
+        variants = [
             topic_name,
             topic_name.replace('ı', 'i').replace('İ', 'I'),
             topic_name.lower(),
             topic_name.title(),
-            # Ek terimler
             topic_name.replace(' ve ', ' '),
             topic_name.split()[0] if ' ' in topic_name else topic_name,  # İlk kelime
         ]
+        return [variant for variant in dict.fromkeys(variants) if variant.strip()]
 
-        # İngilizce de dene
-        if language == 'tr':
-            for term in search_terms.copy():
-                page = wiki.page(term)
-                if page.exists():
-                    summary = page.summary[:500]
-                    if len(page.summary) > 500:
-                        summary += "..."
-                    return {
-                        'title': page.title,
-                        'summary': summary,
-                        'url': page.fullurl,
-                        'exists': True
-                    }
-
-            # Türkçede bulamazsa İngilizce dene
-            return self.get_topic_summary(topic_name, language='en')
-
-        # Hiçbir şey bulunamadı
+    @staticmethod
+    def _not_found(topic_name: str) -> Dict:
         return {
             'title': topic_name,
             'summary': f"{topic_name} için detaylı bilgi aşağıdaki kaynaklarda bulunabilir.",
@@ -59,30 +192,323 @@ class APIHandler:
             'exists': False
         }
 
+    def _count(self, name: str):
+        with self._metrics_lock:
+            self._metrics[name] += 1
 
-        for term in search_terms:
-            page = wiki.page(term)
+    def record_deadline_miss(self):
+        """Süresinde gösterilemeyen özeti say (metrics()['deadline_misses'])"""
+        self._count('deadline_misses')
 
-            if page.exists():
-                # Özet ilk 500 karakter
-                summary = page.summary[:500]
-                if len(page.summary) > 500:
-                    summary += "..."
+    def breaker(self, language: str) -> CircuitBreaker:
+        """Dilin (Wikipedia sunucusunun) devre kesicisi"""
+        with self._metrics_lock:
+            breaker = self._breakers.get(language)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[language] = breaker
+            return breaker
 
-                return {
-                    'title': page.title,
-                    'summary': summary,
-                    'url': page.fullurl,
-                    'exists': True
-                }
+    def _query(self, language: str, titles: List[str], **params) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        MediaWiki query isteği
 
-        # Hiçbir şey bulunamadı
-        return {
-            'title': topic_name,
-            'summary': f"{topic_name} hakkında Wikipedia'da bilgi bulunamadı.",
-            'url': None,
-            'exists': False
-        }
+        Returns:
+            (var olan sayfalar, {istenen_başlık: varılan_başlık}); başlık
+            normalizasyonu ve yönlendirmeler eşlemeye işlenmiş halde
+        """
+        breaker = self.breaker(language)
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            self._count('short_circuits')
+            raise
+
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            self._count('requests')
+            response = self.session.get(
+                self.api_url.format(language=language),
+                params={
+                    'action': 'query',
+                    'format': 'json',
+                    'formatversion': 2,
+                    'redirects': 1,
+                    'titles': '|'.join(titles),
+                    **params
+                },
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
+            query = response.json().get('query', {})
+        except LOOKUP_ERRORS as e:
+            self._count('timeouts' if isinstance(e, requests.Timeout) else 'failures')
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # yarım kalan deneme isteği devreyi sonsuza kadar kilitlemesin
+            breaker.abandon()
+            raise
+        breaker.record_success()
+
+        normalized = {item['from']: item['to'] for item in query.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in query.get('redirects', [])}
+        resolved = {}
+        for title in titles:
+            target = normalized.get(title, title)
+            resolved[title] = redirects.get(target, target)
+
+        pages = [
+            page for page in query.get('pages', [])
+            if not page.get('missing') and not page.get('invalid')
+        ]
+        return pages, resolved
+
+    def _lookup(self, topic_name: str, language: str) -> Optional[Dict]:
+        """Tüm başlık varyantlarını tek istekte sor, var olan ilk varyantın özetini döndür"""
+        variants = self._title_variants(topic_name)
+        pages, resolved = self._query(
+            language, variants,
+            prop='extracts|info', exintro=1, explaintext=1, exlimit='max', inprop='url'
+        )
+        pages = {page['title']: page for page in pages}
+
+        for variant in variants:
+            page = pages.get(resolved[variant])
+            if page is None:
+                continue
+
+            extract = page.get('extract', '')
+            summary = extract[:SUMMARY_LENGTH]
+            if len(extract) > SUMMARY_LENGTH:
+                summary += "..."
+            return {
+                'title': page['title'],
+                'summary': summary,
+                'url': page.get('fullurl'),
+                'exists': True,
+                'language': language
+            }
+        return None
+
+    @staticmethod
+    def _outcome(future: Future):
+        """Bitmesini bekleyip (sonuç, hata) döndür"""
+        error = future.exception()
+        return (None, error) if error is not None else (future.result(), None)
+
+    def _lookup_outcome(self, topic_name: str, language: str):
+        try:
+            return self._lookup(topic_name, language), None
+        except LOOKUP_ERRORS as e:
+            return None, e
+
+    def _fetch_summary(self, topic_name: str, language: str) -> Tuple[Dict, bool]:
+        """
+        Özeti getir; Türkçede bulamazsa ya da Türkçe sunucu hata verirse İngilizce dene
+
+        hedge_after verilmişse Türkçe yanıt gecikince İngilizce istek de
+        başlatılıyor, önce gelen geçerli özet kullanılıyor.
+
+        Returns:
+            (özet, kısa_süreli_mi); bulunamayan ya da Türkçesi alınamadığı için
+            İngilizcesi verilen özet kısa süreli saklanıyor
+        """
+        if language != 'tr':
+            result, error = self._lookup_outcome(topic_name, language)
+            if error is not None:
+                raise error
+            return (result, False) if result is not None else (self._not_found(topic_name), True)
+
+        secondary = None
+        if self.hedge_after is None:
+            tr, tr_error = self._lookup_outcome(topic_name, 'tr')
+        else:
+            primary = self._hedge_executor.submit(self._lookup, topic_name, 'tr')
+            wait([primary], timeout=self.hedge_after)
+            if not primary.done():
+                self._count('hedges')
+                secondary = self._hedge_executor.submit(self._lookup, topic_name, 'en')
+                wait([primary, secondary], return_when=FIRST_COMPLETED)
+                if not primary.done():
+                    en, _ = self._outcome(secondary)
+                    if en is not None:
+                        self._count('hedge_wins')
+                        return en, True
+            tr, tr_error = self._outcome(primary)
+
+        if tr is not None:
+            return tr, False
+
+        en, en_error = self._outcome(secondary) if secondary is not None else self._lookup_outcome(topic_name, 'en')
+        if en is not None:
+            return en, tr_error is not None
+        if tr_error is not None or en_error is not None:
+            raise tr_error or en_error
+        return self._not_found(topic_name), True
+
+    def _fetch_categories(self, title: str, language: str) -> Tuple[List[str], bool]:
+        pages, _ = self._query(language, [title], prop='categories', cllimit='max')
+        if not pages:
+            return [], True
+        return [category['title'] for category in pages[0].get('categories', [])], False
+
+    def fetch_topic_entries(self, topic_name: str, language: str = 'tr') -> List[Tuple[Tuple[str, str, str], object, bool]]:
+        """
+        Önbelleğe bakmadan konunun özet ve kategori yanıtlarını getir (ön doldurma için)
+
+        Kategoriler, özet Türkçe bulunduysa çözülen asıl başlıktan alınıyor.
+        Anahtarlar get_topic_summary / get_topic_categories'in kullandıklarıyla aynı.
+
+        Returns:
+            [((tür, dil, başlık), değer, bulunamadı_mı), ...]
+        """
+        summary, summary_missing = self._fetch_summary(topic_name, language)
+        title = summary['title'] if summary.get('language') == 'tr' else topic_name
+        categories, categories_missing = self._fetch_categories(title, 'tr')
+        return [
+            (('summary', language, topic_name), summary, summary_missing),
+            (('categories', 'tr', topic_name), categories, categories_missing),
+        ]
+
+    def _refresh(self, key: Tuple[str, str, str], fetch: Callable):
+        # ağ hatasında önbellekteki kayıt korunuyor; süresi çok geçmiş olsa da
+        # (örn. eski snapshot) varsa son bilinen yanıt kullanılıyor
+        try:
+            value, negative = fetch()
+        except LOOKUP_ERRORS as e:
+            self.last_error = e
+            fallback = self.cache.peek(*key)
+            if fallback is None:
+                raise
+            return fallback
+        self.cache.set(*key, value, negative=negative)
+        return value
+
+    def _submit(self, key: Tuple[str, str, str], fetch: Callable) -> Future:
+        """İsteği arka planda çalıştır; aynı kayıt zaten isteniyorsa o isteği paylaş"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._refresh, key, fetch)
+            self._inflight[key] = future
+        # iş çoktan bittiyse callback hemen bu thread'de çalışır, kilit dışında eklenmeli
+        future.add_done_callback(lambda done, key=key: self._release(key, done))
+        return future
+
+    def _release(self, key, future: Future):
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _cached(self, key: Tuple[str, str, str], fetch: Callable):
+        """
+        Önbellekteki değeri ya da getirmekte olan isteği döndür
+
+        Bayat kayıt hemen döndürülüp arka planda yenileniyor.
+
+        Returns:
+            (değer, None) ya da önbellekte yoksa (None, future)
+        """
+        entry = self.cache.get(*key)
+        if entry is None:
+            return None, self._submit(key, fetch)
+
+        value, fresh = entry
+        if not fresh:
+            self._submit(key, fetch)
+        return value, None
+
+    def _with_fallback(self, future: Future, topic_name: str) -> Future:
+        """Hata veren isteği "bulunamadı" özetine çeviren future"""
+        resolved = Future()
+
+        def done(source: Future):
+            if source.exception() is not None:
+                self._count('fallbacks')
+                resolved.set_result(self._not_found(topic_name))
+            else:
+                resolved.set_result(source.result())
+
+        future.add_done_callback(done)
+        return resolved
+
+    def submit_topic_summaries(self, topic_names: Iterable[str], language: str = 'tr') -> Dict[str, Future]:
+        """
+        Özetleri beklemeden iste
+
+        Önbellekte olanların future'ı hazır halde dönüyor, diğerleri geldikçe
+        tamamlanıyor. Hata alan (ya da devre açıkken önbellekte olmayan)
+        konuların future'ı "bulunamadı" özetiyle tamamlanıyor, hiçbiri istisna vermiyor.
+
+        Returns:
+            {konu_adı: özet sözlüğüne çözülen Future}
+        """
+        futures = {}
+        for topic_name in dict.fromkeys(topic_names):
+            value, future = self._cached(
+                ('summary', language, topic_name),
+                lambda topic_name=topic_name: self._fetch_summary(topic_name, language)
+            )
+            if future is None:
+                future = Future()
+                future.set_result(value)
+                futures[topic_name] = future
+            else:
+                futures[topic_name] = self._with_fallback(future, topic_name)
+        return futures
+
+    def get_topic_summaries(self, topic_names: Iterable[str], language: str = 'tr',
+                            timeout: Optional[float] = SUMMARY_DEADLINE) -> Dict[str, Optional[Dict]]:
+        """
+        Birden çok konunun Wikipedia özetini paralel getir
+
+        Önbellekte olanlar ağa çıkmadan dönüyor. Süre dolduğunda o ana kadar
+        gelenler döndürülüyor; gelmeyenler arka planda tamamlanıp önbelleğe
+        giriyor, sonraki aramada hazır oluyor.
+
+        Args:
+            topic_names: Konu adları
+            language: Önce denenecek dil ('tr' ise bulunamayanlar İngilizcede aranır)
+            timeout: Tüm özetler için toplam bekleme süresi, None ise sınırsız
+
+        Returns:
+            {konu_adı: özet sözlüğü}; süresinde gelmeyenler için None, hata
+            alanlar (ya da devre açıkken önbellekte olmayanlar) için "bulunamadı" özeti
+        """
+        futures = self.submit_topic_summaries(topic_names, language)
+        wait(futures.values(), timeout=timeout)
+
+        results = {}
+        for topic_name, future in futures.items():
+            if future.done():
+                results[topic_name] = future.result()
+            else:
+                self.record_deadline_miss()
+                results[topic_name] = None
+        return results
+
+    def get_topic_summary(self, topic_name: str, language: str = 'tr',
+                          timeout: Optional[float] = None) -> Dict:
+        """Wikipedia'dan konu özetini getir"""
+        summary = self.get_topic_summaries([topic_name], language, timeout)[topic_name]
+        return summary if summary is not None else self._not_found(topic_name)
+
+    def _categories(self, title: str, language: str) -> List[str]:
+        """Sayfanın 'Kategori:...' başlıkları, önbellekten; ağ hatasında boş liste"""
+        value, future = self._cached(
+            ('categories', language, title),
+            lambda: self._fetch_categories(title, language)
+        )
+        if future is None:
+            return value
+        try:
+            return future.result()
+        except LOOKUP_ERRORS:
+            self._count('fallbacks')
+            return []
 
     def search_related_pages(self, query: str, language: str = 'tr', limit: int = 5) -> list:
         """
@@ -99,15 +525,9 @@ class APIHandler:
         # Not: Wikipedia API direkt arama özelliği sınırlı
         # Bu fonksiyon basit bir implementasyon
 
-        wiki = self.wiki_tr if language == 'tr' else self.wiki_en
-        page = wiki.page(query)
-
-        if page.exists():
-            # İlgili kategorilerdeki sayfaları döndür
-            categories = list(page.categories.keys())[:limit]
-            return [cat.split(':')[-1] for cat in categories]
-
-        return []
+        # İlgili kategorilerdeki sayfaları döndür
+        categories = self._categories(query, language)[:limit]
+        return [cat.split(':')[-1] for cat in categories]
 
     def get_topic_categories(self, topic_name: str) -> list:
         """
@@ -119,15 +539,22 @@ class APIHandler:
         Returns:
             Kategori listesi
         """
-        page = self.wiki_tr.page(topic_name)
+        categories = self._categories(topic_name, 'tr')
+        # Kategori: önekini temizle
+        clean_categories = [cat.split(':')[-1] for cat in categories]
+        return clean_categories[:10]  # İlk 10 kategori
 
-        if page.exists():
-            categories = list(page.categories.keys())
-            # Kategori: önekini temizle
-            clean_categories = [cat.split(':')[-1] for cat in categories]
-            return clean_categories[:10]  # İlk 10 kategori
+    def cache_stats(self) -> Dict:
+        """Kalıcı Wikipedia önbelleğinin sayaçları"""
+        return self.cache.stats()
 
-        return []
+    def metrics(self) -> Dict:
+        """İstek / hata / zaman aşımı / hedge / yedek yanıt sayaçları ve dil başına devre durumu"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            breakers = dict(self._breakers)
+        metrics['breakers'] = {language: breaker.stats() for language, breaker in breakers.items()}
+        return metrics
 
     def format_summary_for_display(self, summary_data: Dict) -> str:
         """
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from database.pool import ConnectionPool
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'wiki_cache.db')
+# deploy ile gelen, önceden doldurulmuş yanıtlar (python -m utils.summary_prefetch)
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'wiki_snapshot.json')
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FIELDS = ('kind', 'language', 'title', 'value', 'negative', 'fetched_at')
+
+SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS wiki_cache (
+        kind TEXT NOT NULL,
+        language TEXT NOT NULL,
+        title TEXT NOT NULL,
+        value TEXT NOT NULL,
+        negative INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        snapshot INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (kind, language, title)
+    ) WITHOUT ROWID
+'''
+# snapshot sütunu sonradan eklendi, eski önbellek dosyalarına ekleniyor
+ADD_SNAPSHOT_COLUMN_SQL = 'ALTER TABLE wiki_cache ADD COLUMN snapshot INTEGER NOT NULL DEFAULT 0'
+SELECT_SQL = '''
+    SELECT value, negative, fetched_at, snapshot FROM wiki_cache
+    WHERE kind = ? AND language = ? AND title = ?
+'''
+UPSERT_SQL = '''
+    INSERT OR REPLACE INTO wiki_cache (kind, language, title, value, negative, fetched_at, snapshot)
+    VALUES (?, ?, ?, ?, ?, ?, 0)
+'''
+# snapshot kaydı sadece yerelde daha yeni bir yanıt yoksa yazılıyor
+IMPORT_SQL = '''
+    INSERT INTO wiki_cache (kind, language, title, value, negative, fetched_at, snapshot)
+    VALUES (?, ?, ?, ?, ?, ?, 1)
+    ON CONFLICT (kind, language, title) DO UPDATE SET
+        value = excluded.value,
+        negative = excluded.negative,
+        fetched_at = excluded.fetched_at,
+        snapshot = 1
+    WHERE excluded.fetched_at > wiki_cache.fetched_at
+'''
+# süreler okurken uygulanıyor, ayar değişince eski kayıtlar da yeni süreye uyuyor.
+# snapshot kayıtları yaşından bağımsız saklanıyor (Wikipedia'ya ulaşılamazken son çare)
+PURGE_SQL = '''
+    DELETE FROM wiki_cache
+    WHERE NOT snapshot AND fetched_at + CASE WHEN negative THEN ? ELSE ? END + ? <= ?
+'''
+
+
+class SummaryCache:
+    """Wikipedia yanıtları için SQLite'ta kalıcı, TTL'li önbellek
+
+    Kayıt süresi dolana kadar taze sayılıyor. Süresi dolduktan sonra da
+    stale_ttl boyunca bayat olarak döndürülüyor; çağıran onu hemen kullanıp
+    arka planda yeniliyor (stale-while-revalidate). Bulunamayan sayfalar da
+    daha kısa bir süreyle (negative_ttl) saklanıyor, her aramada tekrar sorulmuyor.
+    Snapshot'tan gelen kayıtlar ne kadar eski olursa olsun bayat olarak
+    döndürülüyor; canlı yanıt gelene kadar deploy ile gelen snapshot kullanılıyor.
+    """
+
+    def __init__(self, db_path: str = None, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 24 * 3600, stale_ttl: float = 30 * 24 * 3600):
+        """
+        Args:
+            db_path: Önbellek dosyası (kullanıcı veritabanından ayrı)
+            ttl: Bulunan kaydın taze kaldığı süre (saniye)
+            negative_ttl: "Bulunamadı" kaydının taze kaldığı süre (saniye)
+            stale_ttl: Süresi dolmuş kaydın bayat olarak kullanılabileceği ek süre (saniye)
+        """
+        self.db_path = db_path or DEFAULT_CACHE_PATH
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.pool = ConnectionPool(self.db_path, size=4)
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(SCHEMA_SQL)
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(wiki_cache)')}
+                if 'snapshot' not in columns:
+                    conn.execute(ADD_SNAPSHOT_COLUMN_SQL)
+
+        self._lock = threading.Lock()
+        self._stats = {'fresh': 0, 'stale': 0, 'misses': 0, 'writes': 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, kind: str, language: str, title: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Kaydı oku
+
+        Returns:
+            (değer, taze_mi); kayıt yoksa ya da bayatlık süresi de geçtiyse
+            (snapshot kayıtları hariç) None
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_SQL, (kind, language, title)).fetchone()
+
+        if row is None:
+            self._count('misses')
+            return None
+
+        now = time.time()
+        expires_at = row[2] + (self.negative_ttl if row[1] else self.ttl)
+        if expires_at + self.stale_ttl <= now and not row[3]:
+            self._count('misses')
+            return None
+
+        fresh = now < expires_at
+        self._count('fresh' if fresh else 'stale')
+        return json.loads(row[0]), fresh
+
+    def peek(self, kind: str, language: str, title: str) -> Optional[Any]:
+        """Kaydı süresine bakmadan oku (ağa ulaşılamadığında son bilinen yanıt)"""
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_SQL, (kind, language, title)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, kind: str, language: str, title: str, value: Any, negative: bool = False):
+        """Kaydı yaz; negative ise kısa süreli "bulunamadı" kaydı olarak"""
+        row = (kind, language, title, json.dumps(value, ensure_ascii=False), int(negative), time.time())
+
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(UPSERT_SQL, row)
+        self._count('writes')
+
+    def load_snapshot(self, path: str = None) -> int:
+        """
+        Snapshot dosyasındaki yanıtları önbelleğe al
+
+        Yerelde aynı kayıt daha yeni alınmışsa dokunulmuyor. Snapshot
+        kayıtları süresi ne kadar geçmiş olursa olsun bayat olarak kullanılıyor,
+        canlı yanıt gelince onun yerine geçiyor. Dosya yoksa ya da
+        okunamıyorsa (eski sürüm, yarım yazılmış) hiçbir şey yapılmıyor.
+
+        Returns:
+            Snapshot'taki kayıt sayısı
+        """
+        entries = read_snapshot(path or DEFAULT_SNAPSHOT_PATH)
+        rows = [
+            (entry['kind'], entry['language'], entry['title'],
+             json.dumps(entry['value'], ensure_ascii=False), int(entry['negative']), entry['fetched_at'])
+            for entry in entries
+        ]
+        if rows:
+            with self.pool.connection() as conn:
+                with conn:
+                    conn.executemany(IMPORT_SQL, rows)
+        return len(rows)
+
+    def purge(self) -> int:
+        """Bayatlık süresi de geçmiş kayıtları sil, silinen sayısını döndür"""
+        with self.pool.connection() as conn:
+            with conn:
+                cursor = conn.execute(PURGE_SQL, (self.negative_ttl, self.ttl, self.stale_ttl, time.time()))
+        return cursor.rowcount
+
+    def clear(self):
+        """Tüm kayıtları sil"""
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute('DELETE FROM wiki_cache')
+
+    def close(self):
+        self.pool.close()
+
+    def stats(self) -> Dict:
+        """Taze / bayat / ıskalama / yazım sayaçları"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['fresh'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = (stats['fresh'] + stats['stale']) / lookups if lookups else 0.0
+        return stats
+
+
+def read_snapshot(path: str) -> List[Dict]:
+    """Snapshot kayıtları; dosya yoksa ya da geçersizse boş liste"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return []
+    return [entry for entry in snapshot.get('entries', []) if all(field in entry for field in SNAPSHOT_FIELDS)]
+
+
+def write_snapshot(path: str, entries: Iterable[Dict]):
+    """Snapshot'ı geçici dosyaya yazıp tek adımda yerine koy"""
+    entries = sorted(entries, key=lambda entry: (entry['kind'], entry['language'], entry['title']))
+    snapshot = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'created_at': time.time(),
+        'entries': [{field: entry[field] for field in SNAPSHOT_FIELDS} for entry in entries],
+    }
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
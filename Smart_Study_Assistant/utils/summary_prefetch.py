@@ -0,0 +1,103 @@
+"""Tüm konuların Wikipedia yanıtlarını önceden çekip snapshot'a yazan iş
+
+Deploy öncesi çalıştırılıyor; APIHandler açılışta snapshot'ı önbelleğe
+aldığı için uygulama ilk aramadan itibaren (Wikipedia yavaş ya da erişilemez
+olsa da) ağa çıkmadan çalışıyor.
+
+Çalıştırma: python -m utils.summary_prefetch [snapshot_yolu] [--workers=4] [--rate=5]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Tuple
+
+from utils.api_handler import LOOKUP_ERRORS, APIHandler, RateLimiter
+from utils.summary_cache import DEFAULT_SNAPSHOT_PATH, SummaryCache, read_snapshot, write_snapshot
+
+
+def prefetch(handler: APIHandler, topic_names: Iterable[str], workers: int = 4) -> Tuple[List[Dict], Dict[str, Exception]]:
+    """
+    Konuların özet ve kategorilerini paralel getir
+
+    Returns:
+        (snapshot kayıtları, {alınamayan_konu: hata})
+    """
+    entries, failures = [], {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wiki-prefetch') as executor:
+        futures = {executor.submit(handler.fetch_topic_entries, name): name for name in dict.fromkeys(topic_names)}
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except LOOKUP_ERRORS as e:
+                failures[futures[future]] = e
+                continue
+
+            fetched_at = time.time()
+            for (kind, language, title), value, negative in results:
+                entries.append({
+                    'kind': kind, 'language': language, 'title': title,
+                    'value': value, 'negative': negative, 'fetched_at': fetched_at,
+                })
+    return entries, failures
+
+
+def build_snapshot(path: str, topic_names: List[str], workers: int = 4, rate: float = 5.0,
+                   api_url: str = None, cache: SummaryCache = None) -> Dict:
+    """
+    Snapshot'ı yeniden oluştur
+
+    Alınamayan konuların önceki snapshot'taki kayıtları korunuyor, katalogda
+    artık olmayan konuların kayıtları atılıyor.
+
+    Returns:
+        {'topics', 'entries', 'failed', 'seconds'}
+    """
+    start = time.perf_counter()
+    # kısıtlı hızda çalışan ayrı bir istemci; önbelleği okumadan doğrudan soruyor
+    handler = APIHandler(
+        max_workers=workers,
+        cache=cache,
+        api_url=api_url,
+        snapshot_path=None,
+        rate_limiter=RateLimiter(rate)
+    )
+    entries, failures = prefetch(handler, topic_names, workers)
+
+    wanted = set(topic_names)
+    fetched = {(entry['kind'], entry['language'], entry['title']) for entry in entries}
+    entries += [
+        entry for entry in read_snapshot(path)
+        if entry['title'] in wanted and (entry['kind'], entry['language'], entry['title']) not in fetched
+    ]
+    write_snapshot(path, entries)
+    # bu makinedeki önbellek de hemen ısınsın
+    handler.cache.load_snapshot(path)
+
+    return {
+        'topics': len(wanted),
+        'entries': len(entries),
+        'failed': failures,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+if __name__ == "__main__":
+    from models.text_processor import TextProcessor
+    from models.topic_store import discover_topic_sources
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    path = args[0] if args else DEFAULT_SNAPSHOT_PATH
+
+    topics = TextProcessor(sources=discover_topic_sources()).get_all_topics()
+    report = build_snapshot(
+        path, topics,
+        workers=int(options.get('workers', 4)),
+        rate=float(options.get('rate', 5))
+    )
+
+    print(f"✅ {report['topics']} konu, {report['entries']} kayıt {os.path.abspath(path)} dosyasına yazıldı "
+          f"({report['seconds']:.1f} sn)")
+    for name, error in report['failed'].items():
+        print(f"⚠️ {name}: {error}")
@@ -92,6 +92,24 @@ class Visualizer:
             data: DataFrame with 'query_date' column
         """
         if data.empty:
+            return Visualizer.create_daily_count_chart([])
+
+        # Tarihe göre grupla
+        data['query_date'] = pd.to_datetime(data['query_date'])
+        data['date_only'] = data['query_date'].dt.date
+
+        timeline_data = data.groupby('date_only').size().reset_index(name='count')
+        return Visualizer.create_daily_count_chart(list(timeline_data.itertuples(index=False, name=None)))
+
+    @staticmethod
+    def create_daily_count_chart(counts: List[Tuple[str, int]]):
+        """
+        Günlük sorgu sayısı grafiği (gruplama veritabanında yapılmış halde)
+
+        Args:
+            counts: [(gün, sorgu_sayısı), ...]
+        """
+        if not counts:
             fig = go.Figure()
             fig.add_annotation(
                 text="Henüz veri yok",
@@ -100,18 +118,13 @@ class Visualizer:
             )
             return fig
 
-        # Tarihe göre grupla
-        data['query_date'] = pd.to_datetime(data['query_date'])
-        data['date_only'] = data['query_date'].dt.date
-
-        timeline_data = data.groupby('date_only').size().reset_index(name='count')
+        days, values = zip(*counts)
 
         fig = px.line(
-            timeline_data,
-            x='date_only',
-            y='count',
+            x=list(days),
+            y=list(values),
             title='Günlük Sorgu Sayısı',
-            labels={'date_only': 'Tarih', 'count': 'Sorgu Sayısı'},
+            labels={'x': 'Tarih', 'y': 'Sorgu Sayısı'},
             markers=True
         )
 
@@ -0,0 +1,254 @@
+"""Wikipedia yerine geçen yerel MediaWiki API taklidi
+
+APIHandler'ın kullandığı action=query alt kümesini (extracts, info,
+categories, redirects, başlık normalizasyonu) bellekteki sayfalardan
+yanıtlıyor ve gelen istekleri sayıyor. Ağa çıkmadan önbellek / eşzamanlılık
+ölçmek için benchmark'larda ve testlerde kullanılıyor.
+
+Hata enjeksiyonu: dil başına gecikme (language_delays), rastgele 5xx
+(error_rate), yanıt vermeden bağlantıyı kapatma (drop_rate) ve sıradaki
+n isteği düşürme (fail_next) ile yavaş / çökmüş Wikipedia taklit ediliyor.
+
+Kayıt / tekrar: --record=fixture.json gerçek Wikipedia'ya giden yanıtları
+olduğu gibi kaydediyor, --replay=fixture.json aynı istekleri ağa çıkmadan
+bu kayıtlardan yanıtlıyor (kayıtta olmayanlar sayfalar.json'dan).
+
+Uygulamayı buna bağlamak için:
+    python -m utils.wiki_stub [port] [sayfalar.json] [--record=fixture.json | --replay=fixture.json]
+    SMART_STUDY_WIKI_API_URL=http://127.0.0.1:<port>/{language}/w/api.php streamlit run app.py
+
+sayfalar.json: {"pages": {"tr": {"Başlık": {"extract": "...", "categories": ["Kategori:..."]}}},
+                "redirects": {"tr": {"Eski": "Başlık"}}}
+"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import requests
+
+WIKIPEDIA_API_URL = 'https://{language}.wikipedia.org/w/api.php'
+
+
+class WikiStub:
+    """Arka plan thread'inde çalışan taklit sunucu"""
+
+    def __init__(self, pages=None, redirects=None, delay: float = 0.0, port: int = 0,
+                 fixture_path: str = None, upstream: str = None, language_delays=None,
+                 error_rate: float = 0.0, drop_rate: float = 0.0, fault_languages=None, seed: int = 0):
+        """
+        Args:
+            pages: {dil: {başlık: {'extract': str, 'categories': [str]}}}
+            redirects: {dil: {kaynak_başlık: hedef_başlık}}
+            delay: Her yanıttan önce bekleme (saniye), ağ gecikmesi yerine
+            port: 0 ise boş bir port seçilir
+            fixture_path: Kayıtlı yanıtlar (varsa okunur, save_fixture ile yazılır)
+            upstream: Verilirse kayıtta olmayan istekler buraya sorulup kaydedilir
+            language_delays: {dil: ek gecikme}, tek bir sunucunun yavaşlaması için
+            error_rate: İsteklerin 503 ile döneceği oran
+            drop_rate: Bağlantının yanıtsız kapatılacağı oran
+            fault_languages: Verilirse hata / kopma sadece bu dillerin isteklerine uygulanır
+            seed: Hata enjeksiyonu için rastgele tohum
+        """
+        self.pages = pages or {}
+        self.redirects = redirects or {}
+        self.delay = delay
+        self.fixture_path = fixture_path
+        self.upstream = upstream
+        self.fixture = {}
+        if fixture_path:
+            try:
+                with open(fixture_path, 'r', encoding='utf-8') as f:
+                    self.fixture = json.load(f)
+            except FileNotFoundError:
+                pass
+        self.language_delays = dict(language_delays or {})
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.fault_languages = set(fault_languages) if fault_languages else None
+        self.fail_next = 0
+        self._random = random.Random(seed)
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}/{{language}}/w/api.php'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='wiki-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def request_count(self) -> int:
+        with self._lock:
+            return len(self.requests)
+
+    def fault(self, language: str):
+        """Enjekte edilecek hata: None, 'error' ya da 'drop' (gecikme burada uygulanıyor)"""
+        delay = self.delay + self.language_delays.get(language, 0.0)
+        if delay:
+            time.sleep(delay)
+        if self.fault_languages is not None and language not in self.fault_languages:
+            return None
+
+        with self._lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return 'error'
+            roll = self._random.random()
+        if roll < self.drop_rate:
+            return 'drop'
+        if roll < self.drop_rate + self.error_rate:
+            return 'error'
+        return None
+
+    def save_fixture(self):
+        """Kaydedilen yanıtları fixture dosyasına yaz"""
+        with self._lock:
+            fixture = dict(self.fixture)
+        with open(self.fixture_path, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+    @staticmethod
+    def fixture_key(language: str, params) -> str:
+        """İstek anahtarı: dil + sıralı parametreler"""
+        return f"{language}?{urlencode(sorted((key, values[0]) for key, values in params.items()))}"
+
+    def respond(self, language: str, params) -> dict:
+        """Önce kayıttan, sonra (kayıt modunda) gerçek API'den, yoksa sayfalardan yanıtla"""
+        key = self.fixture_key(language, params)
+        with self._lock:
+            recorded = self.fixture.get(key)
+        if recorded is not None:
+            return recorded
+
+        if self.upstream:
+            response = requests.get(
+                self.upstream.format(language=language),
+                params={name: values[0] for name, values in params.items()},
+                headers={'User-Agent': 'SmartStudyAssistant/1.0'},
+                timeout=(3.05, 10.0)
+            )
+            response.raise_for_status()
+            recorded = response.json()
+            with self._lock:
+                self.fixture[key] = recorded
+            return recorded
+
+        return self.answer(language, params)
+
+    def answer(self, language: str, params) -> dict:
+        """Tek bir action=query isteğinin yanıtı"""
+        titles = params.get('titles', [''])[0].split('|')
+        props = params.get('prop', [''])[0].split('|')
+        pages = self.pages.get(language, {})
+        redirects = self.redirects.get(language, {})
+
+        normalized, followed, result = [], [], {}
+        for title in titles:
+            # MediaWiki ilk harfi büyütüyor, alt çizgiyi boşluğa çeviriyor
+            target = title.replace('_', ' ')
+            target = target[:1].upper() + target[1:]
+            if target != title:
+                normalized.append({'from': title, 'to': target})
+            if target in redirects:
+                followed.append({'from': target, 'to': redirects[target]})
+                target = redirects[target]
+
+            page = pages.get(target)
+            if page is None:
+                result[target] = {'title': target, 'missing': True}
+                continue
+
+            entry = {'title': target}
+            if 'extracts' in props:
+                entry['extract'] = page.get('extract', '')
+            if 'info' in props:
+                entry['fullurl'] = f'https://{language}.wikipedia.org/wiki/{target.replace(" ", "_")}'
+            if 'categories' in props:
+                entry['categories'] = [{'ns': 14, 'title': title} for title in page.get('categories', [])]
+            result[target] = entry
+
+        query = {'pages': list(result.values())}
+        if normalized:
+            query['normalized'] = normalized
+        if followed:
+            query['redirects'] = followed
+        return {'batchcomplete': True, 'query': query}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                language = url.path.strip('/').split('/')[0]
+                params = parse_qs(url.query)
+                with stub._lock:
+                    stub.requests.append((language, params.get('titles', [''])[0]))
+
+                fault = stub.fault(language)
+                if fault == 'drop':
+                    self.close_connection = True
+                    return
+                if fault == 'error':
+                    self.send_error(503)
+                    return
+
+                try:
+                    answer = stub.respond(language, params)
+                except requests.RequestException:
+                    self.send_error(502)
+                    return
+
+                body = json.dumps(answer, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # istemci zaman aşımıyla çoktan vazgeçti
+                    pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    port = int(args[0]) if args else 8765
+    data = {}
+    if len(args) > 1:
+        with open(args[1], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    stub = WikiStub(
+        data.get('pages'), data.get('redirects'), port=port,
+        fixture_path=options.get('record') or options.get('replay'),
+        upstream=WIKIPEDIA_API_URL if 'record' in options else None
+    ).start()
+    print(f"SMART_STUDY_WIKI_API_URL={stub.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+        if 'record' in options:
+            stub.save_fixture()
+            print(f"✅ {len(stub.fixture)} yanıt {options['record']} dosyasına kaydedildi")